@@ -0,0 +1,165 @@
+""" Alpha-beta search over Tk-free positions for the "Hard" computer difficulty """
+import time
+from Board_State import triple_table
+from Threat_Index import completes_sos, is_giveaway
+from Position import BLUE
+from Transposition_Table import TranspositionTable, EXACT, LOWER, UPPER
+from Symmetry import to_canonical, from_canonical
+
+# Value of a won game (on top of the final score difference)
+WIN = 1000
+
+
+class SearchTimeout(Exception):
+    """ Raised inside the search when the move deadline has passed """
+
+
+def order_moves(position, first=None):
+    """ Orders moves for searching: a known best move (e.g. from the transposition table) first, then scoring
+    moves, then moves that give nothing away, then the rest """
+    state = position.state
+    table = triple_table(state.board_size)
+    scoring, quiet, giveaways = [], [], []
+    for index, code in position.legal_moves():
+        if completes_sos(state, index, code, table):
+            scoring.append((index, code))
+        elif is_giveaway(state, index, code, table):
+            giveaways.append((index, code))
+        else:
+            quiet.append((index, code))
+    moves = scoring + quiet + giveaways
+    if first in moves:
+        moves.remove(first)
+        moves.insert(0, first)
+    return moves
+
+
+class AlphaBetaSearch:
+    def __init__(self, max_depth=3, time_limit=0.2, table_bits=16, symmetric=False):
+        # Deepest search (in moves, None to search until the board is full) and hard deadline per move (seconds)
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        # Transposition table shared by every search of this player (None to disable)
+        self.table = TranspositionTable(table_bits) if table_bits else None
+        # Share table entries between rotations and reflections of a position (worth it on small, open boards)
+        self.symmetric = symmetric
+        # Player the search is choosing a move for
+        self.root_player = None
+        self.deadline = 0
+        # Positions visited by the last search, the value of the move it chose and the deepest search finished
+        self.nodes = 0
+        self.value = None
+        self.depth = 0
+        # Best (move, value) of the iteration in progress, kept in case the deadline passes before it finishes
+        self.iteration_best = None
+
+    def best_move(self, position):
+        """ Returns the best (cell index, letter code) found by searching one move deeper at a time until the
+        maximum depth or the deadline, so a move is always ready when time runs out """
+        self.root_player = position.to_move
+        self.deadline = time.perf_counter() + self.time_limit
+        self.nodes = 0
+        self.depth = 0
+        if self.table is not None:
+            self.table.new_search()
+        # Work on a copy so the caller's position is never left half-searched
+        position = position.copy()
+        if self.symmetric and self.table is not None:
+            position.track_symmetries()
+        moves = order_moves(position)
+        # Best-so-far move, always available even if time runs out during the first iteration
+        best, self.value = moves[0], None
+        empty = len(position.state.empty_cells)
+        for depth in range(1, min(self.max_depth or empty, empty) + 1):
+            self.iteration_best = None
+            try:
+                best, self.value = self.search_root(position, moves, depth)
+            except SearchTimeout:
+                # The previous best is searched first, so any move that finished in this iteration is at least as
+                # well founded as it
+                if self.iteration_best is not None:
+                    best, self.value = self.iteration_best
+                break
+            self.depth = depth
+            # Search the best move first in the next iteration
+            moves.remove(best)
+            moves.insert(0, best)
+            # A forced win or loss will not change with a deeper search
+            if abs(self.value) >= WIN:
+                break
+        return best
+
+    def search_root(self, position, moves, depth):
+        """ Searches every root move to a depth and returns (best move, value) """
+        alpha, beta = -float("inf"), float("inf")
+        for move in moves:
+            position.play(*move)
+            try:
+                value = self.alpha_beta(position, depth - 1, alpha, beta)
+            finally:
+                position.undo()
+            if value > alpha:
+                alpha = value
+                self.iteration_best = (move, value)
+        return self.iteration_best
+
+    def alpha_beta(self, position, depth, alpha, beta):
+        """ Value of a position for the root player; whoever is to move next (including a general game player
+        moving again after scoring) maximizes or minimizes accordingly """
+        self.nodes += 1
+        if not self.nodes & 15 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        if depth <= 0 or position.is_over():
+            return self.evaluate(position)
+        # Table values are kept from Blue's point of view so both players' searches can share them
+        sign = 1 if self.root_player == BLUE else -1
+        table_move = None
+        if self.table is not None:
+            # Entries of a symmetric search are stored for the canonical orientation of the board
+            key, symmetry = position.canonical_hash() if self.symmetric else (position.hash, 0)
+            entry = self.table.probe(key)
+            if entry is not None:
+                if entry.move is not None:
+                    table_move = (from_canonical(entry.move[0], symmetry, position.state.board_size), entry.move[1])
+                if entry.depth >= depth:
+                    value = entry.value * sign
+                    if entry.flag == EXACT or (entry.flag == LOWER and value >= beta) or \
+                            (entry.flag == UPPER and value <= alpha):
+                        return value
+        original_alpha, original_beta = alpha, beta
+        maximizing = position.to_move == self.root_player
+        best_move = None
+        for move in order_moves(position, table_move):
+            position.play(*move)
+            try:
+                value = self.alpha_beta(position, depth - 1, alpha, beta)
+            finally:
+                position.undo()
+            if maximizing and value > alpha:
+                alpha, best_move = value, move
+            elif not maximizing and value < beta:
+                beta, best_move = value, move
+            if alpha >= beta:
+                break
+        result = alpha if maximizing else beta
+        if self.table is not None:
+            # Results at or beyond the original window are only bounds
+            if result <= original_alpha:
+                flag = UPPER
+            elif result >= original_beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            if sign < 0:
+                flag = {EXACT: EXACT, LOWER: UPPER, UPPER: LOWER}[flag]
+            if best_move is not None:
+                best_move = (to_canonical(best_move[0], symmetry, position.state.board_size), best_move[1])
+            self.table.store(key, result * sign, depth, flag, best_move)
+        return result
+
+    def evaluate(self, position):
+        """ Score difference for the root player, with finished games worth a win or loss on top """
+        difference = position.scores[self.root_player] - position.scores[1 - self.root_player]
+        if position.is_over() and difference:
+            return difference + (WIN if difference > 0 else -WIN)
+        return difference
@@ -0,0 +1,131 @@
+""" Batched SOS engine: thousands of games stored as one NumPy array and advanced in lockstep, with the rules of
+SimpleSOSGame and GeneralSOSGame """
+import sys
+import time
+import numpy as np
+from Board_State import EMPTY, S, O, DIRECTIONS
+from Position import BLUE, RED, SIMPLE_GAME, GENERAL_GAME
+
+# Winner of a game that ended level (or has not ended)
+NO_WINNER = -1
+
+
+def sos_counts(boards):
+    """ Number of SOS sequences on each board of a (batch, n, n) array, found by comparing shifted views of the
+    boards in the four directions """
+    is_s = boards == S
+    is_o = boards == O
+    # Vertical, horizontal, left diagonal and right diagonal (start, middle, end) views
+    views = (((slice(None, -2), slice(None)), (slice(1, -1), slice(None)), (slice(2, None), slice(None))),
+             ((slice(None), slice(None, -2)), (slice(None), slice(1, -1)), (slice(None), slice(2, None))),
+             ((slice(None, -2), slice(None, -2)), (slice(1, -1), slice(1, -1)), (slice(2, None), slice(2, None))),
+             ((slice(None, -2), slice(2, None)), (slice(1, -1), slice(1, -1)), (slice(2, None), slice(None, -2))))
+    counts = np.zeros(len(boards), dtype=np.int32)
+    for start, middle, end in views:
+        sequences = is_s[(slice(None),) + start] & is_o[(slice(None),) + middle] & is_s[(slice(None),) + end]
+        counts += sequences.sum(axis=(1, 2), dtype=np.int32)
+    return counts
+
+
+class BatchEngine:
+    def __init__(self, batch, board_size=3, game_type=SIMPLE_GAME):
+        # Number of games, board size and rules (the same for every game of the batch)
+        self.batch = batch
+        self.board_size = board_size
+        self.game_type = game_type
+        self.general = game_type == GENERAL_GAME
+        # Cell codes of every board, inside a border of two empty cells so the cells around any placement can be
+        # read without bounds checks
+        self.padded = np.zeros((batch, board_size + 4, board_size + 4), dtype=np.int8)
+        self.boards = self.padded[:, 2:-2, 2:-2]
+        # Player to move, Blue and Red scores and whether each game has ended
+        self.to_move = np.full(batch, BLUE, dtype=np.int8)
+        self.scores = np.zeros((batch, 2), dtype=np.int32)
+        self.over = np.zeros(batch, dtype=bool)
+        # Moves played in each game
+        self.moves = np.zeros(batch, dtype=np.int32)
+
+    def legal_moves(self):
+        """ (batch, n, n) mask of the cells each game can play in (none for a game that has ended) """
+        return (self.boards == EMPTY) & ~self.over[:, None, None]
+
+    def step(self, rows, columns, codes):
+        """ Plays one move in every game still going ((batch,) arrays of rows, columns and letter codes; entries of
+        games that have ended are ignored) and returns the points each game's move scored """
+        active = ~self.over
+        games = np.flatnonzero(active)
+        rows, columns, codes = np.asarray(rows)[games], np.asarray(columns)[games], np.asarray(codes)[games]
+        if np.any(self.boards[games, rows, columns] != EMPTY):
+            raise ValueError("A move was played on an occupied cell")
+        if np.any((codes != S) & (codes != O)):
+            raise ValueError("Letter codes must be S or O")
+        self.boards[games, rows, columns] = codes
+        self.moves[games] += 1
+        points = np.zeros(self.batch, dtype=np.int32)
+        points[games] = self.new_sos(games, rows + 2, columns + 2, codes)
+        self.scores[games, self.to_move[games]] += points[games]
+        # The turn passes unless the move scored (a general game player goes again, a simple game is over)
+        passes = active & (points == 0)
+        self.to_move[passes] = 1 - self.to_move[passes]
+        full = self.moves == self.board_size * self.board_size
+        if self.general:
+            self.over |= full
+        else:
+            self.over |= full | (points > 0)
+        return points
+
+    def new_sos(self, games, rows, columns, codes):
+        """ Number of SOS sequences each game's placement just completed (rows and columns in the padded boards) """
+        padded = self.padded
+        counts = np.zeros(len(games), dtype=np.int32)
+        placed_s = codes == S
+        placed_o = codes == O
+        for row_step, column_step in DIRECTIONS:
+            # The cells one and two steps away on either side of the placement
+            before = padded[games, rows - row_step, columns - column_step]
+            after = padded[games, rows + row_step, columns + column_step]
+            before_2 = padded[games, rows - 2 * row_step, columns - 2 * column_step]
+            after_2 = padded[games, rows + 2 * row_step, columns + 2 * column_step]
+            # S as the start or end of a sequence, O as the middle
+            counts += placed_s & (after == O) & (after_2 == S)
+            counts += placed_s & (before == O) & (before_2 == S)
+            counts += placed_o & (before == S) & (after == S)
+        return counts
+
+    def random_moves(self, rng):
+        """ A uniformly random legal (rows, columns, codes) for every game, from a NumPy random generator """
+        cells = self.board_size * self.board_size
+        # The empty cell with the largest random key is a uniform pick among the empty cells
+        keys = rng.random((self.batch, cells))
+        keys[~self.legal_moves().reshape(self.batch, cells)] = -1
+        rows, columns = np.divmod(keys.argmax(axis=1), self.board_size)
+        return rows, columns, rng.integers(S, O + 1, self.batch).astype(np.int8)
+
+    def play_random(self, rng):
+        """ Plays random moves in every game until they have all ended """
+        while not self.over.all():
+            self.step(*self.random_moves(rng))
+
+    def winners(self):
+        """ BLUE, RED or NO_WINNER for every game, from the scores (a game still going has no winner) """
+        winners = np.full(self.batch, NO_WINNER, dtype=np.int8)
+        winners[self.over & (self.scores[:, BLUE] > self.scores[:, RED])] = BLUE
+        winners[self.over & (self.scores[:, RED] > self.scores[:, BLUE])] = RED
+        return winners
+
+
+def benchmark(batch=4096, board_size=9, game_type=GENERAL_GAME, seed=0):
+    """ Plays a batch of random games, returning (games per second, moves per second) """
+    engine = BatchEngine(batch, board_size, game_type)
+    start = time.perf_counter()
+    engine.play_random(np.random.default_rng(seed))
+    elapsed = time.perf_counter() - start
+    return batch / elapsed, engine.moves.sum() / elapsed
+
+
+if __name__ == '__main__':
+    # Usage: python Batch_Engine.py [batch size] [board size] [simple|general]
+    games_rate, moves_rate = benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 4096,
+                                       int(sys.argv[2]) if len(sys.argv) > 2 else 9,
+                                       SIMPLE_GAME if len(sys.argv) > 3 and sys.argv[3] == "simple" else GENERAL_GAME)
+    print(f"{games_rate:.0f} games/s, {moves_rate:.0f} moves/s")
@@ -0,0 +1,223 @@
+""" Bitboard backend for the board state: S, O and occupancy are each stored as an int bitmask """
+import random
+import sys
+import time
+from functools import lru_cache
+from Board_State import BoardState, EMPTY, S, O, LETTER_CODES, SYMBOLS, triple_table
+
+
+@lru_cache(maxsize=None)
+def shift_masks(board_size):
+    """ Precomputes, for each direction, its index step, the mask of valid sequence starts and, per cell, the mask
+    of the starts whose sequence passes through that cell """
+    n = board_size
+    masks = [[0, 0, [0] * (n * n)] for _ in range(4)]
+    for key, (start, middle, end) in triple_table(board_size).triples.items():
+        direction_masks = masks[key % 4]
+        direction_masks[0] = middle - start
+        direction_masks[1] |= 1 << start
+        for cell in (start, middle, end):
+            direction_masks[2][cell] |= 1 << start
+    return tuple((step, starts, tuple(through)) for step, starts, through in masks)
+
+
+@lru_cache(maxsize=None)
+def cell_triple_masks(board_size):
+    """ Precomputes, per cell, the triples an S placed there can complete as (key, mask of the other S, mask of the
+    middle) and the triples an O placed there can complete as (key, mask of both ends) """
+    table = triple_table(board_size)
+    as_s = [[] for _ in range(board_size * board_size)]
+    as_o = [[] for _ in range(board_size * board_size)]
+    for cell in range(board_size * board_size):
+        for key, middle, end in table.endpoints[cell]:
+            as_s[cell].append((key, 1 << end, 1 << middle))
+        for key, start, end in table.middles[cell]:
+            as_o[cell].append((key, 1 << start | 1 << end))
+    return tuple(map(tuple, as_s)), tuple(map(tuple, as_o))
+
+
+class BitBoardState:
+    def __init__(self, board_size=3):
+        # Number of rows and columns
+        self.board_size = board_size
+        # Bit i of each mask is cell index i (row * board_size + column)
+        self.s_mask = 0
+        self.o_mask = 0
+        self.occupied = 0
+        self.full_mask = (1 << (board_size * board_size)) - 1
+        # Number of occupied cells
+        self.filled = 0
+        # Indexes of the unoccupied cells (for move generation)
+        self.empty_cells = set(range(board_size * board_size))
+        # Same indexes as a list with each cell's slot in it, for picking a random empty cell in O(1)
+        self.empty_list = list(range(board_size * board_size))
+        self.empty_slots = list(range(board_size * board_size))
+        # Placements made so far as (cell index, keys of the sequences they completed), for undo
+        self.moves = []
+        # Completed SOS sequences as canonical keys (start cell index * 4 + direction)
+        self.completed = set()
+        # Same keys in the order they were made (only used for coloring and replay)
+        self.sequences = []
+        # Triples, shift masks for the four directions and per cell triple masks of this board size
+        self.table = triple_table(board_size)
+        self.masks = shift_masks(board_size)
+        self.s_triples, self.o_triples = cell_triple_masks(board_size)
+
+    def copy(self):
+        """ Returns an independent copy of the board state """
+        state = BitBoardState.__new__(BitBoardState)
+        state.__dict__.update(self.__dict__)
+        state.empty_cells = self.empty_cells.copy()
+        state.empty_list = self.empty_list.copy()
+        state.empty_slots = self.empty_slots.copy()
+        state.moves = self.moves.copy()
+        state.completed = self.completed.copy()
+        state.sequences = self.sequences.copy()
+        return state
+
+    def index(self, row, column):
+        """ Converts a row and column into a flat cell index """
+        return row * self.board_size + column
+
+    def position(self, index):
+        """ Converts a flat cell index into a (row, column) pair """
+        return divmod(index, self.board_size)
+
+    def code(self, index):
+        """ Returns the cell code at a flat index """
+        if self.s_mask >> index & 1:
+            return S
+        if self.o_mask >> index & 1:
+            return O
+        return EMPTY
+
+    def letter(self, row, column):
+        """ Returns the letter in a cell ('' if empty) """
+        return SYMBOLS[self.code(row * self.board_size + column)]
+
+    def is_empty(self, row, column):
+        """ Checks if a cell is unoccupied """
+        return not self.occupied >> (row * self.board_size + column) & 1
+
+    def is_full(self):
+        """ Checks if every cell is occupied """
+        return self.occupied == self.full_mask
+
+    def sequence_cells(self, key):
+        """ Converts a sequence key into its (start, middle, end) cell indexes """
+        return self.table.triples[key]
+
+    def is_completed(self, key):
+        """ Checks if a sequence has already been completed """
+        return key in self.completed
+
+    def place(self, row, column, letter):
+        """ Places a letter ('S' or 'O') in an empty cell and returns the keys of the SOS sequences it completed """
+        if not self.is_empty(row, column):
+            raise ValueError(f"Cell ({row}, {column}) is already occupied")
+        return self.place_code(row * self.board_size + column, LETTER_CODES[letter])
+
+    def place_code(self, index, code):
+        """ Places a cell code in an empty cell by flat index (no checks, for search) """
+        bit = 1 << index
+        if code == S:
+            self.s_mask |= bit
+        else:
+            self.o_mask |= bit
+        self.occupied |= bit
+        self.filled += 1
+        self.empty_cells.discard(index)
+        # Move the last empty cell into the placed cell's slot
+        last = self.empty_list.pop()
+        if last != index:
+            slot = self.empty_slots[index]
+            self.empty_list[slot] = last
+            self.empty_slots[last] = slot
+        new_sequences = [key for key in self.new_sos(index) if key not in self.completed]
+        self.completed.update(new_sequences)
+        self.sequences.extend(new_sequences)
+        self.moves.append((index, new_sequences))
+        return new_sequences
+
+    def undo(self):
+        """ Takes back the last placement and returns its (row, column, letter) """
+        index, new_sequences = self.moves.pop()
+        letter = SYMBOLS[self.code(index)]
+        clear = ~(1 << index)
+        self.s_mask &= clear
+        self.o_mask &= clear
+        self.occupied &= clear
+        self.filled -= 1
+        self.empty_cells.add(index)
+        self.empty_slots[index] = len(self.empty_list)
+        self.empty_list.append(index)
+        self.completed.difference_update(new_sequences)
+        del self.sequences[len(self.sequences) - len(new_sequences):]
+        row, column = divmod(index, self.board_size)
+        return row, column, letter
+
+    def sos_starts(self, direction):
+        """ Mask of the start cells of every SOS on the board in one direction """
+        step, starts, through = self.masks[direction]
+        return self.s_mask & (self.o_mask >> step) & (self.s_mask >> 2 * step) & starts
+
+    def new_sos(self, index):
+        """ Finds the keys of the SOS sequences passing through a cell, testing only the triples through it """
+        s_mask = self.s_mask
+        if s_mask >> index & 1:
+            # An S can only be an endpoint
+            o_mask = self.o_mask
+            return [key for key, other_s, middle in self.s_triples[index] if s_mask & other_s and o_mask & middle]
+        if self.o_mask >> index & 1:
+            # An O can only be the middle
+            return [key for key, ends in self.o_triples[index] if s_mask & ends == ends]
+        return []
+
+    def completing_cells(self):
+        """ Returns (S mask, O mask) of the empty cells where that letter would complete an SOS """
+        s_mask, o_mask = self.s_mask, self.o_mask
+        empty = self.full_mask & ~self.occupied
+        complete_with_s = 0
+        complete_with_o = 0
+        for step, starts, through in self.masks:
+            # S O _  ->  the end cell needs an S
+            complete_with_s |= (s_mask & (o_mask >> step) & (empty >> 2 * step) & starts) << 2 * step
+            # _ O S  ->  the start cell needs an S
+            complete_with_s |= empty & (o_mask >> step) & (s_mask >> 2 * step) & starts
+            # S _ S  ->  the middle cell needs an O
+            complete_with_o |= (s_mask & (empty >> step) & (s_mask >> 2 * step) & starts) << step
+        return complete_with_s, complete_with_o
+
+
+# Board backends selectable by SOSGameBase.board_backend
+BOARD_BACKENDS = {"list": BoardState, "bitboard": BitBoardState}
+
+
+def make_board_state(board_size, backend="list"):
+    """ Creates an empty board state using the chosen backend """
+    return BOARD_BACKENDS[backend](board_size)
+
+
+def benchmark_backends(board_sizes=range(3, 10), games=200, seed=0):
+    """ Times random full games on each backend, returning {(backend, board_size): microseconds per move} """
+    results = {}
+    for board_size in board_sizes:
+        cells = [(row, column) for row in range(board_size) for column in range(board_size)]
+        for backend in BOARD_BACKENDS:
+            rng = random.Random(seed)
+            start = time.perf_counter()
+            for _ in range(games):
+                state = make_board_state(board_size, backend)
+                rng.shuffle(cells)
+                for row, column in cells:
+                    state.place(row, column, rng.choice('SO'))
+            elapsed = time.perf_counter() - start
+            results[(backend, board_size)] = elapsed / (games * len(cells)) * 1e6
+    return results
+
+
+if __name__ == '__main__':
+    # Usage: python Bit_Board_State.py [games per size]
+    timings = benchmark_backends(games=int(sys.argv[1]) if len(sys.argv) > 1 else 200)
+    for (backend, board_size), micros in sorted(timings.items(), key=lambda item: (item[0][1], item[0][0])):
+        print(f"{board_size}x{board_size} {backend:>8}: {micros:.2f} us/move")
@@ -1,8 +1,18 @@
 from tkinter import *
 
 
+class Cell(Button):
+    """ Board button showing one cell of the board state """
+
+    def __init__(self, board, row, column, **kw):
+        super().__init__(board, **kw)
+        # Assign cells rows and columns
+        self.row = row
+        self.column = column
+
+
 class Board(Canvas):
-    def __init__(self, num_of_rows_and_columns, cell_update_function):
+    def __init__(self, num_of_rows_and_columns, cell_update_function, state=None):
         """ Initialize the number of rows and columns """
 
         # Inherit methods of Canvas class in Tkinter while providing some arguments
@@ -11,6 +21,9 @@ class Board(Canvas):
         # Initialize row and column number variable
         self.num_of_rows_and_columns = num_of_rows_and_columns
 
+        # Board state this view mirrors (owned by the game logic)
+        self.state = state
+
         # Create pixel instance for cell size later (needed for pixel sizing of buttons)
         self.pixel = PhotoImage()
 
@@ -48,15 +61,11 @@ class Board(Canvas):
             row_buttons = []
             for column in range(self.num_of_rows_and_columns):
                 # Create cell button
-                cell_button = Button(self, text='', width=self.col_width, height=self.row_height, relief="solid",
-                                     image=self.pixel, compound="center")
+                cell_button = Cell(self, row, column, text='', width=self.col_width, height=self.row_height,
+                                   relief="solid", image=self.pixel, compound="center")
                 # Call the cell update function when clicked
                 cell_button.config(command=lambda b=cell_button: self.cell_update_function(b))
 
-                # Assign cells rows and columns
-                cell_button.row = row
-                cell_button.column = column
-
                 # Add button to the row button
                 row_buttons.append(cell_button)
                 # Create the window for the button in each cell location
@@ -65,3 +74,20 @@ class Board(Canvas):
                                                    window=cell_button)
             # Add row buttons to overall matrix
             self.cell_matrix.append(row_buttons)
+
+    def render_cell(self, row, column):
+        """ Shows a cell as it is in the board state: its letter and disabled once played, blank and clickable
+        while empty """
+        if self.state is None:
+            return
+        letter = self.state.letter(row, column)
+        if letter:
+            self.cell_matrix[row][column].config(text=letter, state=DISABLED, font=("Helvetica", 40))
+        else:
+            self.cell_matrix[row][column].config(text='', state=NORMAL)
+
+    def render(self):
+        """ Shows every cell as it is in the board state """
+        for row in range(self.num_of_rows_and_columns):
+            for column in range(self.num_of_rows_and_columns):
+                self.render_cell(row, column)
@@ -0,0 +1,169 @@
+""" Tk-free model of an SOS board that the game logic treats as the source of truth """
+from collections import namedtuple
+from functools import lru_cache
+
+# Cell codes stored in the board
+EMPTY = 0
+S = 1
+O = 2
+
+# Conversion between the letters shown on the buttons and cell codes
+LETTER_CODES = {'S': S, 'O': O}
+SYMBOLS = ('', 'S', 'O')
+
+# Row and column steps for the four SOS directions (vertical, horizontal, left diagonal, right diagonal)
+DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+# Every valid triple of a board size:
+#   triples     key -> (start, middle, end) cell indexes, in direction then row/column order
+#   endpoints   per cell, (key, middle, other end) for the triples the cell is an endpoint of
+#   middles     per cell, (key, start, end) for the triples the cell is the middle of
+#   cell_keys   per cell, keys of every triple the cell is part of
+TripleTable = namedtuple("TripleTable", ["triples", "endpoints", "middles", "cell_keys"])
+
+
+@lru_cache(maxsize=None)
+def triple_table(board_size):
+    """ Builds the triple table for a board size (once per size, shared by every board) """
+    n = board_size
+    triples = {}
+    endpoints = [[] for _ in range(n * n)]
+    middles = [[] for _ in range(n * n)]
+    cell_keys = [[] for _ in range(n * n)]
+    for direction, (row_step, column_step) in enumerate(DIRECTIONS):
+        for row in range(n):
+            for column in range(n):
+                end_row, end_column = row + 2 * row_step, column + 2 * column_step
+                if not (0 <= end_row < n and 0 <= end_column < n):
+                    continue
+                start = row * n + column
+                middle = start + row_step * n + column_step
+                end = end_row * n + end_column
+                # The start is always the endpoint with the lower index, so each triple has one key
+                key = start * 4 + direction
+                triples[key] = (start, middle, end)
+                endpoints[start].append((key, middle, end))
+                endpoints[end].append((key, middle, start))
+                middles[middle].append((key, start, end))
+                for cell in (start, middle, end):
+                    cell_keys[cell].append(key)
+    return TripleTable(triples, tuple(map(tuple, endpoints)), tuple(map(tuple, middles)),
+                       tuple(map(tuple, cell_keys)))
+
+
+class BoardState:
+    def __init__(self, board_size=3):
+        # Number of rows and columns
+        self.board_size = board_size
+        # Flat array of cell codes, indexed by row * board_size + column
+        self.cells = [EMPTY] * (board_size * board_size)
+        # Number of occupied cells
+        self.filled = 0
+        # Indexes of the unoccupied cells (for move generation)
+        self.empty_cells = set(range(board_size * board_size))
+        # Same indexes as a list with each cell's slot in it, for picking a random empty cell in O(1)
+        self.empty_list = list(range(board_size * board_size))
+        self.empty_slots = list(range(board_size * board_size))
+        # Placements made so far as (cell index, keys of the sequences they completed), for undo
+        self.moves = []
+        # Completed SOS sequences as canonical keys (start cell index * 4 + direction), where the start is the
+        # endpoint with the lower index
+        self.completed = set()
+        # Same keys in the order they were made (only used for coloring and replay)
+        self.sequences = []
+        # Triples of this board size
+        self.table = triple_table(board_size)
+
+    def copy(self):
+        """ Returns an independent copy of the board state """
+        state = BoardState.__new__(BoardState)
+        state.__dict__.update(self.__dict__)
+        state.cells = self.cells.copy()
+        state.empty_cells = self.empty_cells.copy()
+        state.empty_list = self.empty_list.copy()
+        state.empty_slots = self.empty_slots.copy()
+        state.moves = self.moves.copy()
+        state.completed = self.completed.copy()
+        state.sequences = self.sequences.copy()
+        return state
+
+    def index(self, row, column):
+        """ Converts a row and column into a flat cell index """
+        return row * self.board_size + column
+
+    def position(self, index):
+        """ Converts a flat cell index into a (row, column) pair """
+        return divmod(index, self.board_size)
+
+    def code(self, index):
+        """ Returns the cell code at a flat index """
+        return self.cells[index]
+
+    def letter(self, row, column):
+        """ Returns the letter in a cell ('' if empty) """
+        return SYMBOLS[self.cells[row * self.board_size + column]]
+
+    def is_empty(self, row, column):
+        """ Checks if a cell is unoccupied """
+        return self.cells[row * self.board_size + column] == EMPTY
+
+    def is_full(self):
+        """ Checks if every cell is occupied """
+        return self.filled == len(self.cells)
+
+    def sequence_cells(self, key):
+        """ Converts a sequence key into its (start, middle, end) cell indexes """
+        return self.table.triples[key]
+
+    def is_completed(self, key):
+        """ Checks if a sequence has already been completed """
+        return key in self.completed
+
+    def place(self, row, column, letter):
+        """ Places a letter ('S' or 'O') in an empty cell and returns the keys of the SOS sequences it completed """
+        if not self.is_empty(row, column):
+            raise ValueError(f"Cell ({row}, {column}) is already occupied")
+        return self.place_code(row * self.board_size + column, LETTER_CODES[letter])
+
+    def place_code(self, index, code):
+        """ Places a cell code in an empty cell by flat index (no checks, for search) """
+        self.cells[index] = code
+        self.filled += 1
+        self.empty_cells.discard(index)
+        # Move the last empty cell into the placed cell's slot
+        last = self.empty_list.pop()
+        if last != index:
+            slot = self.empty_slots[index]
+            self.empty_list[slot] = last
+            self.empty_slots[last] = slot
+        new_sequences = [key for key in self.new_sos(index) if key not in self.completed]
+        self.completed.update(new_sequences)
+        self.sequences.extend(new_sequences)
+        self.moves.append((index, new_sequences))
+        return new_sequences
+
+    def undo(self):
+        """ Takes back the last placement and returns its (row, column, letter) """
+        index, new_sequences = self.moves.pop()
+        letter = SYMBOLS[self.cells[index]]
+        self.cells[index] = EMPTY
+        self.filled -= 1
+        self.empty_cells.add(index)
+        self.empty_slots[index] = len(self.empty_list)
+        self.empty_list.append(index)
+        # Sequences made by the last placement are always at the end of the ordered list
+        self.completed.difference_update(new_sequences)
+        del self.sequences[len(self.sequences) - len(new_sequences):]
+        row, column = divmod(index, self.board_size)
+        return row, column, letter
+
+    def new_sos(self, index):
+        """ Finds the keys of the SOS sequences passing through a cell (at most 8 for an S, 4 for an O) """
+        cells = self.cells
+        if cells[index] == S:
+            # An S can only be an endpoint
+            return [key for key, middle, end in self.table.endpoints[index] if cells[middle] == O and cells[end] == S]
+        if cells[index] == O:
+            # An O can only be the middle
+            return [key for key, start, end in self.table.middles[index] if cells[start] == S and cells[end] == S]
+        return []
@@ -0,0 +1,72 @@
+""" The computer player's choice of move at each difficulty, without any Tk objects, so the GUI, the simulator and
+tournaments all play the same computer """
+import os
+import random
+import time
+from Threat_Index import ThreatIndex, random_safe_move
+from Alpha_Beta_Search import AlphaBetaSearch
+from Parallel_Monte_Carlo_Search import make_monte_carlo_search
+from Endgame_Solver import EndgameSolver
+from Opening_Book import opening_book
+
+# Worker processes for the "Expert" difficulty's tree search (1 searches in the GUI process)
+SEARCH_WORKERS = int(os.getenv("SEARCH_WORKERS", "1"))
+
+# Default time limit per move (seconds) of the difficulties that search, which runs on the Tk thread
+TIME_LIMITS = {"Hard": 0.2, "Expert": 1.0}
+
+# Most empty cells at which each difficulty that searches solves the rest of the game exactly
+ENDGAME_THRESHOLDS = {"Hard": 8, "Expert": 8}
+
+
+class ComputerStrategy:
+    def __init__(self, difficulty="Simple", rng=random, search_workers=SEARCH_WORKERS):
+        # "Simple", "Hard" or "Expert"
+        self.difficulty = difficulty
+        # Random generator of the "Simple" difficulty's moves
+        self.rng = rng
+        # Completable SOS sequences of the board being played, kept up to date move by move
+        self.threat_index = None
+        # Time limit per move of each searching difficulty
+        self.time_limits = dict(TIME_LIMITS)
+        # Search used by the "Hard" difficulty, deepened one move at a time until its time limit
+        self.search = AlphaBetaSearch(max_depth=None, time_limit=TIME_LIMITS["Hard"])
+        # Tree search used by the "Expert" difficulty
+        self.monte_carlo = make_monte_carlo_search(search_workers, time_limit=TIME_LIMITS["Expert"])
+        # Exact solver taking over from the search once few enough cells are empty for the difficulty
+        self.endgame_thresholds = dict(ENDGAME_THRESHOLDS)
+        self.endgame = EndgameSolver()
+
+    def best_move(self, position):
+        """ Returns the (cell index, letter code) the difficulty plays in a position """
+        # The "Hard" and "Expert" difficulties search the position, play solved openings from the book and solve the
+        # endgame exactly. "Simple" only completes an SOS or plays safe, so the difficulties keep playing differently
+        # on small boards
+        search = {"Hard": self.search, "Expert": self.monte_carlo}.get(self.difficulty)
+        if search is None:
+            move = self.threats(position.state).scoring_move()
+            if move is not None:
+                return move
+            return random_safe_move(position.state, self.rng)
+        time_limit = self.time_limits[self.difficulty]
+        book = opening_book(position.state.board_size, position.game_type)
+        move = book.best_move(position) if book is not None else None
+        self.endgame.empty_threshold = self.endgame_thresholds[self.difficulty]
+        if move is None and self.endgame.applies(position):
+            # The solver gets half the time limit, and the difficulty's search what is left if it runs out
+            start = time.perf_counter()
+            self.endgame.time_limit = time_limit / 2
+            move = self.endgame.best_move(position)
+            time_limit -= time.perf_counter() - start
+        if move is None:
+            search.time_limit = time_limit
+            move = search.best_move(position)
+        return move
+
+    def threats(self, state):
+        """ Returns the threat index following a board state, starting a new one for a new board size """
+        if self.threat_index is None or self.threat_index.state.board_size != state.board_size:
+            self.threat_index = ThreatIndex(state)
+        else:
+            self.threat_index.follow(state)
+        return self.threat_index
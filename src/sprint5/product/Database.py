@@ -0,0 +1,130 @@
+""" Database access for recording and replaying games: a connection pool opened on first use, with health checks
+and reconnects, or a no-database mode in which recording is unavailable """
+import os
+import threading
+import time
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import pool
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Load in database details
+DB_HOST = os.getenv("DB_HOST")
+DB_USER = os.getenv("DB_USER")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+DB_DATABASE = os.getenv("DB_DATABASE")
+
+# Set SOS_NO_DATABASE=1 to play without a database (recording and replay are then unavailable)
+NO_DATABASE = os.getenv("SOS_NO_DATABASE", "").lower() in ("1", "true", "yes")
+
+# Most connections open at once (the recorder's writer thread and the Tk thread each use one)
+POOL_SIZE = 4
+
+# Connections idle for longer than this (seconds) are checked with a query before they are handed out
+HEALTH_CHECK_INTERVAL = 30.0
+
+
+class DatabaseUnavailable(Exception):
+    """ Raised when recording or replay needs the database but it is disabled or can't be reached """
+
+
+class Database:
+    def __init__(self, settings, enabled=True, pool_size=POOL_SIZE, connection_pool=pool.ThreadedConnectionPool):
+        # Connection settings (host, database, user, password) and whether a database is used at all
+        self.settings = settings
+        self.enabled = enabled
+        self.pool_size = pool_size
+        self.connection_pool = connection_pool
+        # Pool, created by the first game that records or replays
+        self.pool = None
+        self.pool_lock = threading.Lock()
+        # When each pooled connection was last used, by id
+        self.last_used = {}
+        # Why the last attempt to reach the database failed
+        self.last_error = None
+
+    def get_pool(self):
+        """ Returns the pool, opening it on first use """
+        if not self.enabled:
+            raise DatabaseUnavailable("Recording is turned off (no database)")
+        with self.pool_lock:
+            if self.pool is None:
+                try:
+                    self.pool = self.connection_pool(1, self.pool_size, **self.settings)
+                except psycopg2.Error as error:
+                    self.last_error = error
+                    raise DatabaseUnavailable(f"Can't reach the database: {error}") from error
+            return self.pool
+
+    def available(self):
+        """ Checks if the database can be used, connecting to it if this is the first time """
+        try:
+            self.get_pool()
+        except DatabaseUnavailable:
+            return False
+        return True
+
+    def healthy(self, connection):
+        """ Checks a pooled connection is still open, with a query if it has sat idle for a while """
+        if connection.closed:
+            return False
+        # A new connection or one used moments ago is trusted without a round trip
+        last_used = self.last_used.get(id(connection))
+        if last_used is None or time.monotonic() - last_used < HEALTH_CHECK_INTERVAL:
+            return True
+        try:
+            cur = connection.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            connection.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    @contextmanager
+    def connection(self):
+        """ Lends a healthy connection from the pool (reconnecting if the pooled one went bad), rolling back on
+        errors and returning it afterwards """
+        connection_pool = self.get_pool()
+        try:
+            connection = connection_pool.getconn()
+            # A connection that went bad is closed and replaced by a new one
+            if not self.healthy(connection):
+                self.last_used.pop(id(connection), None)
+                connection_pool.putconn(connection, close=True)
+                connection = connection_pool.getconn()
+        except psycopg2.Error as error:
+            self.last_error = error
+            raise DatabaseUnavailable(f"Can't reach the database: {error}") from error
+        broken = False
+        try:
+            yield connection
+        except psycopg2.Error as error:
+            self.last_error = error
+            broken = connection.closed or isinstance(error, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            if not broken:
+                try:
+                    connection.rollback()
+                except psycopg2.Error:
+                    broken = True
+            raise
+        finally:
+            if broken:
+                self.last_used.pop(id(connection), None)
+            else:
+                self.last_used[id(connection)] = time.monotonic()
+            connection_pool.putconn(connection, close=broken)
+
+    def close(self):
+        """ Closes every pooled connection """
+        with self.pool_lock:
+            if self.pool is not None:
+                self.pool.closeall()
+                self.pool = None
+
+
+# Database shared by every game of this process
+database = Database({"host": DB_HOST, "database": DB_DATABASE, "user": DB_USER, "password": DB_PASSWORD},
+                    enabled=not NO_DATABASE)
@@ -0,0 +1,117 @@
+""" Exact solver for the last few empty cells of a game, used by the computer player """
+import time
+from Board_State import S, O
+from Alpha_Beta_Search import SearchTimeout
+from Position import position_from_bytes
+from Symmetry import canonical_masks
+
+# Largest number of solved boards remembered before the memo is cleared
+MEMO_LIMIT = 1 << 20
+
+
+class EndgameSolver:
+    def __init__(self, empty_threshold=8, memo_limit=MEMO_LIMIT, symmetric=False, time_limit=None):
+        # Positions with at most this many empty cells are solved to the end
+        self.empty_threshold = empty_threshold
+        # Time limit per move (seconds, None for none): a board not solved in time gives no move, so the caller can
+        # search it instead
+        self.time_limit = time_limit
+        self.deadline = None
+        self.nodes = 0
+        # Largest memo kept between moves (None for no limit)
+        self.memo_limit = memo_limit
+        # Key the memo on the canonical orientation of each board, so rotations and reflections share an entry
+        # (8 times fewer entries at the cost of canonicalizing every board, which pays off on small boards)
+        self.symmetric = symmetric
+        # Solved boards: (S mask, O mask) -> best value for the player to move, for the rules in memo_rules
+        self.memo = {}
+        self.memo_rules = None
+        # Value of the last move chosen (points ahead from here on in a general game, 1/0/-1 in a simple game)
+        self.value = None
+
+    def applies(self, position):
+        """ Checks if a position is small enough to solve """
+        return len(position.state.empty_cells) <= self.empty_threshold and not position.is_over()
+
+    def best_move(self, position):
+        """ Returns a provably optimal (cell index, letter code) for the player to move, or None if the time limit
+        passes first """
+        self.deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        self.nodes = 0
+        # Solved on a bitboard copy so every board is keyed by two ints
+        state = position_from_bytes(position.to_bytes(), "bitboard").state
+        general = position.general
+        # A value only depends on the board and the rules, so the memo carries over between moves of a game
+        if self.memo_rules != (state.board_size, general) or \
+                (self.memo_limit is not None and len(self.memo) > self.memo_limit):
+            self.memo = {}
+            self.memo_rules = (state.board_size, general)
+        best, best_value = None, None
+        try:
+            for index, code in self.moves(state):
+                value = self.move_value(state, index, code, general)
+                if best_value is None or value > best_value:
+                    best, best_value = (index, code), value
+        except SearchTimeout:
+            # Only finished values are remembered, so the memo is still sound (the unfinished copy is dropped)
+            self.value = None
+            return None
+        self.value = best_value
+        return best
+
+    def moves(self, state):
+        """ Every (cell index, letter code) of the empty cells, in index order """
+        empty = state.full_mask & ~state.occupied
+        moves = []
+        while empty:
+            low = empty & -empty
+            index = low.bit_length() - 1
+            moves.append((index, S))
+            moves.append((index, O))
+            empty ^= low
+        return moves
+
+    def move_value(self, state, index, code, general):
+        """ Value of a move for the player making it """
+        points = len(state.place_code(index, code))
+        if not points and not general and any(state.completing_cells()):
+            # Leaving an SOS to complete loses a simple game on the opponent's next move
+            value = -1
+        elif not points:
+            # The turn passes, so the opponent's best is this player's worst
+            value = -self.solve(state, general)
+        elif general:
+            # The scorer moves again
+            value = points + self.solve(state, general)
+        else:
+            # The first SOS wins a simple game
+            value = 1
+        state.undo()
+        return value
+
+    def solve(self, state, general):
+        """ Best value for the player to move: future points ahead in a general game, win (1), draw (0) or loss (-1)
+        in a simple game """
+        if self.symmetric:
+            key = canonical_masks(state.s_mask, state.o_mask, state.board_size)[:2]
+        else:
+            key = (state.s_mask, state.o_mask)
+        value = self.memo.get(key)
+        if value is not None:
+            return value
+        if state.occupied == state.full_mask:
+            return 0
+        # The clock is only read every 256 boards solved
+        self.nodes += 1
+        if self.deadline is not None and not self.nodes & 255 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        value = None
+        for index, code in self.moves(state):
+            move_value = self.move_value(state, index, code, general)
+            if value is None or move_value > value:
+                value = move_value
+                # Nothing beats a win in a simple game
+                if not general and value == 1:
+                    break
+        self.memo[key] = value
+        return value
@@ -1,5 +1,9 @@
 # Main
 from Game_Logic import *
+import psycopg2
+from Database import database, DatabaseUnavailable
+from Parallel_Monte_Carlo_Search import shutdown_pools
+from Replay import REPLAY_SPEED
 from tkinter import ttk
 from tkinter import messagebox
 
@@ -41,9 +45,20 @@ class SOS:
         # Populate the bottom frame
         self.bottom_frame_panel()
 
+        # Write any recorded moves still buffered before the window closes
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
         # Execute GUI
         self.root.mainloop()
 
+    def close(self):
+        """ Finishes writing the recorded game, stops the search workers, then closes the window """
+        self.stop_replay()
+        self.boardgame.recorder.close()
+        database.close()
+        shutdown_pools()
+        self.root.destroy()
+
     def game_selection_panel(self, frame):
         """ Places the game selection panel """
         # SOS Label in top left
@@ -89,6 +104,17 @@ class SOS:
                         command=lambda player_type="Computer": self.boardgame.blue_player.player_update(
                             player_type)).pack(side=TOP)
 
+        # Computer difficulty
+        self.blue_difficulty = StringVar(value="Simple")
+        ttk.Radiobutton(self.left_frame, variable=self.blue_difficulty, value="Simple", text="Simple").pack(side=TOP)
+        ttk.Radiobutton(self.left_frame, variable=self.blue_difficulty, value="Hard", text="Hard").pack(side=TOP)
+        ttk.Radiobutton(self.left_frame, variable=self.blue_difficulty, value="Expert", text="Expert").pack(side=TOP)
+
+        # Computer time limit per move in milliseconds (blank for the difficulty's default)
+        Label(self.left_frame, text="Time Limit (ms)").pack(side=TOP)
+        self.blue_time_limit = StringVar(value="")
+        Entry(self.left_frame, width=6, textvariable=self.blue_time_limit).pack(side=TOP)
+
         # Placeholder labels for the score that will be hidden in a simple game or configured in a general game
         self.blue_score_label_text = Label(self.left_frame, text="Blue Player Score:")
         self.blue_score_label = ttk.Label(self.left_frame, textvariable=self.boardgame.blue_player.score)
@@ -122,10 +148,41 @@ class SOS:
                         command=lambda player_type="Computer": self.boardgame.red_player.player_update(
                             player_type)).pack(side=TOP)
 
+        # Computer difficulty
+        self.red_difficulty = StringVar(value="Simple")
+        ttk.Radiobutton(self.right_frame, variable=self.red_difficulty, value="Simple", text="Simple").pack(side=TOP)
+        ttk.Radiobutton(self.right_frame, variable=self.red_difficulty, value="Hard", text="Hard").pack(side=TOP)
+        ttk.Radiobutton(self.right_frame, variable=self.red_difficulty, value="Expert", text="Expert").pack(side=TOP)
+
+        # Computer time limit per move in milliseconds (blank for the difficulty's default)
+        Label(self.right_frame, text="Time Limit (ms)").pack(side=TOP)
+        self.red_time_limit = StringVar(value="")
+        Entry(self.right_frame, width=6, textvariable=self.red_time_limit).pack(side=TOP)
+
         # Score Label
         self.red_score_label_text = Label(self.right_frame, text="Red Player Score:")
         self.red_score_label = ttk.Label(self.right_frame, textvariable=self.boardgame.red_player.score)
 
+        # Replay controls on bottom right: go to a move, speed (moves per second), then step back, pause and step
+        # forward
+        self.replay = None
+        replay_seek_frame = ttk.Frame(self.right_frame)
+        replay_seek_frame.pack(side=BOTTOM)
+        self.replay_seek_var = StringVar(value="0")
+        Entry(replay_seek_frame, width=4, textvariable=self.replay_seek_var).pack(side=LEFT)
+        ttk.Button(replay_seek_frame, text="Go to Move", command=self.seek_replay).pack(side=LEFT)
+        replay_speed_frame = ttk.Frame(self.right_frame)
+        replay_speed_frame.pack(side=BOTTOM)
+        self.replay_speed_var = StringVar(value=f"{REPLAY_SPEED:g}")
+        Entry(replay_speed_frame, width=4, textvariable=self.replay_speed_var).pack(side=LEFT)
+        ttk.Button(replay_speed_frame, text="Moves/s", command=self.change_replay_speed).pack(side=LEFT)
+        replay_step_frame = ttk.Frame(self.right_frame)
+        replay_step_frame.pack(side=BOTTOM)
+        ttk.Button(replay_step_frame, text="<", width=2, command=lambda: self.step_replay(False)).pack(side=LEFT)
+        self.pause_button = ttk.Button(replay_step_frame, text="Pause", command=self.toggle_replay_pause)
+        self.pause_button.pack(side=LEFT)
+        ttk.Button(replay_step_frame, text=">", width=2, command=lambda: self.step_replay(True)).pack(side=LEFT)
+
         # Replay Button on bottom right
         self.replay_button = ttk.Button(self.right_frame, text="Replay", command=self.replay_game)
         self.replay_button.pack(side=BOTTOM)
@@ -184,17 +241,27 @@ class SOS:
         """ Checks Player type """
         if self.boardgame.blue_player.player_type == "Computer":
             self.boardgame.blue_player = ComputerPlayer(self.boardgame.blue_player)
+            self.boardgame.blue_player.difficulty = self.blue_difficulty.get()
+            self.set_time_limit(self.boardgame.blue_player, self.blue_time_limit.get())
         else:
             self.boardgame.blue_player = Player()
         if self.boardgame.red_player.player_type == "Computer":
             self.boardgame.red_player = ComputerPlayer(self.boardgame.red_player)
+            self.boardgame.red_player.difficulty = self.red_difficulty.get()
+            self.set_time_limit(self.boardgame.red_player, self.red_time_limit.get())
         else:
             self.boardgame.red_player = Player()
 
+    def set_time_limit(self, computer_player, milliseconds):
+        """ Sets a computer player's time limit per move for its difficulty from an entry """
+        if milliseconds.strip().isdigit() and computer_player.difficulty in computer_player.time_limits:
+            computer_player.time_limits[computer_player.difficulty] = max(int(milliseconds), 1) / 1000
+
     def start_new_game(self):
         """ Starts a new game """
         if messagebox.askyesno(title="New Game",
                                message="Are you sure you want to make a new game?"):
+            self.stop_replay()
             self.choose_player_types()
             # Sets board size based on radio buttons
             self.boardgame.turn.set("Current Turn: Blue")
@@ -205,7 +272,11 @@ class SOS:
             self.blue_player_choice.set('S')
             self.red_player_choice.set('S')
 
-            # Sets whether the game will be recorded
+            # Sets whether the game will be recorded (the database is only connected to for a recorded game)
+            if self.record_game_var.get() and not database.available():
+                messagebox.showerror(title="Error", message="Recording needs a database connection, so this game "
+                                                            "won't be recorded")
+                self.record_game_var.set(False)
             self.boardgame.recorded_game = self.record_game_var.get()
 
             try:
@@ -248,53 +319,104 @@ class SOS:
 
     def replay_game(self):
         """ Clears board """
+        # Only one replay runs at a time
+        self.stop_replay()
+
+        # Disable recording
+        self.record_game_var.set(False)
+        self.boardgame.recorded_game = self.record_game_var.get()
 
+        # Moves are played one at a time on the event loop, on a board set up for the last recorded game
+        try:
+            replay = self.boardgame.replay_recorded_game(self.new_replay_board, self.replay_speed())
+        except (DatabaseUnavailable, psycopg2.Error):
+            # Replays are read from the database, so there is nothing to replay without one
+            messagebox.showerror(title="Error", message="Replay needs a database connection")
+            return
+        if replay is None:
+            messagebox.showerror(title="Error", message="No recorded game to replay")
+            return
+        self.replay = replay
+        self.pause_button.config(text="Pause")
+
+        self.GUI_player_type_correction()
+
+    def new_replay_board(self, board_size, game_type):
+        """ Sets up an empty board of the size and game type being replayed and returns its game """
         # Creates players to play game
         self.boardgame.blue_player = Player()
         self.boardgame.red_player = Player()
 
-        # Sets board size based on radio buttons
+        # Board size and game type come from the database
+        self.boardgame.board_size = board_size
         self.boardgame.turn.set("Current Turn: Blue")
+        self.boardgame.game_type.set(game_type)
+        self.choose_game_mode()
 
-        # Disable recording
-        self.record_game_var.set(False)
-        self.boardgame.recorded_game = self.record_game_var.get()
-
-        # Get previous board size
-        cur.execute('''SELECT *
-                       FROM public."Move"
-                       LIMIT 1''')
+        # Reset Scores
+        self.boardgame.blue_player.score.set(value=0)
+        self.boardgame.red_player.score.set(value=0)
 
-        rows = cur.fetchall()
-
-        # Get board size from database
-        self.boardgame.board_size = rows[0][5]
+        # Create board instance
+        board = self.boardgame.new_board()
+        # Center the game board
+        board.place(anchor=CENTER, relx=.5, rely=.5)
+        # Displays current game mode
+        self.game_mode_label.config(text=f"Current Game Mode: {self.boardgame.game_type.get()}")
 
         self.turn_label.pack(side=BOTTOM)
+        return self.boardgame
 
-        try:
-            # Set game type from database
-            self.boardgame.game_type.set(rows[0][6])
-            self.choose_game_mode()
-
-            # Reset Scores
-            self.boardgame.blue_player.score.set(value=0)
-            self.boardgame.red_player.score.set(value=0)
+    def stop_replay(self):
+        """ Ends the replay in progress, if any """
+        if self.replay is not None:
+            self.replay.stop()
+            self.replay = None
 
-            # Create board instance
-            board = self.boardgame.new_board()
-            # Center the game board
-            board.place(anchor=CENTER, relx=.5, rely=.5)
-            # Displays current game mode
-            self.game_mode_label.config(text=f"Current Game Mode: {self.boardgame.game_type.get()}")
-
-            self.boardgame.replay_recorded_game()
-
-            self.GUI_player_type_correction()
+    def replay_speed(self):
+        """ Replay speed entered in moves per second (the default if blank or invalid) """
+        try:
+            speed = float(self.replay_speed_var.get())
+        except ValueError:
+            return REPLAY_SPEED
+        return speed if speed > 0 else REPLAY_SPEED
+
+    def change_replay_speed(self):
+        """ Applies the speed entered to the replay """
+        if self.replay is not None:
+            self.replay.set_speed(self.replay_speed())
+
+    def toggle_replay_pause(self):
+        """ Pauses or resumes the replay """
+        if self.replay is None:
+            return
+        if self.replay.paused:
+            self.replay.resume()
+            self.pause_button.config(text="Pause")
+        else:
+            self.replay.pause()
+            self.pause_button.config(text="Resume")
+
+    def step_replay(self, forward):
+        """ Pauses the replay and shows one move more or one move less """
+        if self.replay is None:
+            return
+        if forward:
+            self.replay.step_forward()
+        else:
+            self.replay.step_back()
+        self.pause_button.config(text="Resume")
 
-        except (Exception,):
-            # If any errors occur, skip execution
-            pass
+    def seek_replay(self):
+        """ Shows the replayed game as it was after the number of moves entered """
+        if self.replay is None:
+            return
+        try:
+            ply = int(self.replay_seek_var.get())
+        except ValueError:
+            messagebox.showerror(title="Error", message="Enter the number of moves to go to")
+            return
+        self.replay.seek(max(ply, 0))
 
 
 # Main
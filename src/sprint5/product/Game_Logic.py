@@ -1,26 +1,14 @@
-import os
-import time
-import tkinter
 from tkinter import messagebox
 from tkinter import *
 from Board import Board
-import random
-import psycopg2
-from datetime import datetime
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Load in database details
-DB_HOST = os.getenv("DB_HOST")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_DATABASE = os.getenv("DB_DATABASE")
-
-# Database connection
-conn = psycopg2.connect(host=DB_HOST, database=DB_DATABASE, user=DB_USER, password=DB_PASSWORD)
-
-cur = conn.cursor()
+from Board_State import SYMBOLS
+from Bit_Board_State import make_board_state
+from Threat_Index import random_safe_move
+from Position import Position, BLUE, RED, SIMPLE_GAME, GENERAL_GAME
+from Computer_Strategy import ComputerStrategy, SEARCH_WORKERS, TIME_LIMITS, ENDGAME_THRESHOLDS
+from Move_Recorder import MoveRecorder
+from Replay import ReplayPlayer, REPLAY_SPEED, latest_game
+from Database import database
 
 
 class Player:
@@ -40,103 +28,45 @@ class Player:
         self.player_type = player_type
 
 
-class ComputerPlayer(Player):
+class ComputerPlayer(Player, ComputerStrategy):
     def __init__(self, base_player):
         # Updates base game parameters with what was given
         super().__init__()
         super().__dict__.update(base_player.__dict__)
-        self.difficulty = "Simple"
+        # Tk-free choice of moves, starting at the "Simple" difficulty
+        ComputerStrategy.__init__(self)
         self.player_type = "Computer"
 
-    def move_selector(self, board_size, matrix_list):
-        if self.make_sos_move(board_size, matrix_list):
-            return self.make_sos_move(board_size, matrix_list)
-        return self.make_random_move(board_size, matrix_list)
-
-    def make_random_move(self, board_size, matrix_list):
-        """ Makes a random valid move """
-        row = random.randint(0, board_size - 1)
-        col = random.randint(0, board_size - 1)
-        while matrix_list[row][col]["state"] == tkinter.DISABLED:
-            row = random.randint(0, board_size - 1)
-            col = random.randint(0, board_size - 1)
-        if random.randint(0, 1) == 0:
-            self.symbol = 'S'
-        else:
-            self.symbol = 'O'
+    def move_selector(self, board_size, matrix_list, position):
+        """ Returns the cell of the move chosen in a Tk-free snapshot of the game, setting the symbol to place """
+        index, code = self.best_move(position)
+        self.symbol = SYMBOLS[code]
+        row, column = divmod(index, board_size)
+        return matrix_list[row][column]
+
+    def make_random_move(self, board_size, matrix_list, state):
+        """ Makes a random valid move on the board state mirrored by the cells, avoiding moves that leave the
+        opponent an SOS whenever possible """
+        index, code = random_safe_move(state, self.rng)
+        self.symbol = SYMBOLS[code]
+        row, col = state.position(index)
         return matrix_list[row][col]
 
-    def make_sos_move(self, board_size, matrix_list):
-        """ Identifies and makes a completing move if an SOS can be made """
-        # SOS Check For Horizontal SOS
-        for i in range(board_size - 2):
-            for j in range(board_size):
-                if matrix_list[i][j]['text'] == 'S' and matrix_list[i + 1][j]['text'] == 'O' and matrix_list[i + 2][j][
-                    "state"] != tkinter.DISABLED:
-                    self.symbol = 'S'
-                    return matrix_list[i + 2][j]
-                if matrix_list[i][j]['text'] == 'S' and matrix_list[i + 2][j]['text'] == 'S' and matrix_list[i + 1][j][
-                    'state'] != tkinter.DISABLED:
-                    self.symbol = 'O'
-                    return matrix_list[i + 1][j]
-                if matrix_list[i + 1][j]['text'] == 'O' and matrix_list[i + 2][j]['text'] == 'S' and matrix_list[i][j][
-                    'state'] != tkinter.DISABLED:
-                    self.symbol = 'S'
-                    return matrix_list[i][j]
-
-        # SOS Check for Vertical SOS
-        for i in range(board_size):
-            for j in range(board_size - 2):
-                if matrix_list[i][j]['text'] == 'S' and matrix_list[i][j + 1]['text'] == 'O' and matrix_list[i][j + 2][
-                    "state"] != tkinter.DISABLED:
-                    self.symbol = 'S'
-                    return matrix_list[i][j + 2]
-                if matrix_list[i][j]['text'] == 'S' and matrix_list[i][j + 2]['text'] == 'S' and matrix_list[i][j + 1][
-                    'state'] != tkinter.DISABLED:
-                    self.symbol = 'O'
-                    return matrix_list[i][j + 1]
-                if matrix_list[i][j + 1]['text'] == 'O' and matrix_list[i][j + 2]['text'] == 'S' and matrix_list[i][j][
-                    'state'] != tkinter.DISABLED:
-                    self.symbol = 'S'
-                    return matrix_list[i][j]
-
-        # SOS Check for left diagonal SOS
-        for i in range(board_size - 2):
-            for j in range(board_size - 2):
-                if matrix_list[i][j]['text'] == 'S' and matrix_list[i + 1][j + 1]['text'] == 'O' and \
-                        matrix_list[i + 2][j + 2][
-                            "state"] != tkinter.DISABLED:
-                    self.symbol = 'S'
-                    return matrix_list[i + 2][j + 2]
-                if matrix_list[i][j]['text'] == 'S' and matrix_list[i + 2][j + 2]['text'] == 'S' and \
-                        matrix_list[i + 1][j + 1]['state'] != tkinter.DISABLED:
-                    self.symbol = 'O'
-                    return matrix_list[i + 1][j + 1]
-                if matrix_list[i + 1][j + 1]['text'] == 'O' and matrix_list[i + 2][j + 2]['text'] == 'S' and \
-                        matrix_list[i][j]['state'] != tkinter.DISABLED:
-                    self.symbol = 'S'
-                    return matrix_list[i][j]
-
-        # SOS Check for right diagonal SOS
-        for i in range(board_size - 2):
-            for j in range(2, board_size):
-                if matrix_list[i][j]['text'] == 'S' and matrix_list[i + 1][j - 1]['text'] == 'O' and \
-                        matrix_list[i + 2][j - 2][
-                            "state"] != tkinter.DISABLED:
-                    self.symbol = 'S'
-                    return matrix_list[i + 2][j - 2]
-                if matrix_list[i][j]['text'] == 'S' and matrix_list[i + 2][j - 2]['text'] == 'S' and \
-                        matrix_list[i + 1][j - 1]['state'] != tkinter.DISABLED:
-                    self.symbol = 'O'
-                    return matrix_list[i + 1][j - 1]
-                if matrix_list[i + 1][j - 1]['text'] == 'O' and matrix_list[i + 2][j - 2]['text'] == 'S' and \
-                        matrix_list[i][j]['state'] != tkinter.DISABLED:
-                    self.symbol = 'S'
-                    return matrix_list[i][j]
-        return False
+    def make_sos_move(self, board_size, matrix_list, state):
+        """ Identifies and makes a completing move if an SOS can be made on the board state mirrored by the cells """
+        move = self.threats(state).scoring_move()
+        if move is None:
+            return False
+        index, code = move
+        self.symbol = SYMBOLS[code]
+        row, column = state.position(index)
+        return matrix_list[row][column]
 
 
 class SOSGameBase:
+    # Rules the computer player searches with
+    rules = SIMPLE_GAME
+
     def __init__(self, blue_player, red_player, board_size=3):
         # Default board size of 3
         self.board_size = board_size
@@ -149,16 +79,29 @@ class SOSGameBase:
         red_player.score.set(value=0)
         # Set variable for the current turn
         self.turn = StringVar(value="Current Turn: Blue")
+        # Board state backend ("list" or "bitboard")
+        self.board_backend = "list"
+        # Board state (source of truth for the rules)
+        self.state = make_board_state(self.board_size, self.board_backend)
         # Create Board Placeholder
-        self.board = Board(self.board_size, self.cell_update)
+        self.board = Board(self.board_size, self.cell_update, self.state)
         # Cell matrix placeholder
         self.cell_matrix = None
         # Store all the complete SOS button sequences
         self.complete_sos_list = []
+        # (turn, points scored, cell colors replaced) of every move played on the board, for taking moves back
+        self.history = []
         # Signals end of game
         self.game_over = False
         # Recorded Game
         self.recorded_game = False
+        # Whether a recorded game is being replayed on the board (which ignores clicks meanwhile)
+        self.replaying = False
+        # Moves of a recorded game waiting to be written to the database
+        self.recorder = MoveRecorder(database)
+        # Delay (ms) before each computer move and the pending scheduled move
+        self.computer_delay = 250
+        self.computer_job = None
 
     def update_board(self):
         """ Updates the board with current state (Only used for drawing the S and O for computer opponents)"""
@@ -167,12 +110,19 @@ class SOSGameBase:
     def new_board(self):
         """ Creates a new board with specified user size"""
         if self.recorded_game:
-            self.create_record_table()
+            self.start_recording()
+        # Drop any computer move still scheduled for the previous board
+        if self.computer_job is not None:
+            self.board.after_cancel(self.computer_job)
+            self.computer_job = None
         try:
             # If board size is correct (n > 2 and n < 10)
             if 2 < self.board_size < 10:
-                # Make the board and pass cell function and game mode
-                self.board = Board(self.board_size, self.cell_update)
+                # Make a fresh board state and a board view that mirrors it
+                self.state = make_board_state(self.board_size, self.board_backend)
+                self.history = []
+                self.game_over = False
+                self.board = Board(self.board_size, self.cell_update, self.state)
                 self.cell_matrix = self.board.cell_matrix
                 return self.board
             # If board size is n < 3 (too small)
@@ -188,95 +138,125 @@ class SOSGameBase:
                                          "than 10")
 
     def cell_update(self, cell):
-        """ Updates cell with symbol """
+        """ Updates cell with symbol, then hands over to the computer if it is its turn """
+        # Clicks only play for a human, and not while a computer move is waiting on the event loop or a recorded game
+        # is being replayed
+        if self.current_player().player_type == "Computer" or self.computer_job is not None or self.replaying:
+            return
+        if self.play_move(cell):
+            self.schedule_computer_turn()
+
+    def position(self):
+        """ Returns a Tk-free copy of the game for the computer player to search """
+        to_move = BLUE if self.turn.get() == "Current Turn: Blue" else RED
+        return Position(self.state.copy(), self.rules, to_move,
+                        (self.blue_player.score.get(), self.red_player.score.get()))
+
+    def current_player(self):
+        """ Returns the player whose turn it is """
+        if self.turn.get() == "Current Turn: Blue":
+            return self.blue_player
+        return self.red_player
+
+    def play_move(self, cell):
+        """ Plays a single move for the current player and returns whether the game goes on """
+        # Occupied cells can't be played again
+        if not self.state.is_empty(cell.row, cell.column):
+            return False
+        player = self.current_player()
         turn = self.turn.get()
-        # Blue turn
-        if turn == "Current Turn: Blue":
-            # Adds the symbol and disable the button to prevent any further changes
-            cell.config(text=self.blue_player.symbol, state=DISABLED, font=("Helvetica", 40))
-            self.record_move('Blue', cell.row, cell.column, self.blue_player.symbol)
-            self.board.after(250, self.update_board())
-            self.check_sos()
-            if not self.win_condition():
-                self.turn.set(value="Current Turn: Red")
-                if self.red_player.player_type == "Computer":
-                    self.cell_update(self.red_player.move_selector(self.board_size, self.cell_matrix))
-
-        # Red turn
+        # Adds the symbol to the board state, then shows it, which disables the button to prevent any further changes
+        self.state.place(cell.row, cell.column, player.symbol)
+        self.board.render_cell(cell.row, cell.column)
+        self.record_move(turn[14:], cell.row, cell.column, player.symbol)
+        # Colors the new sequences are about to replace, so the move can be taken back
+        colors = [(button, button.cget("disabledforeground"))
+                  for key in self.state.sequences[len(self.complete_sos_list):]
+                  for button in self.sequence_buttons(key)]
+        points_scored = self.check_sos()
+        self.history.append((turn, points_scored, colors))
+        self.add_score(player, points_scored)
+        if self.win_condition():
+            # The whole game is written in one batch once it is over
+            if self.recorded_game:
+                self.recorder.finish_game(self.game_result(), self.blue_player.score.get(),
+                                          self.red_player.score.get())
+            return False
+        self.next_turn(points_scored)
+        return True
+
+    def undo_move(self):
+        """ Takes back the last move played: its letter, the SOS sequences it made and their colors, its points and
+        the turn (for stepping a replay back) """
+        turn, points_scored, colors = self.history.pop()
+        row, column, letter = self.state.undo()
+        if points_scored:
+            del self.complete_sos_list[-points_scored:]
+        # Cells colored more than once get their first color back last
+        for button, color in reversed(colors):
+            button.config(disabledforeground=color)
+        self.turn.set(turn)
+        self.add_score(self.current_player(), -points_scored)
+        if self.game_over:
+            # The end of the game disabled every cell, so the empty ones are enabled again
+            self.game_over = False
+            self.board.render()
         else:
-            # Adds the symbol and disable the button to prevent any further changes
-            cell.config(text=self.red_player.symbol, state=DISABLED, font=("Helvetica", 40))
-            self.record_move('Red', cell.row, cell.column, self.red_player.symbol)
-            self.board.after(250, self.update_board())
-            self.check_sos()
-            if not self.win_condition():
-                self.turn.set(value="Current Turn: Blue")
-                if self.blue_player.player_type == "Computer":
-                    self.cell_update(self.blue_player.move_selector(self.board_size, self.cell_matrix))
+            self.board.render_cell(row, column)
+
+    def add_score(self, player, points_scored):
+        """ Placeholder for derived classes """
+        pass
+
+    def next_turn(self, points_scored):
+        """ Passes the turn to the other player """
+        if self.turn.get() == "Current Turn: Blue":
+            self.turn.set(value="Current Turn: Red")
+        else:
+            self.turn.set(value="Current Turn: Blue")
+
+    def schedule_computer_turn(self):
+        """ Schedules the next computer move on the Tk event loop instead of recursing, so long games neither grow
+        the stack nor freeze the window """
+        if not self.game_over and self.current_player().player_type == "Computer":
+            self.computer_job = self.board.after(self.computer_delay, self.computer_turn)
+
+    def computer_turn(self):
+        """ Plays one computer move and schedules the next if it is still a computer's turn """
+        self.computer_job = None
+        player = self.current_player()
+        if self.game_over or player.player_type != "Computer":
+            return
+        if self.play_move(player.move_selector(self.board_size, self.cell_matrix, self.position())):
+            self.schedule_computer_turn()
+
+    def run_computer_turns(self):
+        """ Plays computer moves back to back until a human is to move or the game ends (no event loop needed) """
+        player = self.current_player()
+        while not self.game_over and player.player_type == "Computer" and \
+                self.play_move(player.move_selector(self.board_size, self.cell_matrix, self.position())):
+            player = self.current_player()
 
     def set_game_type(self, game_type):
         """ Sets game type """
         self.game_type = game_type
 
     def check_sos(self):
-        """ Checks if an SOS has been completed """
-
-        # SOS Check For Horizontal SOS
-        for i in range(self.board_size - 2):
-            for j in range(self.board_size):
-                if self.cell_matrix[i][j]['text'] == 'S' and self.cell_matrix[i + 1][j]['text'] == 'O' and \
-                        self.cell_matrix[i + 2][j]['text'] == 'S':
-                    if [self.cell_matrix[i][j], self.cell_matrix[i + 1][j],
-                        self.cell_matrix[i + 2][j]] not in self.complete_sos_list:
-                        # Add sequence to completed list
-                        self.complete_sos_list.append(
-                            [self.cell_matrix[i][j], self.cell_matrix[i + 1][j], self.cell_matrix[i + 2][j]])
-                        # Color sequence
-                        self.color_sequence(self.cell_matrix[i][j], self.cell_matrix[i + 1][j],
-                                            self.cell_matrix[i + 2][j])
-
-        # SOS Check For Vertical SOS
-        for i in range(self.board_size):
-            for j in range(self.board_size - 2):
-                if self.cell_matrix[i][j]['text'] == 'S' and self.cell_matrix[i][j + 1]['text'] == 'O' and \
-                        self.cell_matrix[i][j + 2]['text'] == 'S':
-                    if [self.cell_matrix[i][j], self.cell_matrix[i][j + 1],
-                        self.cell_matrix[i][j + 2]] not in self.complete_sos_list:
-                        # Add sequence to completed list
-                        self.complete_sos_list.append(
-                            [self.cell_matrix[i][j], self.cell_matrix[i][j + 1], self.cell_matrix[i][j + 2]])
-                        # Color sequence
-                        self.color_sequence(self.cell_matrix[i][j], self.cell_matrix[i][j + 1],
-                                            self.cell_matrix[i][j + 2])
-
-        # SOS Check For Left Diagonal SOS
-        for i in range(self.board_size - 2):
-            for j in range(self.board_size - 2):
-                if self.cell_matrix[i][j]['text'] == 'S' and self.cell_matrix[i + 1][j + 1]['text'] == 'O' and \
-                        self.cell_matrix[i + 2][j + 2]['text'] == 'S':
-                    if [self.cell_matrix[i][j], self.cell_matrix[i + 1][j + 1],
-                        self.cell_matrix[i + 2][j + 2]] not in self.complete_sos_list:
-                        # Add sequence to completed list
-                        self.complete_sos_list.append(
-                            [self.cell_matrix[i][j], self.cell_matrix[i + 1][j + 1], self.cell_matrix[i + 2][j + 2]])
-                        # Color sequence
-                        self.color_sequence(self.cell_matrix[i][j], self.cell_matrix[i + 1][j + 1],
-                                            self.cell_matrix[i + 2][j + 2])
-
-        # SOS Check For Right Diagonal SOS
-        for i in range(self.board_size - 2):
-            for j in range(2, self.board_size):
-                if self.cell_matrix[i][j]['text'] == 'S' and self.cell_matrix[i + 1][j - 1]['text'] == 'O' and \
-                        self.cell_matrix[i + 2][j - 2]['text'] == 'S':
-                    if [self.cell_matrix[i][j], self.cell_matrix[i + 1][j - 1],
-                        self.cell_matrix[i + 2][j - 2]] not in self.complete_sos_list:
-                        # Add sequence to completed list
-                        self.complete_sos_list.append(
-                            [self.cell_matrix[i][j], self.cell_matrix[i + 1][
-                                j - 1], self.cell_matrix[i + 2][j - 2]])
-                        # Color sequence
-                        self.color_sequence(self.cell_matrix[i][j], self.cell_matrix[i + 1][j - 1],
-                                            self.cell_matrix[i + 2][j - 2])
+        """ Colors the SOS sequences completed since the last check and returns how many there were """
+        # The board state detects new sequences as each letter is placed, so only the unseen ones are handled here
+        new_sequences = self.state.sequences[len(self.complete_sos_list):]
+        for key in new_sequences:
+            cells = self.sequence_buttons(key)
+            # Add sequence to completed list
+            self.complete_sos_list.append(cells)
+            # Color sequence
+            self.color_sequence(*cells)
+        return len(new_sequences)
+
+    def sequence_buttons(self, key):
+        """ Returns the cells of an SOS sequence """
+        return [self.cell_matrix[row][column]
+                for row, column in map(self.state.position, self.state.sequence_cells(key))]
 
     def win_condition(self):
         """ Placeholder for derived classes """
@@ -288,16 +268,8 @@ class SOSGameBase:
                 self.cell_matrix[i][j].config(state=DISABLED)
 
     def filled_cells(self):
-        """ # Check to see if all cells are disabled """
-        game_complete = True
-        while game_complete:
-            for i in range(self.board_size):
-                for j in range(self.board_size):
-                    if self.cell_matrix[i][j]["state"] == tkinter.DISABLED:
-                        pass
-                    else:
-                        game_complete = False
-            return game_complete
+        """ # Check to see if all cells are occupied """
+        return self.state.is_full()
 
     def color_sequence(self, cell1, cell2, cell3):
         """ Colors the sequence of cells """
@@ -318,63 +290,48 @@ class SOSGameBase:
 
     def start_game(self):
         """ Only applicable to Computer games """
-        if self.blue_player.player_type == "Computer":
-            if self.turn.get() == "Current Turn: Blue":
-                self.cell_update(self.blue_player.move_selector(self.board_size, self.cell_matrix))
+        self.schedule_computer_turn()
 
-    def replay_recorded_game(self):
-        """ Replays the last played game """
+    def replay_recorded_game(self, new_board, speed=REPLAY_SPEED):
+        """ Starts replaying the latest recorded game on the event loop, on the game new_board(board size, game type)
+        sets up, and returns the replay (which can be paused, stepped and moved to any move), or None if no game was
+        recorded """
 
-        # Get all moves from last game
-        cur.execute('''SELECT *
-                       FROM public."Move"''')
+        # Moves still buffered or queued are written first so the replay sees them
+        self.recorder.wait()
 
-        rows = cur.fetchall()
+        # Get the last recorded game
+        with database.connection() as connection:
+            game = latest_game(connection)
+        if game is None:
+            return None
+        game_id, board_size, game_type = game
 
-        # For each move, set the respective symbol to what was recorded in the data
-        for row in rows:
-            if row[1] == "Blue":
-                self.blue_player.symbol = row[4]
-            elif row[1] == "Red":
-                self.red_player.symbol = row[4]
-            # Update the specified cell
-            self.cell_update(self.cell_matrix[row[2]][row[3]])
+        # Moves are streamed from the database as the replay goes rather than read all at once
+        replay = ReplayPlayer(new_board(board_size, game_type), database, game_id, speed)
+        replay.start()
+        return replay
 
     def record_move(self, color, row, column, letter):
         """ Record a move """
         if self.recorded_game:
-            current_timestamp = datetime.strftime(datetime.now(), '%Y-%m-%d %H:%M:%S.%f')
-            cur.execute(
-                f'''INSERT INTO public."Move" ("timestamp", player, row, "column", symbol, board_size, game_type) VALUES ('{current_timestamp}', '{color}', {row}, {column}, '{letter}', {self.board_size}, '{self.game_type.get()}') ''')
-            conn.commit()
-
-    def create_record_table(self):
-        """ Create a new table of moves """
-        # Deletes all old data
-        cur.execute('DELETE FROM public."Move"')
-
-        # If table doesn't exist, make it
-        create_table = '''
-                       CREATE TABLE IF NOT EXISTS public."Move"
-                       (
-                           date     timestamp(6) without time zone NOT NULL,
-                           player   character varying(50) COLLATE pg_catalog."default",
-                           "row"    integer,
-                           "column" integer,
-                           symbol   character varying(1) COLLATE pg_catalog."default",
-                           CONSTRAINT "Move_pkey" PRIMARY KEY (date)
-                       )
-                           TABLESPACE pg_default;
-
-                       ALTER TABLE IF EXISTS public."Move"
-                           OWNER to postgres;'''
-
-        cur.execute(create_table)
-
-        # Make table into hypertable from TimescaleDB if it doesn't exist already
-        cur.execute('''SELECT create_hypertable('public."Move"', 'timestamp', if_not_exists => TRUE);''')
-
-        conn.commit()
+            # Buffered and written in batches, so a move costs no round trip of its own
+            self.recorder.record(color, row, column, letter)
+
+    def start_recording(self):
+        """ Starts recording the new game as a game of its own, next to any recorded before """
+        self.recorder.start_game(self.board_size, self.game_type.get(), self.describe_player(self.blue_player),
+                                 self.describe_player(self.red_player))
+
+    def describe_player(self, player):
+        """ Describes a player for the recorded game (e.g. "Human" or "Computer (Hard)") """
+        if player.player_type == "Computer":
+            return f"Computer ({getattr(player, 'difficulty', 'Simple')})"
+        return player.player_type
+
+    def game_result(self):
+        """ Placeholder for derived classes: "Blue", "Red" or "Tie" once the game is over """
+        return None
 
     def recorded_game_update(self, recorded_setting):
         """ Update if a game is to be recorded """
@@ -392,22 +349,31 @@ class SimpleSOSGame(SOSGameBase):
     def win_condition(self):
         """ First to complete SOS"""
         # Checks to see if a sos has been made
-        if self.complete_sos_list:
+        if self.state.sequences:
             self.disable_buttons()
             messagebox.showinfo(title="Game Over",
                                 message=f"{self.turn.get()[13:]} wins")
             self.game_over = True
             return True
         # Check to see if cells are filled/tied
-        elif self.filled_cells():
+        elif self.state.is_full():
             self.disable_buttons()
             messagebox.showinfo(title="Game Over", message="Tie")
             self.game_over = True
             return True
         return False
 
+    def game_result(self):
+        """ The player who made the first SOS wins, otherwise it is a tie """
+        if self.state.sequences:
+            return self.turn.get()[14:]
+        return "Tie"
+
 
 class GeneralSOSGame(SOSGameBase):
+    # Rules the computer player searches with
+    rules = GENERAL_GAME
+
     def __init__(self, base_game, blue_player, red_player):
         # Initialize base game template
         super().__init__(blue_player, red_player)
@@ -415,10 +381,19 @@ class GeneralSOSGame(SOSGameBase):
         super().__dict__.update(base_game.__dict__)
         # self.game_type = 'General Game'
 
+    def add_score(self, player, points_scored):
+        """ Adds the points scored by a move to the player's score """
+        player.score.set(player.score.get() + points_scored)
+
+    def next_turn(self, points_scored):
+        """ The turn only passes if no points were scored """
+        if points_scored == 0:
+            super().next_turn(points_scored)
+
     def win_condition(self):
         """ Win condition for general SOS"""
-        # If cells are disabled, determine winner based on score
-        if self.filled_cells():
+        # If cells are filled, determine winner based on score
+        if self.state.is_full():
             if self.blue_player.score.get() > self.red_player.score.get():
                 messagebox.showinfo(title="Game Over",
                                     message=" Blue wins")
@@ -428,57 +403,13 @@ class GeneralSOSGame(SOSGameBase):
             else:
                 messagebox.showinfo(title="Game Over",
                                     message=f"Red wins")
+            self.game_over = True
             return True
         return False
 
-    def check_sos(self):
-        """ Overload check_sos method for general game """
-        old_sos_list = self.complete_sos_list.copy()
-        super().check_sos()
-        # Return the points scored via the different in length of the sos list
-        points_scored = len(self.complete_sos_list) - len(old_sos_list)
-        return points_scored
-
-    def cell_update(self, cell):
-        """ Updates cell with symbol """
-        # Blue turn
-        turn = self.turn.get()
-        if turn == "Current Turn: Blue":
-            # Adds the symbol and disable the button to prevent any further changes
-            cell.config(text=self.blue_player.symbol, state=DISABLED, font=("Helvetica", 40))
-            self.record_move('Blue', cell.row, cell.column, self.blue_player.symbol)
-            # updates board
-            self.board.after(500, self.update_board())
-            points_scored = self.check_sos()
-            new_score = self.blue_player.score.get() + points_scored
-            self.blue_player.score.set(new_score)
-            if not self.win_condition():
-                # If no points were scored, switch turns
-                if points_scored == 0:
-                    self.turn.set(value="Current Turn: Red")
-                    # Computer move
-                    if self.red_player.player_type == "Computer":
-                        self.cell_update(self.red_player.move_selector(self.board_size, self.cell_matrix))
-                # Computer move
-                elif self.blue_player.player_type == "Computer":
-                    self.cell_update(self.blue_player.move_selector(self.board_size, self.cell_matrix))
-        # Red turn
-        else:
-            # Adds the symbol and disable the button to prevent any further changes
-            cell.config(text=self.red_player.symbol, state=DISABLED, font=("Helvetica", 40))
-            self.record_move('Red', cell.row, cell.column, self.red_player.symbol)
-            # updates board
-            self.board.after(500, self.update_board())
-            points_scored = self.check_sos()
-            new_score = self.red_player.score.get() + points_scored
-            self.red_player.score.set(new_score)
-            if not self.win_condition():
-                # If no points were scored, switch turns
-                if points_scored == 0:
-                    self.turn.set(value="Current Turn: Blue")
-                    # Computer move
-                    if self.blue_player.player_type == "Computer":
-                        self.cell_update(self.blue_player.move_selector(self.board_size, self.cell_matrix))
-                # Computer move
-                elif self.red_player.player_type == "Computer":
-                    self.cell_update(self.red_player.move_selector(self.board_size, self.cell_matrix))
+    def game_result(self):
+        """ The player with more points wins """
+        blue, red = self.blue_player.score.get(), self.red_player.score.get()
+        if blue == red:
+            return "Tie"
+        return "Blue" if blue > red else "Red"
@@ -0,0 +1,185 @@
+""" Monte Carlo tree search (UCT) over Tk-free positions for the "Expert" computer difficulty """
+import math
+import random
+import time
+from Board_State import S, O, triple_table
+from Threat_Index import ThreatIndex, completes_sos, is_giveaway
+
+# Rollout policies
+RANDOM_ROLLOUT = "random"
+NO_GIVEAWAY_ROLLOUT = "no giveaway"
+
+# Random cells a no-giveaway rollout tries before settling for a move that gives something away
+ROLLOUT_ATTEMPTS = 4
+
+
+class Node:
+    __slots__ = ("move", "parent", "player", "hash", "children", "untried", "visits", "reward")
+
+    def __init__(self, position, move=None, parent=None, player=None):
+        # Move that led here from the parent and the player who made it
+        self.move = move
+        self.parent = parent
+        self.player = player
+        # Hash of the position after the move (to check a reused tree still matches the game)
+        self.hash = position.hash
+        # Expanded children by move, and the moves worth expanding that are not expanded yet (popped from the end,
+        # and only worked out once the node is reached again, since most leaves never are)
+        self.children = {}
+        self.untried = None
+        # Playouts through this node and their total reward for the player who made the move
+        self.visits = 0
+        self.reward = 0.0
+
+    def uct_child(self, exploration):
+        """ Returns the child with the highest upper confidence bound """
+        log_visits = math.log(self.visits)
+        return max(self.children.values(),
+                   key=lambda child: child.reward / child.visits +
+                   exploration * math.sqrt(log_visits / child.visits))
+
+
+def expansion_order(position, rng):
+    """ Moves worth expanding in random order, following the rollout policy: the moves that complete an SOS if there
+    are any, otherwise the moves that give nothing away, otherwise every legal move
+
+    Every child of a node is expanded before any is visited again, and a node's value is the mean over its children
+    until the best ones have been visited enough. Leaving out the moves the rollouts would never play keeps a
+    position where the player to move can score from looking like one where they can't """
+    state = position.state
+    table = triple_table(state.board_size)
+    moves = position.legal_moves()
+    rng.shuffle(moves)
+    scoring = [move for move in moves if completes_sos(state, move[0], move[1], table)]
+    if scoring:
+        return scoring
+    safe = [move for move in moves if not is_giveaway(state, move[0], move[1], table)]
+    return safe or moves
+
+
+class MonteCarloSearch:
+    def __init__(self, time_limit=1.0, exploration=1.4, rollout=NO_GIVEAWAY_ROLLOUT, max_playouts=None, seed=None):
+        # Wall-clock budget per move (seconds) and an optional cap on playouts (for repeatable runs)
+        self.time_limit = time_limit
+        self.max_playouts = max_playouts
+        # UCT exploration constant
+        self.exploration = exploration
+        # Rollout policy (RANDOM_ROLLOUT or NO_GIVEAWAY_ROLLOUT)
+        self.rollout = rollout
+        self.rng = random.Random(seed)
+        # Tree kept between moves, and the number of placements on the board at its root
+        self.root = None
+        self.root_ply = 0
+        # Statistics of the last search
+        self.playouts = 0
+        self.elapsed = 0.0
+        self.reused_visits = 0
+
+    def playouts_per_second(self):
+        """ Playouts per second of the last search, for tuning the time budget """
+        return self.playouts / self.elapsed if self.elapsed else 0.0
+
+    def best_move(self, position):
+        """ Returns the most visited (cell index, letter code) after searching for the time budget """
+        start = time.perf_counter()
+        deadline = start + self.time_limit
+        position = position.copy()
+        root = self.reuse_tree(position)
+        self.reused_visits = root.visits
+        self.playouts = 0
+        while self.playouts < 1 or time.perf_counter() < deadline:
+            if self.max_playouts is not None and self.playouts >= self.max_playouts:
+                break
+            self.playout(root, position)
+            self.playouts += 1
+        self.elapsed = time.perf_counter() - start
+        best = max(root.children.values(), key=lambda child: child.visits)
+        return best.move
+
+    def reuse_tree(self, position):
+        """ Moves the root of the last search down to the current position, or starts a new tree """
+        state = position.state
+        node = self.root
+        if node is not None and self.root_ply <= len(state.moves):
+            # Follow the moves played since the last search (by either player)
+            for index, new_sequences in state.moves[self.root_ply:]:
+                node = node.children.get((index, state.code(index)))
+                if node is None:
+                    break
+        if node is None or node.hash != position.hash:
+            node = Node(position)
+        node.parent = None
+        self.root = node
+        self.root_ply = len(state.moves)
+        return node
+
+    def playout(self, root, position):
+        """ Runs one selection, expansion, rollout and backpropagation pass from the root """
+        node = root
+        depth = 0
+        # Selection
+        while True:
+            if node.untried is None:
+                node.untried = [] if position.is_over() else expansion_order(position, self.rng)
+            if node.untried or not node.children:
+                break
+            node = node.uct_child(self.exploration)
+            position.play(*node.move)
+            depth += 1
+        # Expansion
+        if node.untried:
+            move = node.untried.pop()
+            player = position.to_move
+            position.play(*move)
+            depth += 1
+            child = Node(position, move, node, player)
+            node.children[move] = child
+            if position.is_over() and position.winner() == player:
+                # A move that wins outright is the only one worth playing here
+                node.children = {move: child}
+                node.untried = []
+            node = child
+        # Rollout
+        depth += self.simulate(position)
+        winner = position.winner()
+        for _ in range(depth):
+            position.undo()
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if node.player is not None:
+                node.reward += 0.5 if winner is None else float(winner == node.player)
+            node = node.parent
+
+    def simulate(self, position):
+        """ Plays the game out with the rollout policy and returns the number of moves played """
+        state = position.state
+        table = triple_table(state.board_size)
+        rng = self.rng
+        # The state keeps its empty cells in a list, so a random one is picked in O(1)
+        empty = state.empty_list
+        threats = ThreatIndex(state) if self.rollout == NO_GIVEAWAY_ROLLOUT else None
+        played = 0
+        while not position.is_over():
+            if threats is not None:
+                index, code = self.rollout_move(state, table, empty, threats)
+            else:
+                index, code = empty[rng.randrange(len(empty))], rng.choice((S, O))
+            position.play(index, code)
+            if threats is not None:
+                threats.update(index)
+            played += 1
+        return played
+
+    def rollout_move(self, state, table, empty, threats):
+        """ Picks a (cell index, letter code): any move that completes an SOS, otherwise the first move among a few
+        random cells that gives nothing away, otherwise a random move """
+        rng = self.rng
+        if threats.threats:
+            return next(iter(threats.threats.values()))
+        for _ in range(ROLLOUT_ATTEMPTS):
+            index = empty[rng.randrange(len(empty))]
+            for code in ((S, O) if rng.random() < 0.5 else (O, S)):
+                if not is_giveaway(state, index, code, table):
+                    return index, code
+        return empty[rng.randrange(len(empty))], rng.choice((S, O))
@@ -0,0 +1,351 @@
+""" Recording of games to the database: each game gets a row in "Game" and its moves rows in "Move" keyed by
+(game id, ply), so any number of recorders can store games side by side. Moves are kept in memory and handed in
+batches to a background writer thread, which writes each batch with one multi-row INSERT per table and one commit,
+so the game never waits on the database """
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime
+from psycopg2.extras import execute_values
+
+logger = logging.getLogger(__name__)
+
+# Moves kept before a batch is written (more than a 9x9 board, so a game is written in one go when it ends)
+FLUSH_SIZE = 128
+
+# Longest time (seconds) a move waits in memory before its batch is written (checked by the writer thread too, so
+# the moves of an idle or abandoned game still go out on time)
+FLUSH_INTERVAL = 60.0
+
+# Jobs (batches and other database work) waiting for the writer thread before new batches are held back
+QUEUE_SIZE = 64
+
+# Writes of a batch tried before it is dropped (and logged), so one bad row can't hold up every batch after it, and
+# the delay (seconds) before its first retry, doubled for each retry after
+WRITE_ATTEMPTS = 5
+RETRY_DELAY = 2.0
+
+# A batch whose write failed: its games (by id) and moves, failed writes so far, and when it may be retried
+FailedBatch = namedtuple("FailedBatch", ["games", "moves", "attempts", "retry_at"])
+
+# Tables of recorded games, created by the first batch a process writes. A "Move" table left by the single-game
+# layout (keyed by timestamp) is kept under another name. The primary key of "Move" is the index a replay scans, in
+# ply order, and "Game" is indexed by start time to find the latest game
+SCHEMA = '''
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.tables WHERE table_schema = 'public' AND table_name = 'Move')
+       AND NOT EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_schema = 'public' AND table_name = 'Move' AND column_name = 'game_id') THEN
+        ALTER TABLE public."Move" RENAME TO "Move_single_game";
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS public."Game"
+(
+    id          uuid PRIMARY KEY,
+    started     timestamp(6) without time zone NOT NULL,
+    board_size  integer NOT NULL,
+    game_type   character varying(20) NOT NULL,
+    blue_player character varying(50) NOT NULL,
+    red_player  character varying(50) NOT NULL,
+    result      character varying(4),
+    blue_score  integer,
+    red_score   integer
+);
+
+CREATE INDEX IF NOT EXISTS "Game_started_idx" ON public."Game" (started DESC);
+
+CREATE TABLE IF NOT EXISTS public."Move"
+(
+    game_id     uuid NOT NULL REFERENCES public."Game" (id) ON DELETE CASCADE,
+    ply         integer NOT NULL,
+    "timestamp" timestamp(6) without time zone NOT NULL,
+    player      character varying(50) NOT NULL,
+    "row"       integer NOT NULL,
+    "column"    integer NOT NULL,
+    symbol      character varying(1) NOT NULL,
+    CONSTRAINT "Move_pkey" PRIMARY KEY (game_id, ply)
+)'''
+
+# Games are inserted when first written and their result filled in when they end
+UPSERT_GAMES = '''INSERT INTO public."Game" (id, started, board_size, game_type, blue_player, red_player, result,
+                                           blue_score, red_score)
+                  VALUES %s
+                  ON CONFLICT (id) DO UPDATE SET result = EXCLUDED.result, blue_score = EXCLUDED.blue_score,
+                                                 red_score = EXCLUDED.red_score'''
+GAME_VALUES = "(%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+
+# Every buffered move goes in one multi-row INSERT, with the values passed as parameters
+INSERT_MOVES = '''INSERT INTO public."Move" (game_id, ply, "timestamp", player, "row", "column", symbol)
+                  VALUES %s'''
+MOVE_VALUES = "(%s, %s, %s, %s, %s, %s, %s)"
+
+
+def remaining(deadline):
+    """ Seconds left until a time.monotonic() deadline (None for no deadline) """
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+class MoveRecorder:
+    def __init__(self, database, flush_size=FLUSH_SIZE, flush_interval=FLUSH_INTERVAL, queue_size=QUEUE_SIZE):
+        # Database the moves are written to (a connection is only borrowed from its pool to write a batch)
+        self.database = database
+        # Batch size and age that trigger a write
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        # Game being recorded, the number of its moves so far and its row as last handed to the writer
+        self.game_id = None
+        self.ply = 0
+        self.written_game = None
+        # Games and moves not handed to the writer yet, as rows of their INSERTs (games by id), and when the oldest
+        # move was played
+        self.pending_games = {}
+        self.pending = []
+        self.oldest = None
+        # Batches whose write failed, given back by the writer thread to be retried on their own after a delay
+        self.failed = []
+        # Guards the buffers above, which the writer thread also flushes once their moves are old enough, and keeps
+        # batches queued in the order they were taken from the buffers
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        # Whether the writer thread has made sure the tables exist
+        self.schema_ready = False
+        # Jobs for the writer thread, which is only started once there is something to write
+        self.jobs = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        # Metrics: jobs done, batches and moves written, job latency (seconds), deepest queue, flushes held back
+        # because the queue was full, failed jobs, and batches and moves dropped after their last attempt
+        self.jobs_done = 0
+        self.batches_written = 0
+        self.moves_written = 0
+        self.last_write_seconds = 0.0
+        self.total_write_seconds = 0.0
+        self.max_write_seconds = 0.0
+        self.max_queue_depth = 0
+        self.deferred = 0
+        self.errors = 0
+        self.last_error = None
+        self.dropped_batches = 0
+        self.dropped_moves = 0
+
+    def start_game(self, board_size, game_type, blue_player, red_player):
+        """ Starts recording a new game under a new id (made here, so recorders never need the database to agree on
+        ids) and returns the id, handing what is left of the previous game to the writer first """
+        self.flush()
+        game_id = str(uuid.uuid4())
+        with self.lock:
+            self.game_id = game_id
+            self.ply = 0
+            self.pending_games[game_id] = (game_id, datetime.now(), board_size, game_type, blue_player, red_player,
+                                           None, None, None)
+        return game_id
+
+    def finish_game(self, result, blue_score, red_score):
+        """ Records how the game ended ("Blue", "Red" or "Tie") and hands the rest of it to the writer """
+        if self.game_id is None:
+            return
+        with self.lock:
+            game = self.pending_games.get(self.game_id)
+            if game is None:
+                # Already handed over, so the game row is written again with the result
+                game = self.written_game
+            self.pending_games[self.game_id] = game[:6] + (result, blue_score, red_score)
+            self.game_id = None
+        self.flush()
+
+    def record(self, color, row, column, letter):
+        """ Buffers a move of the game being recorded, handing the batch to the writer once it is big or old
+        enough """
+        if self.game_id is None:
+            raise ValueError("start_game must be called before moves are recorded")
+        # The writer thread keeps time for the buffered moves, so it runs from the first move
+        self.start_writer()
+        with self.lock:
+            if self.oldest is None:
+                self.oldest = time.monotonic()
+            self.pending.append((self.game_id, self.ply, datetime.now(), color, row, column, letter))
+            self.ply += 1
+            due = len(self.pending) >= self.flush_size or time.monotonic() - self.oldest >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self, block=False, retry=False, timeout=None):
+        """ Hands every buffered move to the writer thread without waiting for the write (or for room in the queue,
+        unless block is set, for at most timeout seconds when given), along with failed batches due a retry (all of
+        them if retry is set) """
+        with self.flush_lock:
+            self.hand_over(block, retry, timeout)
+
+    def hand_over(self, block, retry=False, timeout=None):
+        """ Queues the failed batches due a retry, then everything buffered as one batch, putting back whatever the
+        full queue has no room for (with the flush lock held) """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.lock:
+            now = time.monotonic()
+            retries = [batch for batch in self.failed if retry or batch.retry_at <= now]
+            self.failed = [batch for batch in self.failed if not (retry or batch.retry_at <= now)]
+            games, self.pending_games = self.pending_games, {}
+            moves, self.pending = self.pending, []
+            oldest, self.oldest = self.oldest, None
+            # The game row is kept so its result can be written once it ends
+            if self.game_id in games:
+                self.written_game = games[self.game_id]
+        # Older batches go first, so moves are never written before their game's row
+        for position, batch in enumerate(retries):
+            if not self.submit(lambda batch=batch: self.write_batch(batch.games, batch.moves, batch.attempts), block,
+                               remaining(deadline)):
+                with self.lock:
+                    self.failed = retries[position:] + self.failed
+                break
+        if not games and not moves:
+            return
+        if not self.submit(lambda: self.write_batch(games, moves), block, remaining(deadline)):
+            # The writer is behind, so the batch stays buffered (ahead of any move recorded meanwhile) and goes out
+            # later, bigger
+            with self.lock:
+                self.pending_games = {**games, **self.pending_games}
+                self.pending = moves + self.pending
+                self.oldest = oldest if oldest is not None else self.oldest
+
+    def flush_if_due(self):
+        """ Hands the buffered moves to the writer once the oldest has waited the flush interval, and failed batches
+        once their retry is due (on the writer thread, for games that stopped recording moves) """
+        with self.lock:
+            now = time.monotonic()
+            due = self.oldest is not None and now - self.oldest >= self.flush_interval or \
+                any(batch.retry_at <= now for batch in self.failed)
+        # A flush already under way on the Tk thread takes the moves anyway (and waiting for it could keep the writer
+        # from draining the queue it is waiting on)
+        if due and self.flush_lock.acquire(blocking=False):
+            try:
+                self.hand_over(False)
+            finally:
+                self.flush_lock.release()
+
+    def seconds_until_due(self):
+        """ Time until the oldest buffered move must be written or a failed batch retried (a whole interval when
+        nothing is buffered, so a move recorded meanwhile is never checked late) """
+        with self.lock:
+            now = time.monotonic()
+            due = [batch.retry_at for batch in self.failed]
+            due.append(now + self.flush_interval if self.oldest is None else self.oldest + self.flush_interval)
+            return max(0.0, min(due) - now)
+
+    def start_writer(self):
+        """ Starts the writer thread if it isn't running """
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="MoveRecorder", daemon=True)
+            self.thread.start()
+
+    def submit(self, job, block=True, timeout=None):
+        """ Queues a job (a function using the database) for the writer thread, in order with the batches, and
+        returns whether it was queued (a full queue only waits when block is set, for at most timeout seconds when
+        given) """
+        self.start_writer()
+        try:
+            self.jobs.put(job, block=block, timeout=timeout)
+        except queue.Full:
+            self.deferred += 1
+            return False
+        self.max_queue_depth = max(self.max_queue_depth, self.jobs.qsize())
+        return True
+
+    def write_batch(self, games, moves, attempts=0):
+        """ Writes a batch of games and moves with one statement per table and commits (on the writer thread),
+        keeping it for a retry if the write fails, or dropping it once it has failed WRITE_ATTEMPTS times """
+        try:
+            with self.database.connection() as connection:
+                cur = connection.cursor()
+                # The first batch makes sure the tables exist in the same statement as its game rows
+                schema = "" if self.schema_ready else SCHEMA + ";\n"
+                if games:
+                    execute_values(cur, schema + UPSERT_GAMES, list(games.values()), GAME_VALUES,
+                                   page_size=len(games))
+                elif schema:
+                    cur.execute(schema)
+                # Every move in one page, so a whole game goes in one statement
+                if moves:
+                    execute_values(cur, INSERT_MOVES, moves, MOVE_VALUES, page_size=len(moves))
+                connection.commit()
+                cur.close()
+        except Exception as error:
+            attempts += 1
+            if attempts >= WRITE_ATTEMPTS:
+                self.dropped_batches += 1
+                self.dropped_moves += len(moves)
+                logger.error("Dropped a batch of %d games and %d moves after %d failed writes: %s", len(games),
+                             len(moves), attempts, error)
+            else:
+                with self.lock:
+                    self.failed.append(FailedBatch(games, moves, attempts,
+                                                   time.monotonic() + RETRY_DELAY * 2 ** (attempts - 1)))
+            raise
+        self.schema_ready = True
+        self.batches_written += 1
+        self.moves_written += len(moves)
+
+    def run(self):
+        """ Writer thread: runs queued jobs in order until told to stop, flushing moves left buffered too long """
+        while True:
+            try:
+                # An interval of 0 has every move flushed as it is recorded, so there is nothing to wait for
+                job = self.jobs.get(timeout=self.seconds_until_due() if self.flush_interval > 0 else None)
+            except queue.Empty:
+                self.flush_if_due()
+                continue
+            if job is None:
+                self.jobs.task_done()
+                return
+            start = time.perf_counter()
+            try:
+                job()
+                self.jobs_done += 1
+            except Exception as error:
+                self.errors += 1
+                self.last_error = error
+            finally:
+                self.last_write_seconds = time.perf_counter() - start
+                self.total_write_seconds += self.last_write_seconds
+                self.max_write_seconds = max(self.max_write_seconds, self.last_write_seconds)
+                self.jobs.task_done()
+
+    def wait(self):
+        """ Hands over the buffered moves and waits until everything queued is written (for reading the moves
+        back), retrying failed batches now """
+        self.flush(block=True, retry=True)
+        if self.thread is not None:
+            self.jobs.join()
+
+    def close(self, timeout=5.0):
+        """ Writes everything still buffered (retrying failed batches once more) and stops the writer thread (when
+        the window closes), giving up after timeout seconds on a writer stuck on an unreachable database """
+        deadline = time.monotonic() + timeout
+        self.flush(block=True, retry=True, timeout=timeout)
+        with self.lock:
+            unwritten = len(self.pending) + sum(len(batch.moves) for batch in self.failed)
+        if unwritten:
+            logger.error("Closed with %d moves still waiting for the writer, which is not keeping up", unwritten)
+        if self.thread is not None:
+            try:
+                self.jobs.put(None, timeout=remaining(deadline))
+            except queue.Full:
+                return
+            self.thread.join(remaining(deadline))
+            self.thread = None
+
+    def metrics(self):
+        """ Queue depth, write latency and throughput of the recorder """
+        jobs = self.jobs_done + self.errors
+        return {"queue_depth": self.jobs.qsize(), "max_queue_depth": self.max_queue_depth,
+                "pending_moves": len(self.pending), "retrying_batches": len(self.failed),
+                "batches_written": self.batches_written, "moves_written": self.moves_written,
+                "deferred_flushes": self.deferred, "errors": self.errors, "dropped_batches": self.dropped_batches,
+                "dropped_moves": self.dropped_moves,
+                "last_write_seconds": self.last_write_seconds, "max_write_seconds": self.max_write_seconds,
+                "mean_write_seconds": self.total_write_seconds / jobs if jobs else 0.0}
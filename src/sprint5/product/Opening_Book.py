@@ -0,0 +1,140 @@
+""" Opening books for small boards: positions solved offline, stored in a compact binary file and looked up
+through a memory map """
+import mmap
+import os
+import struct
+import sys
+import time
+from functools import lru_cache
+from Board_State import BoardState, S, O
+from Position import Position, SIMPLE_GAME, GENERAL_GAME
+from Endgame_Solver import EndgameSolver
+from Symmetry import symmetries, board_key, canonical_cells, from_canonical
+
+# Book files shipped next to this module
+BOOK_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "books")
+
+# Books built by default: (board size, game type, largest number of filled cells in a book position)
+DEFAULT_BOOKS = ((3, SIMPLE_GAME, 5), (3, GENERAL_GAME, 5), (4, SIMPLE_GAME, 5), (4, GENERAL_GAME, 5))
+
+# File layout: header, then the sorted position keys, then one move byte per key (cell index * 2 + letter code - 1)
+MAGIC = b"SOSB"
+VERSION = 1
+# Magic, version, board size, general game flag, key width in bytes, number of positions
+HEADER = struct.Struct("<4sBBBBI")
+
+
+def book_path(board_size, game_type):
+    """ Path of the book for a board size and game type """
+    rules = "general" if game_type == GENERAL_GAME else "simple"
+    return os.path.join(BOOK_DIRECTORY, f"sos_{board_size}x{board_size}_{rules}.book")
+
+
+class OpeningBook:
+    def __init__(self, path):
+        # The file is memory-mapped, so only the pages a lookup touches are read
+        with open(path, "rb") as book_file:
+            self.data = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.board_size, general, self.key_size, self.count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an SOS opening book")
+        self.game_type = GENERAL_GAME if general else SIMPLE_GAME
+        self.key_format = "<I" if self.key_size == 4 else "<Q"
+        self.moves_offset = HEADER.size + self.count * self.key_size
+
+    def key_at(self, slot):
+        """ Reads the key stored in a slot """
+        return struct.unpack_from(self.key_format, self.data, HEADER.size + slot * self.key_size)[0]
+
+    def best_move(self, position):
+        """ Returns the book's (cell index, letter code) for a position, or None if it is not in the book """
+        state = position.state
+        if state.board_size != self.board_size or position.game_type != self.game_type:
+            return None
+        cells = [state.code(index) for index in range(self.board_size * self.board_size)]
+        key, symmetry = canonical_cells(cells, self.board_size)
+        # Binary search of the sorted keys
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.count or self.key_at(low) != key:
+            return None
+        index, letter = divmod(self.data[self.moves_offset + low], 2)
+        # The book move is for the canonical board, so map it back to this board's orientation
+        return from_canonical(index, symmetry, self.board_size), letter + S
+
+    def close(self):
+        """ Releases the memory map """
+        self.data.close()
+
+
+@lru_cache(maxsize=None)
+def opening_book(board_size, game_type):
+    """ Returns the book for a board size and game type (opened once), or None if there is no book file """
+    path = book_path(board_size, game_type)
+    if not os.path.exists(path):
+        return None
+    return OpeningBook(path)
+
+
+def build_book(board_size, game_type, max_filled):
+    """ Solves every reachable position with up to max_filled occupied cells (one per symmetry class) and returns
+    {canonical key: (cell index, letter code)} """
+    cell_count = board_size * board_size
+    # Every book position is solved with the same memo, so it is never cleared
+    solver = EndgameSolver(empty_threshold=cell_count, memo_limit=None, symmetric=True)
+    book = {}
+    level = {board_key([0] * cell_count): (0,) * cell_count}
+    for filled in range(max_filled + 1):
+        next_level = {}
+        for key, cells in level.items():
+            state = BoardState(board_size)
+            for index, code in enumerate(cells):
+                if code:
+                    state.place_code(index, code)
+            position = Position(state, game_type)
+            if position.is_over():
+                continue
+            book[key] = solver.best_move(position)
+            if filled == max_filled:
+                continue
+            # Every reply, one per symmetry class
+            for index in range(cell_count):
+                if not cells[index]:
+                    for code in (S, O):
+                        child = cells[:index] + (code,) + cells[index + 1:]
+                        child_key, symmetry = canonical_cells(child, board_size)
+                        if child_key not in next_level:
+                            next_level[child_key] = tuple(child[source] for source in symmetries(board_size)[symmetry])
+        level = next_level
+    return book
+
+
+def write_book(path, board_size, game_type, book):
+    """ Writes a book built by build_book to a file """
+    key_size = 4 if 3 ** (board_size * board_size) <= 1 << 32 else 8
+    keys = sorted(book)
+    with open(path, "wb") as book_file:
+        book_file.write(HEADER.pack(MAGIC, VERSION, board_size, game_type == GENERAL_GAME, key_size, len(keys)))
+        key_format = "<I" if key_size == 4 else "<Q"
+        book_file.write(b"".join(struct.pack(key_format, key) for key in keys))
+        book_file.write(bytes(book[key][0] * 2 + book[key][1] - S for key in keys))
+
+
+if __name__ == '__main__':
+    # Usage: python Opening_Book.py [board size] [simple|general] [largest number of filled cells]
+    if len(sys.argv) > 1:
+        books = ((int(sys.argv[1]), GENERAL_GAME if sys.argv[2] == "general" else SIMPLE_GAME,
+                  int(sys.argv[3]) if len(sys.argv) > 3 else 5),)
+    else:
+        books = DEFAULT_BOOKS
+    os.makedirs(BOOK_DIRECTORY, exist_ok=True)
+    for size, rules, most_filled in books:
+        start = time.perf_counter()
+        entries = build_book(size, rules, most_filled)
+        write_book(book_path(size, rules), size, rules, entries)
+        print(f"{book_path(size, rules)}: {len(entries)} positions in {time.perf_counter() - start:.1f} s")
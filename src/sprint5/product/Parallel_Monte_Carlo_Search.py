@@ -0,0 +1,129 @@
+""" Root-parallel Monte Carlo tree search: independent trees searched in worker processes, merged at the root """
+import atexit
+import multiprocessing
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from Bit_Board_State import make_board_state
+from Position import Position, GENERAL_GAME, position_from_bytes
+from Monte_Carlo_Search import MonteCarloSearch, NO_GIVEAWAY_ROLLOUT
+from Simulator import GreedyStrategy
+
+# Process pools by number of workers, started on first use and shared by every search
+pools = {}
+
+
+def worker_pool(workers):
+    """ Returns the process pool for a number of workers (started once and shared by every search) """
+    if workers not in pools:
+        # Spawned rather than forked so the workers never inherit the GUI or the database connection
+        pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return pools[workers]
+
+
+@atexit.register
+def shutdown_pools():
+    """ Stops the worker processes of every pool started (when the window closes, and at exit otherwise) """
+    while pools:
+        workers, pool = pools.popitem()
+        pool.shutdown(cancel_futures=True)
+
+
+def search_root(data, time_limit, max_playouts, exploration, rollout, seed):
+    """ Worker task: searches a packed position and returns ({move: (visits, reward)} of the root, playouts) """
+    search = MonteCarloSearch(time_limit, exploration, rollout, max_playouts, seed)
+    search.best_move(position_from_bytes(data))
+    return {move: (child.visits, child.reward) for move, child in search.root.children.items()}, search.playouts
+
+
+class ParallelMonteCarloSearch:
+    def __init__(self, workers=2, time_limit=1.0, exploration=1.4, rollout=NO_GIVEAWAY_ROLLOUT, max_playouts=None,
+                 seed=None):
+        # Worker processes, each growing its own tree for the whole time budget
+        self.workers = workers
+        # Same settings as MonteCarloSearch (max_playouts is per worker)
+        self.time_limit = time_limit
+        self.max_playouts = max_playouts
+        self.exploration = exploration
+        self.rollout = rollout
+        self.rng = random.Random(seed)
+        # Statistics of the last search
+        self.playouts = 0
+        self.elapsed = 0.0
+        # Merged root statistics of the last search: move -> (visits, reward)
+        self.root_stats = {}
+
+    def playouts_per_second(self):
+        """ Playouts per second of the last search over all workers """
+        return self.playouts / self.elapsed if self.elapsed else 0.0
+
+    def best_move(self, position):
+        """ Returns the move with the most visits summed over every worker's tree """
+        start = time.perf_counter()
+        data = position.to_bytes()
+        pool = worker_pool(self.workers)
+        futures = [pool.submit(search_root, data, self.time_limit, self.max_playouts, self.exploration,
+                               self.rollout, self.rng.getrandbits(32)) for _ in range(self.workers)]
+        self.root_stats = {}
+        self.playouts = 0
+        for future in futures:
+            children, playouts = future.result()
+            self.playouts += playouts
+            for move, (visits, reward) in children.items():
+                total_visits, total_reward = self.root_stats.get(move, (0, 0.0))
+                self.root_stats[move] = (total_visits + visits, total_reward + reward)
+        self.elapsed = time.perf_counter() - start
+        return max(self.root_stats, key=lambda move: self.root_stats[move][0])
+
+
+def make_monte_carlo_search(workers=1, time_limit=1.0):
+    """ Creates the tree search for the "Expert" difficulty, in this process or across worker processes """
+    if workers > 1:
+        return ParallelMonteCarloSearch(workers, time_limit)
+    return MonteCarloSearch(time_limit)
+
+
+def win_rate_against_greedy(search, board_size, games, seed=0):
+    """ Share of general games a search wins against the "Simple" computer's greedy play, with colors alternating
+    (ties count as half a win) """
+    rng = random.Random(seed)
+    points = 0.0
+    for game in range(games):
+        position = Position(make_board_state(board_size), GENERAL_GAME)
+        greedy = GreedyStrategy(random.Random(rng.getrandbits(32)))
+        searcher = game % 2
+        while not position.is_over():
+            player = search if position.to_move == searcher else greedy
+            position.play(*player.best_move(position))
+        winner = position.winner()
+        points += 0.5 if winner is None else float(winner == searcher)
+    return points / games if games else 0.0
+
+
+def benchmark_scaling(worker_counts=(1, 2, 4), board_size=9, time_limit=1.0, games=0, seed=0):
+    """ Measures, for each number of workers, playouts per second from the opening of a general game and the win
+    rate over a number of games against greedy play (more playouts only help if they win more games), as
+    {workers: (playouts per second, win rate)} """
+    position = Position(make_board_state(board_size), GENERAL_GAME)
+    results = {}
+    for workers in worker_counts:
+        search = ParallelMonteCarloSearch(workers, time_limit, seed=seed)
+        # The first search only starts the pool's processes, so it is not timed
+        search.best_move(position)
+        search.best_move(position)
+        results[workers] = (search.playouts_per_second(), win_rate_against_greedy(search, board_size, games, seed))
+    return results
+
+
+if __name__ == '__main__':
+    # Usage: python Parallel_Monte_Carlo_Search.py [largest number of workers] [board size] [games against greedy]
+    #                                              [seconds per move]
+    most = int(sys.argv[1]) if len(sys.argv) > 1 else multiprocessing.cpu_count()
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 9
+    games = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    seconds = float(sys.argv[4]) if len(sys.argv) > 4 else 1.0
+    rates = benchmark_scaling(sorted({1, *range(2, most + 1, 2), most}), size, seconds, games)
+    for workers, (rate, win_rate) in rates.items():
+        print(f"{workers:>3} workers: {rate:8.0f} playouts/s  ({rate / rates[1][0]:.2f}x), "
+              f"{win_rate:.0%} against greedy")
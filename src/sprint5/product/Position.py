@@ -0,0 +1,145 @@
+""" Tk-free game position (board, side to move and scores) searched by the computer player """
+import struct
+from Board_State import S, O
+from Bit_Board_State import make_board_state
+from Transposition_Table import zobrist_keys
+from Symmetry import inverse_symmetries
+
+# Players
+BLUE = 0
+RED = 1
+PLAYER_NAMES = ("Blue", "Red")
+
+# Game types
+SIMPLE_GAME = "Simple Game"
+GENERAL_GAME = "General Game"
+
+# Header of a position packed into bytes: board size, general game flag, player to move, Blue and Red scores
+# (followed by one byte per cell code)
+HEADER = struct.Struct("<BBBhh")
+
+
+class Position:
+    def __init__(self, state, game_type=SIMPLE_GAME, to_move=BLUE, scores=(0, 0)):
+        # Board state (owned by the position, so pass a copy of a live game's state)
+        self.state = state
+        # Simple games end at the first SOS, general games when the board is full
+        self.game_type = game_type
+        self.general = game_type == GENERAL_GAME
+        # Player to move and both players' scores
+        self.to_move = to_move
+        self.scores = list(scores)
+        # (player who moved, points scored, hash before the move, symmetric hashes before the move) for every move
+        # played, for undo
+        self.history = []
+        # Zobrist hash of the cells, the game type, the player to move and the score difference, updated move by move
+        self.zobrist = zobrist_keys(state.board_size)
+        self.hash = self.compute_hash()
+        # Hashes of the board's 8 symmetric orientations (only kept up to date after track_symmetries)
+        self.symmetric_hashes = None
+
+    def compute_hash(self):
+        """ Computes the Zobrist hash from scratch """
+        keys = self.zobrist
+        code = self.state.code
+        value = 0
+        for index in range(self.state.board_size * self.state.board_size):
+            value ^= keys.cells[index][code(index)]
+        if self.to_move == RED:
+            value ^= keys.side
+        if self.general:
+            value ^= keys.general
+        return value ^ keys.differences[self.scores[BLUE] - self.scores[RED] + keys.offset]
+
+    def track_symmetries(self):
+        """ Starts keeping the hash of every symmetric orientation of the board up to date """
+        keys = self.zobrist
+        code = self.state.code
+        cell_keys = 0
+        for index in range(self.state.board_size * self.state.board_size):
+            cell_keys ^= keys.cells[index][code(index)]
+        # The game type, side and score keys are the same in every orientation
+        rest = self.hash ^ cell_keys
+        self.symmetric_hashes = []
+        for inverse in inverse_symmetries(self.state.board_size):
+            value = rest
+            for index in range(self.state.board_size * self.state.board_size):
+                value ^= keys.cells[inverse[index]][code(index)]
+            self.symmetric_hashes.append(value)
+
+    def canonical_hash(self):
+        """ Returns (hash, symmetry) of the orientation with the smallest hash (after track_symmetries) """
+        value = min(self.symmetric_hashes)
+        return value, self.symmetric_hashes.index(value)
+
+    def copy(self):
+        """ Returns an independent copy of the position, taking its hashes over instead of computing them again """
+        position = Position.__new__(Position)
+        position.state = self.state.copy()
+        position.game_type = self.game_type
+        position.general = self.general
+        position.to_move = self.to_move
+        position.scores = self.scores.copy()
+        position.history = self.history.copy()
+        position.zobrist = self.zobrist
+        position.hash = self.hash
+        position.symmetric_hashes = None if self.symmetric_hashes is None else self.symmetric_hashes.copy()
+        return position
+
+    def legal_moves(self):
+        """ Every (cell index, letter code) that can be played """
+        return [(index, code) for index in self.state.empty_cells for code in (S, O)]
+
+    def play(self, index, code):
+        """ Plays a move for the player to move and returns the points it scored """
+        player = self.to_move
+        keys = self.zobrist
+        points = len(self.state.place_code(index, code))
+        self.history.append((player, points, self.hash, self.symmetric_hashes))
+        if points:
+            difference = self.scores[BLUE] - self.scores[RED] + keys.offset
+            self.scores[player] += points
+            change = keys.differences[difference] ^ \
+                keys.differences[self.scores[BLUE] - self.scores[RED] + keys.offset]
+        else:
+            # The turn passes unless the move scored (a general game player goes again, a simple game is over)
+            self.to_move = 1 - player
+            change = keys.side
+        self.hash ^= keys.cells[index][code] ^ change
+        if self.symmetric_hashes is not None:
+            self.symmetric_hashes = [value ^ keys.cells[inverse[index]][code] ^ change for value, inverse in
+                                     zip(self.symmetric_hashes, inverse_symmetries(self.state.board_size))]
+        return points
+
+    def undo(self):
+        """ Takes back the last move """
+        player, points, self.hash, self.symmetric_hashes = self.history.pop()
+        self.state.undo()
+        self.scores[player] -= points
+        self.to_move = player
+
+    def is_over(self):
+        """ Checks if the game has ended """
+        return self.state.is_full() or (not self.general and bool(self.state.sequences))
+
+    def winner(self):
+        """ Returns the player ahead on points (the final winner once the game is over), or None for a tie """
+        if self.scores[BLUE] == self.scores[RED]:
+            return None
+        return BLUE if self.scores[BLUE] > self.scores[RED] else RED
+
+    def to_bytes(self):
+        """ Packs the position into a compact byte string (for sending to other processes) """
+        code = self.state.code
+        cells = bytes(code(index) for index in range(self.state.board_size * self.state.board_size))
+        return HEADER.pack(self.state.board_size, self.general, self.to_move, *self.scores) + cells
+
+
+def position_from_bytes(data, backend="list"):
+    """ Rebuilds a position packed by Position.to_bytes (move history is not kept) """
+    board_size, general, to_move, blue_score, red_score = HEADER.unpack_from(data)
+    state = make_board_state(board_size, backend)
+    for index, code in enumerate(data[HEADER.size:]):
+        if code:
+            state.place_code(index, code)
+    return Position(state, GENERAL_GAME if general else SIMPLE_GAME, to_move, (blue_score, red_score))
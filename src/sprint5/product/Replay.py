@@ -0,0 +1,195 @@
+""" Replay of recorded games: moves are streamed from a server-side cursor a chunk at a time and played on the Tk
+event loop at a set speed, with pause, single steps and jumps to any move. Moves read are kept, so going back takes
+moves off the board instead of reading the game again """
+import uuid
+from contextlib import ExitStack
+
+# Moves fetched from the server at a time
+CHUNK_SIZE = 64
+
+# Default replay speed (moves per second)
+REPLAY_SPEED = 4.0
+
+# One game's moves from a ply on, read along the primary key of "Move"
+GAME_MOVES_FROM = '''SELECT ply, player, "row", "column", symbol
+                     FROM public."Move"
+                     WHERE game_id = %s AND ply >= %s
+                     ORDER BY ply'''
+
+# The most recently started game, found through the index on "Game" start times
+LATEST_GAME = '''SELECT id, board_size, game_type
+                 FROM public."Game"
+                 ORDER BY started DESC
+                 LIMIT 1'''
+
+
+def latest_game(connection):
+    """ Returns (game id, board size, game type) of the most recently started recorded game, or None """
+    cur = connection.cursor()
+    cur.execute(LATEST_GAME)
+    row = cur.fetchone()
+    cur.close()
+    return row
+
+
+class MoveStream:
+    def __init__(self, database, game_id, start_ply=0, chunk_size=CHUNK_SIZE):
+        with ExitStack() as stack:
+            # A connection is held for the whole stream, since the cursor lives in its transaction on the server. It
+            # is rolled back before going back to the pool, so the pool can hand it out again
+            connection = stack.enter_context(database.connection())
+            stack.callback(connection.rollback)
+            # A named cursor is a server-side cursor, so only the rows of one chunk are ever sent at a time
+            self.cursor = connection.cursor(name=f"replay_{uuid.uuid4().hex}")
+            stack.callback(self.cursor.close)
+            self.cursor.execute(GAME_MOVES_FROM, (game_id, start_ply))
+            # Nothing is released unless opening failed, in which case everything already opened is
+            self.resources = stack.pop_all()
+        self.chunk_size = chunk_size
+
+    def next_chunk(self):
+        """ Returns the next moves as (ply, player, row, column, symbol), fewer than a chunk at the end """
+        return self.cursor.fetchmany(self.chunk_size)
+
+    def close(self):
+        """ Closes the cursor and gives the connection back to the pool """
+        self.resources.close()
+
+
+class ReplayPlayer:
+    def __init__(self, game, database, game_id, speed=REPLAY_SPEED, chunk_size=CHUNK_SIZE):
+        # Game the moves are played on
+        self.game = game
+        # Recorded game and where its moves come from. The stream is only open while moves are being read ahead
+        self.database = database
+        self.game_id = game_id
+        self.chunk_size = chunk_size
+        self.stream = None
+        # Moves read so far (at most one per cell), and whether the last one has been read
+        self.moves = []
+        self.exhausted = False
+        # Moves per second, moves shown so far, and the pending scheduled move
+        self.speed = speed
+        self.ply = 0
+        self.job = None
+        self.paused = False
+        self.stopped = False
+
+    @property
+    def finished(self):
+        """ Whether every move of the game is shown """
+        return self.exhausted and self.ply == len(self.moves)
+
+    def start(self):
+        """ Starts playing from the first move, with clicks on the board ignored until the replay is stopped """
+        self.game.replaying = True
+        self.schedule()
+
+    def read_move(self):
+        """ Returns the move after the ones shown, reading the next chunk if needed, or None after the last move """
+        if self.ply == len(self.moves) and not self.exhausted:
+            if self.stream is None:
+                # Reading picks up after the moves already read
+                self.stream = MoveStream(self.database, self.game_id, len(self.moves), self.chunk_size)
+            rows = self.stream.next_chunk()
+            self.moves.extend(rows)
+            if len(rows) < self.chunk_size:
+                self.exhausted = True
+                self.close_stream()
+        return self.moves[self.ply] if self.ply < len(self.moves) else None
+
+    def close_stream(self):
+        """ Stops streaming moves and gives the connection back """
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def delay(self):
+        """ Milliseconds between moves at the current speed """
+        return max(1, int(1000 / self.speed))
+
+    def schedule(self):
+        """ Schedules the next move unless paused, stopped or finished """
+        if self.job is None and not self.paused and not self.stopped and not self.finished:
+            self.job = self.game.board.after(self.delay(), self.tick)
+
+    def cancel(self):
+        """ Drops the scheduled move """
+        if self.job is not None:
+            self.game.board.after_cancel(self.job)
+            self.job = None
+
+    def tick(self):
+        """ Plays the scheduled move and schedules the one after it """
+        self.job = None
+        if self.advance():
+            self.schedule()
+
+    def advance(self):
+        """ Shows the next move and returns whether there was one """
+        move = self.read_move()
+        if move is None:
+            return False
+        ply, color, row, column, symbol = move
+        if color == "Blue":
+            self.game.blue_player.symbol = symbol
+        elif color == "Red":
+            self.game.red_player.symbol = symbol
+        self.game.play_move(self.game.cell_matrix[row][column])
+        self.ply += 1
+        return True
+
+    def retreat(self):
+        """ Takes the last move shown off the board and returns whether there was one """
+        if self.ply == 0:
+            return False
+        self.game.undo_move()
+        self.ply -= 1
+        return True
+
+    def pause(self):
+        """ Stops playing moves until resumed, giving the connection back meanwhile """
+        self.paused = True
+        self.cancel()
+        self.close_stream()
+
+    def resume(self):
+        """ Plays moves again after a pause, reading on from the current move when needed """
+        self.paused = False
+        self.schedule()
+
+    def set_speed(self, speed):
+        """ Changes the number of moves played per second """
+        if speed > 0:
+            self.speed = speed
+            self.cancel()
+            self.schedule()
+
+    def step_forward(self):
+        """ Pauses and shows one more move """
+        self.pause()
+        self.advance()
+        self.close_stream()
+
+    def step_back(self):
+        """ Pauses and takes back the last move shown """
+        self.pause()
+        self.retreat()
+
+    def seek(self, ply):
+        """ Shows the game as it was after a number of moves, then carries on unless paused """
+        self.cancel()
+        while self.ply > ply and self.retreat():
+            pass
+        while self.ply < ply and self.advance():
+            pass
+        if self.paused:
+            self.close_stream()
+        self.schedule()
+
+    def stop(self):
+        """ Ends the replay and lets the board be played again """
+        self.cancel()
+        self.close_stream()
+        self.stopped = True
+        self.game.replaying = False
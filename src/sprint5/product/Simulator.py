@@ -0,0 +1,125 @@
+""" Headless self-play: plays many games between computer strategies without any Tk objects and reports how they
+went """
+import random
+import sys
+import time
+from collections import namedtuple
+from Board_State import S, O
+from Bit_Board_State import make_board_state
+from Threat_Index import ThreatIndex, random_safe_move
+from Position import Position, BLUE, RED, SIMPLE_GAME, GENERAL_GAME
+from Alpha_Beta_Search import AlphaBetaSearch
+from Monte_Carlo_Search import MonteCarloSearch
+
+# Totals of a batch of games, with rates per game and Blue's point of view for wins and losses
+SimulationResult = namedtuple("SimulationResult", ["games", "blue_wins", "red_wins", "ties", "blue_win_rate",
+                                                   "red_win_rate", "tie_rate", "mean_blue_score", "mean_red_score",
+                                                   "moves", "seconds", "moves_per_second", "games_per_second"])
+
+
+class RandomStrategy:
+    """ Any empty cell and letter, uniformly """
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def best_move(self, position):
+        empty = position.state.empty_list
+        return empty[self.rng.randrange(len(empty))], self.rng.choice((S, O))
+
+
+class SafeStrategy:
+    """ A random move that leaves the opponent nothing to complete whenever possible """
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def best_move(self, position):
+        return random_safe_move(position.state, self.rng)
+
+
+class GreedyStrategy:
+    """ The "Simple" computer: completes an SOS when it can, otherwise plays safe """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.threat_index = None
+
+    def best_move(self, position):
+        # The index follows the state move by move, so it is only rebuilt for a new game
+        if self.threat_index is None or self.threat_index.state is not position.state:
+            self.threat_index = ThreatIndex(position.state)
+        move = self.threat_index.scoring_move()
+        if move is not None:
+            return move
+        return random_safe_move(position.state, self.rng)
+
+
+# Strategies by name, each made from a random generator: the "Hard" and "Expert" searches are kept shallow and short
+# so thousands of games stay practical (tournaments rate the computer player's real difficulties)
+STRATEGIES = {
+    "random": RandomStrategy,
+    "safe": SafeStrategy,
+    "greedy": GreedyStrategy,
+    "hard": lambda rng: AlphaBetaSearch(max_depth=2, time_limit=1.0),
+    "expert": lambda rng: MonteCarloSearch(time_limit=1.0, max_playouts=200, seed=rng.getrandbits(32)),
+}
+
+
+def play_game(board_size, game_type, blue, red, backend="list"):
+    """ Plays one game between two strategies, returning ((Blue score, Red score), moves played) """
+    position = Position(make_board_state(board_size, backend), game_type)
+    players = (blue, red)
+    moves = 0
+    while not position.is_over():
+        position.play(*players[position.to_move].best_move(position))
+        moves += 1
+    return tuple(position.scores), moves
+
+
+def run_games(n_games, play):
+    """ Times n_games calls of play (returning ((Blue score, Red score), moves played)) and totals them up """
+    wins = [0, 0]
+    totals = [0, 0]
+    moves = 0
+    start = time.perf_counter()
+    for _ in range(n_games):
+        scores, played = play()
+        moves += played
+        totals[BLUE] += scores[BLUE]
+        totals[RED] += scores[RED]
+        if scores[BLUE] != scores[RED]:
+            wins[BLUE if scores[BLUE] > scores[RED] else RED] += 1
+    seconds = time.perf_counter() - start
+    ties = n_games - wins[BLUE] - wins[RED]
+    games = max(n_games, 1)
+    return SimulationResult(n_games, wins[BLUE], wins[RED], ties, wins[BLUE] / games, wins[RED] / games, ties / games,
+                            totals[BLUE] / games, totals[RED] / games, moves, seconds,
+                            moves / seconds if seconds else 0.0, n_games / seconds if seconds else 0.0)
+
+
+def simulate(n_games, board_size=9, game_type=GENERAL_GAME, blue_strategy="random", red_strategy="random", seed=None,
+             backend="list"):
+    """ Plays n_games games between two named strategies (Blue always moves first) move by move on the given board
+    state backend and returns a SimulationResult """
+    rng = random.Random(seed)
+    blue = STRATEGIES[blue_strategy](random.Random(rng.getrandbits(32)))
+    red = STRATEGIES[red_strategy](random.Random(rng.getrandbits(32)))
+    return run_games(n_games, lambda: play_game(board_size, game_type, blue, red, backend))
+
+
+if __name__ == '__main__':
+    # Usage: python Simulator.py [games] [board size] [simple|general] [Blue strategy] [Red strategy] [seed]
+    #                            [list|bitboard]
+    arguments = sys.argv[1:]
+    n_games = int(arguments[0]) if len(arguments) > 0 else 10000
+    board_size = int(arguments[1]) if len(arguments) > 1 else 9
+    game_type = SIMPLE_GAME if len(arguments) > 2 and arguments[2] == "simple" else GENERAL_GAME
+    seed = int(arguments[5]) if len(arguments) > 5 else None
+    backend = arguments[6] if len(arguments) > 6 else "list"
+    result = simulate(n_games, board_size, game_type, arguments[3] if len(arguments) > 3 else "random",
+                      arguments[4] if len(arguments) > 4 else "random", seed, backend)
+    print(f"{result.games} games: Blue {result.blue_win_rate:.1%}, Red {result.red_win_rate:.1%}, "
+          f"tie {result.tie_rate:.1%}")
+    print(f"Mean score: Blue {result.mean_blue_score:.2f}, Red {result.mean_red_score:.2f}")
+    print(f"{result.moves_per_second:.0f} moves/s, {result.games_per_second:.0f} games/s ({backend})")
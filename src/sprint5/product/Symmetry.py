@@ -0,0 +1,101 @@
+""" The 8 symmetries of a square board (rotations and reflections), which leave the SOS rules unchanged, and
+canonical forms of boards under them for caches, opening books and transposition tables """
+from functools import lru_cache
+
+# Number of symmetries of a square board (symmetry 0 is the identity)
+SYMMETRY_COUNT = 8
+
+
+@lru_cache(maxsize=None)
+def symmetries(board_size):
+    """ The 8 symmetries as cell permutations: board[permutation[i]] is cell i of the transformed board """
+    n = board_size
+    transforms = (lambda row, column: (row, column),
+                  lambda row, column: (column, n - 1 - row),
+                  lambda row, column: (n - 1 - row, n - 1 - column),
+                  lambda row, column: (n - 1 - column, row),
+                  lambda row, column: (row, n - 1 - column),
+                  lambda row, column: (n - 1 - row, column),
+                  lambda row, column: (column, row),
+                  lambda row, column: (n - 1 - column, n - 1 - row))
+    return tuple(tuple(source_row * n + source_column for row in range(n) for column in range(n)
+                       for source_row, source_column in [transform(row, column)])
+                 for transform in transforms)
+
+
+@lru_cache(maxsize=None)
+def inverse_symmetries(board_size):
+    """ Inverse permutations: cell i of a board is cell inverse[i] of the transformed board """
+    inverses = []
+    for permutation in symmetries(board_size):
+        inverse = [0] * len(permutation)
+        for cell, source in enumerate(permutation):
+            inverse[source] = cell
+        inverses.append(tuple(inverse))
+    return tuple(inverses)
+
+
+@lru_cache(maxsize=None)
+def mask_tables(board_size):
+    """ Per symmetry, per byte of a cell bitmask, the transformed mask of each of the 256 byte values (so a mask is
+    transformed with one lookup per 8 cells) """
+    cell_count = board_size * board_size
+    tables = []
+    for inverse in inverse_symmetries(board_size):
+        byte_tables = []
+        for offset in range(0, cell_count, 8):
+            bits = [1 << inverse[cell] for cell in range(offset, min(offset + 8, cell_count))]
+            table = []
+            for value in range(256):
+                moved = 0
+                for bit, target in enumerate(bits):
+                    if value >> bit & 1:
+                        moved |= target
+                table.append(moved)
+            byte_tables.append(tuple(table))
+        tables.append(tuple(byte_tables))
+    return tuple(tables)
+
+
+def transform_mask(mask, byte_tables):
+    """ Applies one symmetry's mask tables to a cell bitmask """
+    result = 0
+    for table in byte_tables:
+        result |= table[mask & 255]
+        mask >>= 8
+    return result
+
+
+def canonical_masks(s_mask, o_mask, board_size):
+    """ Returns (S mask, O mask, symmetry) of the orientation of a board with the smallest (S mask, O mask) """
+    best = (s_mask, o_mask, 0)
+    for symmetry, byte_tables in enumerate(mask_tables(board_size)):
+        if symmetry:
+            candidate = (transform_mask(s_mask, byte_tables), transform_mask(o_mask, byte_tables), symmetry)
+            if candidate < best:
+                best = candidate
+    return best
+
+
+def board_key(cells):
+    """ Packs cell codes into one integer (base 3, cell 0 lowest) """
+    key = 0
+    for code in reversed(cells):
+        key = key * 3 + code
+    return key
+
+
+def canonical_cells(cells, board_size):
+    """ Returns (key, symmetry) of the orientation of a list of cell codes with the smallest base 3 key """
+    return min((board_key([cells[source] for source in permutation]), symmetry)
+               for symmetry, permutation in enumerate(symmetries(board_size)))
+
+
+def to_canonical(index, symmetry, board_size):
+    """ Cell of the transformed board that a cell of the original board moves to """
+    return inverse_symmetries(board_size)[symmetry][index]
+
+
+def from_canonical(index, symmetry, board_size):
+    """ Cell of the original board that a cell of the transformed board came from """
+    return symmetries(board_size)[symmetry][index]
@@ -0,0 +1,114 @@
+""" Incremental index of the SOS sequences that can be completed in one move """
+import random
+from Board_State import EMPTY, S, O, triple_table
+
+
+class ThreatIndex:
+    def __init__(self, state):
+        # Board state being followed
+        self.state = state
+        # Triples of the board size
+        self.table = triple_table(state.board_size)
+        # Completable triples (two correct letters and one empty cell): key -> (empty cell index, letter code)
+        self.threats = {}
+        # Number of the state's placements already applied, and the last one applied (to notice undos)
+        self.synced = 0
+        self.last_move = None
+        self.rebuild()
+
+    def rebuild(self):
+        """ Rebuilds the index from scratch """
+        self.threats.clear()
+        for key in self.table.triples:
+            self.refresh(key)
+        self.synced = len(self.state.moves)
+        self.last_move = self.state.moves[-1] if self.state.moves else None
+
+    def refresh(self, key):
+        """ Re-evaluates one triple """
+        start, middle, end = self.table.triples[key]
+        code = self.state.code
+        letters = (code(start), code(middle), code(end))
+        # S O _
+        if letters == (S, O, EMPTY):
+            self.threats[key] = (end, S)
+        # S _ S
+        elif letters == (S, EMPTY, S):
+            self.threats[key] = (middle, O)
+        # _ O S
+        elif letters == (EMPTY, O, S):
+            self.threats[key] = (start, S)
+        else:
+            self.threats.pop(key, None)
+
+    def update(self, index):
+        """ Updates the triples passing through a cell that was just placed """
+        for key in self.table.cell_keys[index]:
+            self.refresh(key)
+
+    def sync(self):
+        """ Catches up with the placements made on the state since the last sync """
+        moves = self.state.moves
+        # A placement was taken back since the last sync, so start over
+        if len(moves) < self.synced or (self.synced and moves[self.synced - 1] is not self.last_move):
+            self.rebuild()
+            return
+        for index, new_sequences in moves[self.synced:]:
+            self.update(index)
+        self.synced = len(moves)
+        self.last_move = moves[-1] if moves else None
+
+    def follow(self, state):
+        """ Follows another board state of the same size. Copies of a state share its placement records, so a copy
+        carrying on the same game only applies its new placements while any other board starts over """
+        self.state = state
+        self.sync()
+
+    def scoring_move(self):
+        """ Returns an (empty cell index, letter code) that completes an SOS, or None """
+        self.sync()
+        return next(iter(self.threats.values()), None)
+
+
+# Letters of a triple that one more letter would complete
+COMPLETABLE = {(S, O, EMPTY), (S, EMPTY, S), (EMPTY, O, S)}
+
+
+def completes_sos(state, index, code, table):
+    """ Checks if placing a cell code at an empty cell would complete an SOS """
+    cell_code = state.code
+    if code == S:
+        return any(cell_code(middle) == O and cell_code(end) == S for key, middle, end in table.endpoints[index])
+    return any(cell_code(start) == S and cell_code(end) == S for key, start, end in table.middles[index])
+
+
+def is_giveaway(state, index, code, table):
+    """ Checks if placing a cell code at an empty cell would leave the opponent an SOS to complete """
+    cell_code = state.code
+    for key in table.cell_keys[index]:
+        letters = tuple(code if cell == index else cell_code(cell) for cell in table.triples[key])
+        if letters in COMPLETABLE:
+            return True
+    return False
+
+
+# Random empty cells tried before looking at every empty cell for a safe move
+SAFE_MOVE_ATTEMPTS = 8
+
+
+def random_safe_move(state, rng=random):
+    """ Picks a random (empty cell index, letter code) that leaves the opponent no SOS to complete, or any random
+    move when every move gives one away """
+    empty = state.empty_list
+    table = state.table
+    # Uniform picks from the state's empty cell list are O(1), and most cells are safe early in a game
+    for _ in range(SAFE_MOVE_ATTEMPTS):
+        index = empty[rng.randrange(len(empty))]
+        codes = [code for code in (S, O) if not is_giveaway(state, index, code, table)]
+        if codes:
+            return index, rng.choice(codes)
+    # Safe moves are rare, so look at every one
+    safe = [(index, code) for index in empty for code in (S, O) if not is_giveaway(state, index, code, table)]
+    if safe:
+        return rng.choice(safe)
+    return empty[rng.randrange(len(empty))], rng.choice((S, O))
@@ -0,0 +1,166 @@
+""" Round-robin tournaments between computer strategies, played across worker processes and rated with Elo """
+import csv
+import math
+import multiprocessing
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from Position import BLUE, RED, SIMPLE_GAME, GENERAL_GAME
+from Simulator import STRATEGIES, play_game
+from Computer_Strategy import ComputerStrategy
+
+# Columns of the results file, one row per game
+RESULT_FIELDS = ("game", "board_size", "game_type", "blue", "red", "blue_score", "red_score", "moves", "seconds",
+                 "seed")
+
+# Players by name: the simulator's strategies, except that "simple", "hard" and "expert" are the computer player's
+# difficulties as played in the GUI (opening book, endgame solver and time limits included), each searching in the
+# worker process playing its game. Their searches stop on the clock, so their games only repeat up to timing
+PLAYERS = dict(STRATEGIES,
+               simple=lambda rng: ComputerStrategy("Simple", rng, search_workers=1),
+               hard=lambda rng: ComputerStrategy("Hard", rng, search_workers=1),
+               expert=lambda rng: ComputerStrategy("Expert", rng, search_workers=1))
+
+# Rating given to the average player
+BASE_RATING = 1500
+
+# Resamples of the games used for the confidence interval of each rating
+BOOTSTRAP_SAMPLES = 200
+
+
+def schedule(strategies, board_sizes, game_type, games_per_pair, seed=0):
+    """ Every game of a round robin as (game number, board size, game type, Blue, Red, game seed): each pair of
+    strategies meets games_per_pair times per board size, swapping colours every game """
+    games = []
+    for board_size in board_sizes:
+        for first, second in combinations(strategies, 2):
+            for round_number in range(games_per_pair):
+                blue, red = (first, second) if round_number % 2 == 0 else (second, first)
+                # Each game's seed only depends on the tournament seed and the game's place in the schedule, so a
+                # game plays the same whichever worker gets it
+                games.append((len(games), board_size, game_type, blue, red, seed * 1000003 + len(games)))
+    return games
+
+
+def play_scheduled_game(game):
+    """ Worker task: plays one scheduled game and returns its row of results """
+    number, board_size, game_type, blue, red, seed = game
+    rng = random.Random(seed)
+    blue_player = PLAYERS[blue](random.Random(rng.getrandbits(32)))
+    red_player = PLAYERS[red](random.Random(rng.getrandbits(32)))
+    start = time.perf_counter()
+    scores, moves = play_game(board_size, game_type, blue_player, red_player)
+    return {"game": number, "board_size": board_size, "game_type": game_type, "blue": blue, "red": red,
+            "blue_score": scores[BLUE], "red_score": scores[RED], "moves": moves,
+            "seconds": round(time.perf_counter() - start, 6), "seed": seed}
+
+
+def play_tournament(games, path, workers=1):
+    """ Plays scheduled games (across worker processes when workers > 1), writing each row to a CSV file as soon as
+    it is in, and returns the rows """
+    rows = []
+    with open(path, "w", newline="") as results_file:
+        writer = csv.DictWriter(results_file, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        if workers > 1:
+            # Spawned rather than forked so the workers never inherit the GUI or the database connection
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                results = pool.map(play_scheduled_game, games, chunksize=max(1, len(games) // (workers * 16)))
+                for row in results:
+                    writer.writerow(row)
+                    rows.append(row)
+        else:
+            for row in map(play_scheduled_game, games):
+                writer.writerow(row)
+                rows.append(row)
+    return rows
+
+
+def read_results(path):
+    """ Reads the rows of a results file written by play_tournament """
+    with open(path, newline="") as results_file:
+        return [dict(row, board_size=int(row["board_size"]), blue_score=int(row["blue_score"]),
+                     red_score=int(row["red_score"])) for row in csv.DictReader(results_file)]
+
+
+def outcomes(rows):
+    """ Each game as (Blue, Red, Blue's result: 1 for a win, 0.5 for a tie, 0 for a loss) """
+    return [(row["blue"], row["red"], 1.0 if row["blue_score"] > row["red_score"] else
+             0.5 if row["blue_score"] == row["red_score"] else 0.0) for row in rows]
+
+
+def fit_ratings(games, players, iterations=200):
+    """ Maximum likelihood Elo ratings (Bradley-Terry model, ties as half a win) of a list of outcomes """
+    # One tie between every pair of players as a prior, so a player who never wins or never loses still gets a
+    # finite rating
+    wins = {player: 0.5 * (len(players) - 1) for player in players}
+    meetings = {(first, second): 1 for first in players for second in players if first != second}
+    for blue, red, result in games:
+        wins[blue] += result
+        wins[red] += 1 - result
+        meetings[blue, red] += 1
+        meetings[red, blue] += 1
+    # Minorization-maximization updates of each player's strength
+    strength = {player: 1.0 for player in players}
+    for _ in range(iterations):
+        strength = {player: wins[player] / sum(meetings[player, other] / (strength[player] + strength[other])
+                                               for other in players if other != player)
+                    for player in players}
+    # Centred so the average player is rated BASE_RATING
+    mean = sum(math.log10(value) for value in strength.values()) / len(players)
+    return {player: BASE_RATING + 400 * (math.log10(strength[player]) - mean) for player in players}
+
+
+def elo_ratings(rows, samples=BOOTSTRAP_SAMPLES, seed=0):
+    """ Returns {strategy: (rating, low, high)} with a 95% bootstrap confidence interval, from rows of results """
+    games = outcomes(rows)
+    players = sorted({player for blue, red, result in games for player in (blue, red)})
+    if len(players) < 2:
+        return {player: (BASE_RATING, BASE_RATING, BASE_RATING) for player in players}
+    ratings = fit_ratings(games, players)
+    # Ratings of the same number of games drawn with replacement
+    rng = random.Random(seed)
+    resampled = {player: [] for player in players}
+    for _ in range(samples):
+        sample = fit_ratings([rng.choice(games) for _ in games], players, iterations=50)
+        for player in players:
+            resampled[player].append(sample[player])
+    intervals = {}
+    for player in players:
+        values = sorted(resampled[player])
+        intervals[player] = (ratings[player], values[int(0.025 * (samples - 1))], values[int(0.975 * (samples - 1))])
+    return intervals
+
+
+def ratings_by_board_size(rows, samples=BOOTSTRAP_SAMPLES, seed=0):
+    """ Returns {board size: {strategy: (rating, low, high)}} """
+    sizes = sorted({row["board_size"] for row in rows})
+    return {size: elo_ratings([row for row in rows if row["board_size"] == size], samples, seed) for size in sizes}
+
+
+def run_tournament(strategies, board_sizes=(3,), game_type=GENERAL_GAME, games_per_pair=10, path="tournament.csv",
+                   workers=1, seed=0):
+    """ Plays a round robin and returns the Elo ratings of every strategy per board size """
+    rows = play_tournament(schedule(strategies, board_sizes, game_type, games_per_pair, seed), path, workers)
+    return ratings_by_board_size(rows, seed=seed)
+
+
+if __name__ == '__main__':
+    # Usage: python Tournament.py [games per pair] [board sizes, e.g. 3,5] [simple|general]
+    #                             [strategies, e.g. random,greedy,hard] [results file] [workers] [seed]
+    arguments = sys.argv[1:]
+    start = time.perf_counter()
+    table = run_tournament(arguments[3].split(",") if len(arguments) > 3 else ["random", "safe", "greedy", "hard"],
+                           [int(size) for size in arguments[1].split(",")] if len(arguments) > 1 else [3, 5],
+                           SIMPLE_GAME if len(arguments) > 2 and arguments[2] == "simple" else GENERAL_GAME,
+                           int(arguments[0]) if len(arguments) > 0 else 20,
+                           arguments[4] if len(arguments) > 4 else "tournament.csv",
+                           int(arguments[5]) if len(arguments) > 5 else multiprocessing.cpu_count(),
+                           int(arguments[6]) if len(arguments) > 6 else 0)
+    for size, ratings in table.items():
+        print(f"{size}x{size}:")
+        for name, (rating, low, high) in sorted(ratings.items(), key=lambda item: -item[1][0]):
+            print(f"  {name:>8}: {rating:6.0f}  ({low:.0f} to {high:.0f})")
+    print(f"{time.perf_counter() - start:.1f} s")
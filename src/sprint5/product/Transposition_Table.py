@@ -0,0 +1,98 @@
+""" Zobrist hashing of positions and a fixed-size transposition table for the game-tree search """
+import random
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+from Board_State import triple_table
+
+# Bound stored with a value
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# Key groups for one board size:
+#   cells       per cell index, the key of each cell code (the empty code's key is 0)
+#   side        key toggled when Red is to move
+#   differences key of each score difference (Blue minus Red), offset by the number of triples
+#   general     key toggled for a general game, so simple and general positions never share a table entry
+ZobristKeys = namedtuple("ZobristKeys", ["cells", "side", "differences", "offset", "general"])
+
+# Entry returned by a probe (move is a (cell index, letter code) pair or None)
+Entry = namedtuple("Entry", ["value", "depth", "flag", "move"])
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(board_size):
+    """ Random 64-bit keys for a board size (seeded, so hashes are the same in every process) """
+    rng = random.Random(board_size)
+    cells = tuple((0, rng.getrandbits(64), rng.getrandbits(64)) for _ in range(board_size * board_size))
+    offset = len(triple_table(board_size).triples)
+    differences = tuple(rng.getrandbits(64) for _ in range(2 * offset + 1))
+    side = rng.getrandbits(64)
+    return ZobristKeys(cells, side, differences, offset, rng.getrandbits(64))
+
+
+class TranspositionTable:
+    def __init__(self, size_bits=16):
+        # Number of slots (a power of two so a hash maps to a slot with a mask)
+        self.size = 1 << size_bits
+        self.mask = self.size - 1
+        # One compact array per field instead of one object per entry
+        self.keys = array('Q', [0]) * self.size
+        self.values = array('d', [0.0]) * self.size
+        self.depths = array('b', [0]) * self.size
+        self.flags = array('b', [0]) * self.size
+        self.ages = array('H', [0]) * self.size
+        # Best move encoded as cell index * 4 + letter code (0 for none)
+        self.moves = array('l', [0]) * self.size
+        # Search generation, bumped for every new search so old entries can be replaced
+        self.age = 1
+        # Statistics
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.used = 0
+
+    def new_search(self):
+        """ Starts a new search generation """
+        self.age = self.age % 65535 + 1
+
+    def probe(self, key):
+        """ Returns the Entry stored for a hash, or None """
+        self.probes += 1
+        slot = key & self.mask
+        if self.ages[slot] and self.keys[slot] == key:
+            self.hits += 1
+            move = self.moves[slot]
+            return Entry(self.values[slot], self.depths[slot], self.flags[slot],
+                         divmod(move, 4) if move else None)
+        return None
+
+    def store(self, key, value, depth, flag, move=None):
+        """ Stores a search result, replacing the slot's entry if it is from an older search or not deeper """
+        slot = key & self.mask
+        if self.ages[slot] == self.age and self.keys[slot] != key and self.depths[slot] > depth:
+            return
+        if not self.ages[slot]:
+            self.used += 1
+        self.stores += 1
+        self.keys[slot] = key
+        self.values[slot] = value
+        self.depths[slot] = min(depth, 127)
+        self.flags[slot] = flag
+        self.ages[slot] = self.age
+        self.moves[slot] = move[0] * 4 + move[1] if move else 0
+
+    def hit_rate(self):
+        """ Fraction of probes that found an entry """
+        return self.hits / self.probes if self.probes else 0.0
+
+    def memory_bytes(self):
+        """ Memory taken by the table's entries """
+        return sum(len(field) * field.itemsize
+                   for field in (self.keys, self.values, self.depths, self.flags, self.ages, self.moves))
+
+    def stats(self):
+        """ Hit rate, fill and memory footprint, for sizing the table """
+        return {"probes": self.probes, "hits": self.hits, "hit_rate": self.hit_rate(), "stores": self.stores,
+                "used": self.used, "size": self.size, "memory_bytes": self.memory_bytes()}
@@ -0,0 +1,332 @@
+import random
+import time
+from Board_State import S, O, triple_table
+from Threat_Index import completes_sos
+from Position import BLUE, RED, SIMPLE_GAME, GENERAL_GAME
+from Alpha_Beta_Search import AlphaBetaSearch, order_moves
+from Transposition_Table import TranspositionTable, EXACT
+from test_support import make_position
+
+
+class TestPosition:
+    """Tests for the Tk-free position searched by the computer player"""
+
+    def test_turn_passes_without_score(self):
+        """Test the turn passes after a move that scores nothing"""
+        # Arrange
+        position = make_position(3, {})
+
+        # Act
+        points = position.play(0, S)
+
+        # Assert
+        assert points == 0
+        assert position.to_move == RED
+
+    def test_general_game_scorer_moves_again(self):
+        """Test a general game player who scores keeps the turn"""
+        # Arrange
+        position = make_position(3, {(0, 0): 'S', (0, 1): 'O'}, GENERAL_GAME)
+
+        # Act
+        points = position.play(2, S)
+
+        # Assert
+        assert points == 1
+        assert position.to_move == BLUE
+        assert position.scores == [1, 0]
+        assert position.is_over() == False
+
+    def test_simple_game_over_at_first_sos(self):
+        """Test a simple game ends with the first SOS"""
+        # Arrange
+        position = make_position(3, {(0, 0): 'S', (0, 1): 'O'}, to_move=RED)
+
+        # Act
+        position.play(2, S)
+
+        # Assert
+        assert position.is_over() == True
+        assert position.winner() == RED
+
+    def test_undo_restores_turn_and_score(self):
+        """Test undo gives back the board, the turn and the score"""
+        # Arrange
+        position = make_position(3, {(0, 0): 'S', (0, 1): 'O'}, GENERAL_GAME, RED)
+        position.play(2, S)
+
+        # Act
+        position.undo()
+
+        # Assert
+        assert position.scores == [0, 0]
+        assert position.to_move == RED
+        assert position.state.is_empty(0, 2)
+
+
+class TestAlphaBetaSearch:
+    """Tests for the alpha-beta search behind the Hard difficulty"""
+
+    def test_scoring_moves_ordered_first(self):
+        """Test moves that complete an SOS are tried before the others"""
+        # Arrange
+        position = make_position(4, {(0, 0): 'S', (0, 1): 'O'})
+
+        # Act
+        moves = order_moves(position)
+
+        # Assert
+        assert moves[0] == (2, S)
+
+    def test_takes_winning_move(self):
+        """Test the search completes an SOS to win a simple game"""
+        # Arrange
+        position = make_position(4, {(1, 0): 'S', (1, 1): 'O'})
+
+        # Act
+        move = AlphaBetaSearch(max_depth=2).best_move(position)
+
+        # Assert
+        assert move == (6, S)
+
+    def test_avoids_giving_opponent_a_win(self):
+        """Test the search never leaves an SOS for the opponent when a safe move exists"""
+        # Arrange
+        position = make_position(4, {(0, 0): 'S', (3, 3): 'S'})
+        search = AlphaBetaSearch(max_depth=2)
+
+        # Act
+        index, code = search.best_move(position)
+        position.play(index, code)
+
+        # Assert - the opponent has no immediate SOS
+        table = triple_table(4)
+        assert not any(completes_sos(position.state, i, c, table) for i, c in position.legal_moves())
+
+    def test_general_game_chains_extra_turns(self):
+        """Test the search counts the extra turn after scoring in a general game"""
+        # Arrange - an S at (0, 2) scores, then the same player can score again at (2, 2)
+        position = make_position(3, {(0, 0): 'S', (0, 1): 'O', (1, 2): 'O', (2, 0): 'S', (2, 1): 'O'},
+                                 GENERAL_GAME)
+        search = AlphaBetaSearch(max_depth=3)
+
+        # Act
+        first = search.best_move(position)
+        position.play(*first)
+        second = search.best_move(position)
+        position.play(*second)
+
+        # Assert
+        assert position.scores[BLUE] >= 2
+        assert position.to_move == BLUE
+
+    def test_search_does_not_change_position(self):
+        """Test the caller's position is left untouched by the search"""
+        # Arrange
+        position = make_position(4, {(0, 0): 'S', (1, 1): 'O'}, GENERAL_GAME)
+        cells = list(position.state.cells)
+
+        # Act
+        AlphaBetaSearch(max_depth=3).best_move(position)
+
+        # Assert
+        assert position.state.cells == cells
+        assert position.history == []
+
+    def test_returns_within_time_budget(self):
+        """Test a deep search on a big board still answers within its time budget"""
+        # Arrange
+        position = make_position(9, {(4, 4): 'O'}, GENERAL_GAME)
+        search = AlphaBetaSearch(max_depth=10, time_limit=0.1)
+
+        # Act
+        start = time.perf_counter()
+        index, code = search.best_move(position)
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        assert elapsed < 0.5
+        assert index in position.state.empty_cells
+        assert code in (S, O)
+
+
+class TestTranspositionTable:
+    """Tests for Zobrist hashing and the transposition table used by the search"""
+
+    def test_incremental_hash_matches_full_hash(self):
+        """Test the hash kept up to date move by move equals one computed from scratch"""
+        # Arrange
+        rng = random.Random(5)
+        position = make_position(5, {}, GENERAL_GAME)
+
+        # Act / Assert
+        while not position.is_over():
+            position.play(*rng.choice(position.legal_moves()))
+            assert position.hash == position.compute_hash()
+            if rng.random() < 0.3:
+                position.undo()
+                assert position.hash == position.compute_hash()
+
+    def test_hash_depends_on_side_and_score(self):
+        """Test the same cells hash differently with another player to move or another score"""
+        # Arrange
+        letters = {(0, 0): 'S', (1, 1): 'O'}
+
+        # Act
+        blue = make_position(3, letters, GENERAL_GAME, BLUE).hash
+        red = make_position(3, letters, GENERAL_GAME, RED).hash
+        ahead = make_position(3, letters, GENERAL_GAME, BLUE, (1, 0)).hash
+
+        # Assert
+        assert len({blue, red, ahead}) == 3
+
+    def test_hash_depends_on_game_type(self):
+        """Test the same cells hash differently in a simple and a general game, so they never share an entry"""
+        # Arrange
+        letters = {(0, 0): 'S', (1, 1): 'O'}
+
+        # Act
+        simple = make_position(3, letters, SIMPLE_GAME)
+        general = make_position(3, letters, GENERAL_GAME)
+
+        # Assert
+        assert simple.hash != general.hash
+        assert general.hash == general.compute_hash()
+
+    def test_copy_keeps_hashes(self):
+        """Test a copy takes over the hashes and history, and moves on independently"""
+        # Arrange
+        position = make_position(4, {(0, 0): 'S'}, GENERAL_GAME)
+        position.track_symmetries()
+        position.play(5, O)
+
+        # Act
+        copy = position.copy()
+        copy.play(6, S)
+
+        # Assert
+        assert copy.history[:1] == position.history
+        assert copy.hash == copy.compute_hash()
+        assert position.hash == position.compute_hash()
+        assert copy.symmetric_hashes != position.symmetric_hashes
+        copy.undo()
+        assert (copy.hash, copy.symmetric_hashes) == (position.hash, position.symmetric_hashes)
+
+    def test_store_and_probe(self):
+        """Test a stored entry is found again and counted as a hit"""
+        # Arrange
+        table = TranspositionTable(size_bits=4)
+        table.store(12345, 7.0, 3, EXACT, (5, S))
+
+        # Act
+        entry = table.probe(12345)
+        missing = table.probe(54321)
+
+        # Assert
+        assert entry.value == 7.0
+        assert entry.depth == 3
+        assert entry.move == (5, S)
+        assert missing is None
+        assert table.hit_rate() == 0.5
+
+    def test_deeper_entry_kept_within_a_search(self):
+        """Test a shallower result does not replace a deeper one from the same search"""
+        # Arrange - both keys map to slot 1 of a 16-slot table
+        table = TranspositionTable(size_bits=4)
+        table.store(1, 1.0, 5, EXACT)
+
+        # Act
+        table.store(17, 2.0, 2, EXACT)
+        kept = table.probe(1)
+        table.new_search()
+        table.store(17, 2.0, 2, EXACT)
+
+        # Assert - replaced once the old entry was from a previous search
+        assert kept.value == 1.0
+        assert table.probe(17).value == 2.0
+
+    def test_memory_footprint_scales_with_size(self):
+        """Test the reported memory grows with the number of slots"""
+        assert TranspositionTable(12).memory_bytes() * 4 == TranspositionTable(14).memory_bytes()
+        assert TranspositionTable(12).stats()["size"] == 4096
+
+    def test_search_with_table_finds_same_value(self):
+        """Test the table changes how much is searched, not the result"""
+        rng = random.Random(9)
+        for _ in range(5):
+            # Arrange
+            position = make_position(4, {}, GENERAL_GAME)
+            for _ in range(7):
+                position.play(*rng.choice(position.legal_moves()))
+            with_table = AlphaBetaSearch(max_depth=3, time_limit=60)
+            without_table = AlphaBetaSearch(max_depth=3, time_limit=60, table_bits=0)
+
+            # Act
+            with_table.best_move(position)
+            without_table.best_move(position)
+
+            # Assert
+            assert with_table.value == without_table.value
+            assert with_table.table.stats()["hits"] > 0
+
+
+class TestIterativeDeepening:
+    """Tests for deepening the search one move at a time until the deadline"""
+
+    def test_deadline_met_without_depth_limit(self):
+        """Test a search with no depth limit stops at its deadline with a finished depth and a move"""
+        # Arrange
+        position = make_position(7, {(3, 3): 'O'}, GENERAL_GAME)
+        search = AlphaBetaSearch(max_depth=None, time_limit=0.2)
+
+        # Act
+        start = time.perf_counter()
+        index, code = search.best_move(position)
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        assert elapsed < 0.3
+        assert search.depth >= 1
+        assert index in position.state.empty_cells
+        assert code in (S, O)
+
+    def test_more_time_searches_deeper(self):
+        """Test a longer deadline finishes at least as deep a search"""
+        # Arrange
+        position = make_position(5, {(2, 2): 'O'}, GENERAL_GAME)
+        quick = AlphaBetaSearch(max_depth=None, time_limit=0.02)
+        slow = AlphaBetaSearch(max_depth=None, time_limit=0.3)
+
+        # Act
+        quick.best_move(position)
+        slow.best_move(position)
+
+        # Assert
+        assert slow.depth >= quick.depth
+        assert slow.nodes > quick.nodes
+
+    def test_stops_once_result_is_forced(self):
+        """Test deepening stops early when a win is already certain"""
+        # Arrange
+        position = make_position(4, {(0, 0): 'S', (0, 1): 'O'})
+        search = AlphaBetaSearch(max_depth=None, time_limit=5)
+
+        # Act
+        move = search.best_move(position)
+
+        # Assert
+        assert move == (2, S)
+        assert search.depth == 1
+
+    def test_whole_game_searched_on_tiny_board(self):
+        """Test the depth never goes past the number of empty cells"""
+        # Arrange
+        position = make_position(3, {(0, 0): 'O', (0, 1): 'O', (0, 2): 'O', (1, 0): 'O', (1, 1): 'O',
+                                     (1, 2): 'O', (2, 0): 'O'}, GENERAL_GAME)
+        search = AlphaBetaSearch(max_depth=None, time_limit=5)
+
+        # Act
+        search.best_move(position)
+
+        # Assert
+        assert search.depth == 2
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from Board_State import BoardState, S, O
+from Position import Position, BLUE, RED, SIMPLE_GAME, GENERAL_GAME
+from Batch_Engine import BatchEngine, sos_counts, NO_WINNER
+
+
+class TestBatchEngine:
+    """Tests for the NumPy batch engine"""
+
+    @pytest.mark.parametrize("board_size", [3, 4, 7])
+    @pytest.mark.parametrize("game_type", [SIMPLE_GAME, GENERAL_GAME])
+    def test_matches_position_rules(self, board_size, game_type):
+        """Test random batched games score, pass the turn and end exactly like positions playing the same moves"""
+        # Arrange
+        rng = np.random.default_rng(board_size)
+        engine = BatchEngine(64, board_size, game_type)
+        positions = [Position(BoardState(board_size), game_type) for _ in range(64)]
+
+        while not engine.over.all():
+            rows, columns, codes = engine.random_moves(rng)
+            expected = [0] * 64
+            for game, position in enumerate(positions):
+                if not position.is_over():
+                    expected[game] = position.play(int(rows[game]) * board_size + int(columns[game]), int(codes[game]))
+
+            # Act
+            points = engine.step(rows, columns, codes)
+
+            # Assert
+            assert points.tolist() == expected
+            assert engine.to_move.tolist() == [position.to_move for position in positions]
+            assert engine.over.tolist() == [position.is_over() for position in positions]
+        assert engine.scores.tolist() == [position.scores for position in positions]
+        assert engine.winners().tolist() == [NO_WINNER if position.winner() is None else position.winner()
+                                             for position in positions]
+
+    def test_legal_moves_are_empty_cells_of_running_games(self):
+        """Test only empty cells of games still going can be played"""
+        # Arrange - Blue completes an SOS in the first game, which ends it
+        engine = BatchEngine(2, 3, SIMPLE_GAME)
+        engine.step([0, 0], [0, 0], [S, S])
+        engine.step([0, 1], [1, 1], [O, O])
+
+        # Act
+        engine.step([0, 2], [2, 2], [S, O])
+        legal = engine.legal_moves()
+
+        # Assert
+        assert engine.over.tolist() == [True, False]
+        assert engine.winners().tolist() == [BLUE, NO_WINNER]
+        assert not legal[0].any()
+        assert legal[1].sum() == 6
+
+    def test_occupied_cell_rejected(self):
+        """Test playing on an occupied cell raises an error"""
+        # Arrange
+        engine = BatchEngine(1, 3)
+        engine.step([1], [1], [S])
+
+        # Act and Assert
+        with pytest.raises(ValueError):
+            engine.step([1], [1], [O])
+
+    def test_sos_counts_full_board(self):
+        """Test whole boards are counted in every direction"""
+        # Arrange - three rows (or columns) of SOS and the two diagonals crossing at the O in the centre
+        boards = np.array([[[S, O, S], [S, O, S], [S, O, S]], [[S, S, S], [O, O, O], [S, S, S]]], dtype=np.int8)
+
+        # Act and Assert
+        assert sos_counts(boards).tolist() == [5, 5]
+
+    def test_random_games_end_with_full_boards_in_general_game(self):
+        """Test a general game batch plays every cell of every board"""
+        # Arrange
+        engine = BatchEngine(100, 5, GENERAL_GAME)
+
+        # Act
+        engine.play_random(np.random.default_rng(0))
+
+        # Assert
+        assert (engine.moves == 25).all()
+        assert (engine.boards != 0).all()
+        assert (engine.scores.sum(axis=1) == sos_counts(engine.boards)).all()
+        assert set(engine.to_move.tolist()) <= {BLUE, RED}
@@ -0,0 +1,85 @@
+import random
+import pytest
+from Board_State import BoardState
+from Bit_Board_State import BitBoardState, make_board_state, benchmark_backends
+
+
+def play_random_game(states, board_size, seed):
+    """Plays the same random game on several board states, yielding after each placement"""
+    rng = random.Random(seed)
+    cells = [(row, column) for row in range(board_size) for column in range(board_size)]
+    rng.shuffle(cells)
+    for row, column in cells:
+        letter = rng.choice('SO')
+        yield row, column, [state.place(row, column, letter) for state in states]
+
+
+class TestBitBoardState:
+    """Tests for the bitboard backend of the board state"""
+
+    @pytest.mark.parametrize("board_size", [3, 4, 6, 9])
+    def test_matches_list_backend(self, board_size):
+        """Test the bitboard finds the same sequences as the list backend on random games"""
+        for seed in range(5):
+            # Arrange
+            list_state = BoardState(board_size)
+            bit_state = BitBoardState(board_size)
+
+            # Act / Assert
+            for row, column, (list_keys, bit_keys) in play_random_game([list_state, bit_state], board_size, seed):
+                assert sorted(list_keys) == sorted(bit_keys)
+                assert bit_state.letter(row, column) == list_state.letter(row, column)
+                assert bit_state.filled == list_state.filled
+                assert bit_state.empty_cells == list_state.empty_cells
+            assert bit_state.is_full() == True
+            assert bit_state.completed == list_state.completed
+
+    def test_completing_cells_matches_brute_force(self):
+        """Test the completing-cell masks agree with trying every empty cell"""
+        for seed in range(20):
+            # Arrange
+            state = BitBoardState(5)
+            rng = random.Random(seed)
+            for index in rng.sample(range(25), 12):
+                state.place(*state.position(index), rng.choice('SO'))
+
+            # Act
+            complete_with_s, complete_with_o = state.completing_cells()
+
+            # Assert
+            for index in sorted(state.empty_cells):
+                for letter, mask in (('S', complete_with_s), ('O', complete_with_o)):
+                    scores = bool(state.place(*state.position(index), letter))
+                    state.undo()
+                    assert scores == bool(mask >> index & 1)
+
+    def test_undo_restores_masks(self):
+        """Test undo clears the cell from every mask"""
+        # Arrange
+        state = BitBoardState(3)
+        state.place(0, 0, 'S')
+        state.place(0, 1, 'O')
+        state.place(0, 2, 'S')
+
+        # Act
+        state.undo()
+
+        # Assert
+        assert state.is_empty(0, 2)
+        assert state.s_mask == 1
+        assert state.o_mask == 2
+        assert state.sequences == []
+
+    def test_make_board_state_selects_backend(self):
+        """Test the factory returns the requested backend"""
+        assert isinstance(make_board_state(4), BoardState)
+        assert isinstance(make_board_state(4, "bitboard"), BitBoardState)
+
+    def test_benchmark_reports_both_backends(self):
+        """Test the benchmark times every backend and board size"""
+        # Act
+        timings = benchmark_backends(board_sizes=[3, 4], games=2)
+
+        # Assert
+        assert set(timings) == {("list", 3), ("bitboard", 3), ("list", 4), ("bitboard", 4)}
+        assert all(micros > 0 for micros in timings.values())
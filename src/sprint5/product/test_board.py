@@ -63,4 +63,18 @@ class TestBoard:
         mock_error.assert_called_once()
         args, kwargs = mock_error.call_args
         assert "Invalid input" in kwargs["message"]
-        assert result is None
\ No newline at end of file
+        assert result is None
+
+    def test_board_renders_from_state(self, setup_boardlogic):
+        """ Tests the board shows the letters of the board state and writing on a button leaves the state alone """
+        logic = setup_boardlogic
+        logic.new_board()
+        logic.state.place(0, 1, 'O')
+
+        logic.board.render()
+        logic.cell_matrix[2][2].config(text='S')
+
+        assert logic.cell_matrix[0][1]['text'] == 'O'
+        assert logic.cell_matrix[0][1]['state'] == DISABLED
+        assert logic.cell_matrix[0][0]['text'] == ''
+        assert logic.state.is_empty(2, 2)
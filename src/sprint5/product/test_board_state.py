@@ -0,0 +1,301 @@
+import random
+import pytest
+from Board_State import BoardState, EMPTY, S, O, triple_table
+
+
+class TestBoardState:
+    """Tests for the Tk-free board state used by the game logic"""
+
+    def test_new_board_is_empty(self):
+        """Test a new board state has no occupied cells"""
+        # Arrange
+        state = BoardState(4)
+
+        # Assert
+        assert state.cells == [EMPTY] * 16
+        assert state.filled == 0
+        assert state.is_full() == False
+
+    def test_place_stores_cell_code(self):
+        """Test placing a letter stores its code at the flat index"""
+        # Arrange
+        state = BoardState(3)
+
+        # Act
+        state.place(1, 2, 'S')
+        state.place(2, 0, 'O')
+
+        # Assert
+        assert state.cells[state.index(1, 2)] == S
+        assert state.cells[state.index(2, 0)] == O
+        assert state.letter(1, 2) == 'S'
+        assert state.letter(2, 0) == 'O'
+        assert state.letter(0, 0) == ''
+        assert state.filled == 2
+
+    def test_index_and_position_round_trip(self):
+        """Test flat indexes convert back to the same row and column"""
+        # Arrange
+        state = BoardState(5)
+
+        # Assert
+        for row in range(5):
+            for column in range(5):
+                assert state.position(state.index(row, column)) == (row, column)
+
+    def test_place_on_occupied_cell_raises(self):
+        """Test an occupied cell cannot be overwritten"""
+        # Arrange
+        state = BoardState(3)
+        state.place(0, 0, 'S')
+
+        # Act / Assert
+        with pytest.raises(ValueError):
+            state.place(0, 0, 'O')
+        assert state.letter(0, 0) == 'S'
+        assert state.filled == 1
+
+    def test_board_full_after_every_cell_placed(self):
+        """Test the occupancy count reports a full board"""
+        # Arrange
+        state = BoardState(3)
+
+        # Act
+        for row in range(3):
+            for column in range(3):
+                assert state.is_full() == False
+                state.place(row, column, 'O')
+
+        # Assert
+        assert state.is_full() == True
+
+
+def scan_all_sos(state):
+    """Full-board scan used as a reference for the incremental detector"""
+    n = state.board_size
+    found = set()
+    for row in range(n):
+        for column in range(n):
+            for row_step, column_step in ((1, 0), (0, 1), (1, 1), (1, -1)):
+                end_row, end_column = row + 2 * row_step, column + 2 * column_step
+                if 0 <= end_row < n and 0 <= end_column < n and state.letter(row, column) == 'S' and \
+                        state.letter(row + row_step, column + column_step) == 'O' and \
+                        state.letter(end_row, end_column) == 'S':
+                    found.add((state.index(row, column), state.index(row + row_step, column + column_step),
+                               state.index(end_row, end_column)))
+    return found
+
+
+class TestIncrementalSOSDetection:
+    """Tests for detecting only the SOS sequences made by the last placement"""
+
+    def test_s_completes_horizontal_sos(self):
+        """Test placing the final S returns the completed sequence"""
+        # Arrange
+        state = BoardState(3)
+        state.place(0, 0, 'S')
+        state.place(0, 1, 'O')
+
+        # Act
+        new_sequences = state.place(0, 2, 'S')
+
+        # Assert
+        assert [state.sequence_cells(key) for key in new_sequences] == [(0, 1, 2)]
+        assert state.sequences == new_sequences
+        assert state.is_completed(new_sequences[0])
+
+    def test_o_completes_every_direction(self):
+        """Test an O in the centre can complete all four directions at once"""
+        # Arrange
+        state = BoardState(3)
+        for row, column in ((0, 0), (0, 1), (0, 2), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)):
+            state.place(row, column, 'S')
+
+        # Act
+        new_sequences = state.place(1, 1, 'O')
+
+        # Assert
+        assert len(new_sequences) == 4
+        assert {state.sequence_cells(key) for key in new_sequences} == {(0, 4, 8), (2, 4, 6), (1, 4, 7),
+                                                                        (3, 4, 5)}
+
+    def test_s_completes_eight_directions(self):
+        """Test an S surrounded by O's and outer S's completes eight sequences"""
+        # Arrange
+        state = BoardState(5)
+        for row in range(5):
+            for column in range(5):
+                if (row, column) == (2, 2):
+                    continue
+                ring = max(abs(row - 2), abs(column - 2))
+                if ring == 1:
+                    state.place(row, column, 'O')
+                elif row % 2 == 0 and column % 2 == 0:
+                    state.place(row, column, 'S')
+        previous = len(state.sequences)
+
+        # Act
+        new_sequences = state.place(2, 2, 'S')
+
+        # Assert
+        assert len(new_sequences) == 8
+        assert len(state.sequences) == previous + 8
+
+    def test_sequence_key_is_canonical(self):
+        """Test the same sequence gets the same key whichever end is placed last"""
+        # Arrange
+        first = BoardState(4)
+        second = BoardState(4)
+        for state in (first, second):
+            state.place(1, 2, 'O')
+
+        # Act
+        first.place(0, 3, 'S')
+        first_keys = first.place(2, 1, 'S')
+        second.place(2, 1, 'S')
+        second_keys = second.place(0, 3, 'S')
+
+        # Assert
+        assert first_keys == second_keys
+        assert first.sequence_cells(first_keys[0]) == (3, 6, 9)
+
+    def test_no_sos_returns_empty_list(self):
+        """Test a placement that completes nothing returns no sequences"""
+        # Arrange
+        state = BoardState(3)
+        state.place(0, 0, 'S')
+
+        # Act
+        new_sequences = state.place(0, 1, 'S')
+
+        # Assert
+        assert new_sequences == []
+
+    def test_matches_full_scan_on_random_games(self):
+        """Test the incremental detector finds exactly what a full-board scan finds"""
+        rng = random.Random(7)
+        for board_size in range(3, 8):
+            state = BoardState(board_size)
+            cells = [(row, column) for row in range(board_size) for column in range(board_size)]
+            rng.shuffle(cells)
+            for row, column in cells:
+                state.place(row, column, rng.choice('SO'))
+                assert {state.sequence_cells(key) for key in state.sequences} == scan_all_sos(state)
+                assert len(state.sequences) == len(state.completed)
+
+
+class TestEmptyCellTracking:
+    """Tests for the empty-cell counter and set kept up to date on placement and undo"""
+
+    def test_placement_removes_cell_from_empty_set(self):
+        """Test placing a letter removes the cell from the empty set"""
+        # Arrange
+        state = BoardState(3)
+
+        # Act
+        state.place(1, 1, 'S')
+
+        # Assert
+        assert state.index(1, 1) not in state.empty_cells
+        assert len(state.empty_cells) == 8
+        assert state.filled == 1
+
+    def test_undo_restores_cell_and_sequences(self):
+        """Test undo empties the cell and forgets the sequences it completed"""
+        # Arrange
+        state = BoardState(3)
+        state.place(0, 0, 'S')
+        state.place(0, 1, 'O')
+        keys = state.place(0, 2, 'S')
+
+        # Act
+        move = state.undo()
+
+        # Assert
+        assert move == (0, 2, 'S')
+        assert state.is_empty(0, 2)
+        assert state.index(0, 2) in state.empty_cells
+        assert state.filled == 2
+        assert state.sequences == []
+        assert not state.is_completed(keys[0])
+
+    def test_undo_whole_game_returns_to_empty_board(self):
+        """Test undoing every placement gives back an empty board"""
+        # Arrange
+        rng = random.Random(3)
+        state = BoardState(5)
+        cells = [(row, column) for row in range(5) for column in range(5)]
+        rng.shuffle(cells)
+        for row, column in cells:
+            state.place(row, column, rng.choice('SO'))
+        assert state.is_full() == True
+
+        # Act
+        while state.moves:
+            state.undo()
+
+        # Assert
+        assert state.filled == 0
+        assert state.empty_cells == set(range(25))
+        assert state.completed == set()
+        assert state.sequences == []
+
+    def test_empty_list_matches_empty_set(self):
+        """Test the empty cell list and its slots stay in step with the empty set through placements, undos and copies"""
+        # Arrange
+        rng = random.Random(5)
+        state = BoardState(5)
+
+        # Act
+        while not state.is_full():
+            state.place(*state.position(rng.choice(state.empty_list)), rng.choice('SO'))
+            if rng.random() < 0.3:
+                state.undo()
+            state = state.copy()
+
+            # Assert
+            assert sorted(state.empty_list) == sorted(state.empty_cells)
+            assert all(state.empty_list[state.empty_slots[index]] == index for index in state.empty_list)
+
+
+class TestTripleTable:
+    """Tests for the per-board-size table of valid triples"""
+
+    @pytest.mark.parametrize("board_size", [3, 4, 9])
+    def test_triple_count(self, board_size):
+        """Test the table holds every horizontal, vertical and diagonal triple"""
+        # Arrange
+        n = board_size
+
+        # Act
+        table = triple_table(n)
+
+        # Assert
+        assert len(table.triples) == 2 * n * (n - 2) + 2 * (n - 2) ** 2
+
+    def test_table_is_cached_per_size(self):
+        """Test boards of the same size share one table"""
+        assert BoardState(5).table is BoardState(5).table
+        assert triple_table(5) is not triple_table(6)
+
+    def test_cell_keys_cover_every_triple(self):
+        """Test each cell lists exactly the triples containing it"""
+        # Arrange
+        table = triple_table(4)
+
+        # Assert
+        for cell in range(16):
+            expected = {key for key, triple in table.triples.items() if cell in triple}
+            assert set(table.cell_keys[cell]) == expected
+            assert {key for key, middle, end in table.endpoints[cell]} | \
+                   {key for key, start, end in table.middles[cell]} == expected
+
+    def test_corner_has_three_triples(self):
+        """Test a corner cell is only the endpoint of three triples"""
+        # Arrange
+        table = triple_table(3)
+
+        # Assert
+        assert len(table.endpoints[0]) == 3
+        assert table.middles[0] == ()
+        assert len(table.middles[4]) == 4
@@ -1,8 +1,11 @@
+import time
 import pytest
 from unittest.mock import Mock, patch, MagicMock, call
 from tkinter import Tk, StringVar, IntVar, DISABLED, NORMAL
 import tkinter
-from Game_Logic import Player, ComputerPlayer, SOSGameBase, SimpleSOSGame, GeneralSOSGame
+from Game_Logic import Player, ComputerPlayer, SOSGameBase, SimpleSOSGame, GeneralSOSGame, TIME_LIMITS, \
+    ENDGAME_THRESHOLDS
+from GUI import SOS
 
 
 @pytest.fixture(scope="function")
@@ -49,7 +52,7 @@ class TestAC91_RandomValidMovePlacement:
         red_computer = ComputerPlayer(red_player)
 
         # Act - Computer should make a random move since no SOS is possible
-        move = red_computer.move_selector(board_size, simple_game.cell_matrix)
+        move = red_computer.move_selector(board_size, simple_game.cell_matrix, simple_game.position())
 
         # Assert
         assert move is not None
@@ -67,11 +70,11 @@ class TestAC91_RandomValidMovePlacement:
         blue_computer = ComputerPlayer(blue_player)
 
         # Occupy some cells
-        simple_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        simple_game.cell_matrix[0][1].config(text='O', state=DISABLED)
+        simple_game.state.place(0, 0, 'S')
+        simple_game.state.place(0, 1, 'O')
 
         # Act
-        move = blue_computer.make_random_move(board_size, simple_game.cell_matrix)
+        move = blue_computer.make_random_move(board_size, simple_game.cell_matrix, simple_game.state)
 
         # Assert
         assert move['state'] != DISABLED  # Selected cell should not be disabled initially
@@ -92,8 +95,8 @@ class TestAC91_RandomValidMovePlacement:
         simple_game.turn.set("Current Turn: Red")
 
         # Act
-        move = red_computer.move_selector(board_size, simple_game.cell_matrix)
-        simple_game.cell_update(move)
+        move = red_computer.move_selector(board_size, simple_game.cell_matrix, simple_game.position())
+        simple_game.play_move(move)
 
         # Assert
         assert move['text'] in ['S', 'O']
@@ -112,7 +115,7 @@ class TestAC91_RandomValidMovePlacement:
         # Act - Make multiple moves and collect symbols
         symbols = []
         for _ in range(10):
-            move = blue_computer.make_random_move(board_size, simple_game.cell_matrix)
+            move = blue_computer.make_random_move(board_size, simple_game.cell_matrix, simple_game.state)
             symbols.append(blue_computer.symbol)
 
         # Assert - Should have at least one of each (statistically very likely)
@@ -133,8 +136,8 @@ class TestAC91_RandomValidMovePlacement:
 
         # Act - Make a move
         general_game.turn.set("Current Turn: Blue")
-        move = blue_computer.move_selector(board_size, general_game.cell_matrix)
-        general_game.cell_update(move)
+        move = blue_computer.move_selector(board_size, general_game.cell_matrix, general_game.position())
+        general_game.play_move(move)
 
         # Assert - Score should be tracked (may be 0 if no SOS formed)
         assert blue_computer.score.get() >= initial_score
@@ -161,12 +164,12 @@ class TestAC92_SequenceMovePlacement:
         red_computer = ComputerPlayer(red_player)
 
         # Set up an almost-complete horizontal SOS (S-O-?)
-        simple_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        simple_game.cell_matrix[1][0].config(text='O', state=DISABLED)
+        simple_game.state.place(0, 0, 'S')
+        simple_game.state.place(1, 0, 'O')
         # cell_matrix[2][0] is empty - computer should complete it with 'S'
 
         # Act
-        move = red_computer.make_sos_move(board_size, simple_game.cell_matrix)
+        move = red_computer.make_sos_move(board_size, simple_game.cell_matrix, simple_game.state)
 
         # Assert
         assert move is not False
@@ -184,12 +187,12 @@ class TestAC92_SequenceMovePlacement:
         blue_computer = ComputerPlayer(blue_player)
 
         # Set up an almost-complete vertical SOS (S-O-?)
-        simple_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        simple_game.cell_matrix[0][1].config(text='O', state=DISABLED)
+        simple_game.state.place(0, 0, 'S')
+        simple_game.state.place(0, 1, 'O')
         # cell_matrix[0][2] is empty - computer should complete it with 'S'
 
         # Act
-        move = blue_computer.make_sos_move(board_size, simple_game.cell_matrix)
+        move = blue_computer.make_sos_move(board_size, simple_game.cell_matrix, simple_game.state)
 
         # Assert
         assert move is not False
@@ -207,12 +210,12 @@ class TestAC92_SequenceMovePlacement:
         red_computer = ComputerPlayer(red_player)
 
         # Set up an almost-complete left diagonal SOS (S-O-?)
-        simple_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        simple_game.cell_matrix[1][1].config(text='O', state=DISABLED)
+        simple_game.state.place(0, 0, 'S')
+        simple_game.state.place(1, 1, 'O')
         # cell_matrix[2][2] is empty - computer should complete it with 'S'
 
         # Act
-        move = red_computer.make_sos_move(board_size, simple_game.cell_matrix)
+        move = red_computer.make_sos_move(board_size, simple_game.cell_matrix, simple_game.state)
 
         # Assert
         assert move is not False
@@ -230,12 +233,12 @@ class TestAC92_SequenceMovePlacement:
         blue_computer = ComputerPlayer(blue_player)
 
         # Set up S-?-S pattern horizontally
-        simple_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        simple_game.cell_matrix[2][0].config(text='S', state=DISABLED)
+        simple_game.state.place(0, 0, 'S')
+        simple_game.state.place(2, 0, 'S')
         # cell_matrix[1][0] is empty - computer should complete it with 'O'
 
         # Act
-        move = blue_computer.make_sos_move(board_size, simple_game.cell_matrix)
+        move = blue_computer.make_sos_move(board_size, simple_game.cell_matrix, simple_game.state)
 
         # Assert
         assert move is not False
@@ -255,15 +258,16 @@ class TestAC92_SequenceMovePlacement:
         general_game.red_player = ComputerPlayer(red_player)
 
         # Set up almost-complete SOS
-        general_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        general_game.cell_matrix[1][0].config(text='O', state=DISABLED)
+        general_game.state.place(0, 0, 'S')
+        general_game.state.place(1, 0, 'O')
 
         # Change turn to red
         general_game.turn.set("Current Turn: Red")
 
         # Act
-        move = general_game.red_player.make_sos_move(board_size, general_game.cell_matrix)
-        move.config(text=general_game.red_player.symbol, state=DISABLED)
+        move = general_game.red_player.make_sos_move(board_size, general_game.cell_matrix, general_game.state)
+        general_game.state.place(move.row, move.column, general_game.red_player.symbol)
+        general_game.board.render_cell(move.row, move.column)
 
         # Assert
         assert move['text'] == 'S'
@@ -282,15 +286,15 @@ class TestAC92_SequenceMovePlacement:
         general_game.blue_player = ComputerPlayer(blue_player)
 
         # Set up almost-complete SOS
-        general_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        general_game.cell_matrix[1][0].config(text='O', state=DISABLED)
+        general_game.state.place(0, 0, 'S')
+        general_game.state.place(1, 0, 'O')
 
         initial_score = general_game.blue_player.score.get()
         general_game.turn.set("Current Turn: Blue")
 
         # Act - Manually complete and score without triggering recursive computer moves
-        move = general_game.blue_player.make_sos_move(board_size, general_game.cell_matrix)
-        move.config(text=general_game.blue_player.symbol, state=DISABLED)
+        move = general_game.blue_player.make_sos_move(board_size, general_game.cell_matrix, general_game.state)
+        general_game.state.place(move.row, move.column, general_game.blue_player.symbol)
         points_scored = general_game.check_sos()
         general_game.blue_player.score.set(general_game.blue_player.score.get() + points_scored)
 
@@ -309,11 +313,11 @@ class TestAC92_SequenceMovePlacement:
         red_computer = ComputerPlayer(red_player)
 
         # Set up almost-complete SOS
-        simple_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        simple_game.cell_matrix[1][0].config(text='O', state=DISABLED)
+        simple_game.state.place(0, 0, 'S')
+        simple_game.state.place(1, 0, 'O')
 
         # Act
-        move = red_computer.move_selector(board_size, simple_game.cell_matrix)
+        move = red_computer.move_selector(board_size, simple_game.cell_matrix, simple_game.position())
 
         # Assert - Should select the SOS-completing move, not a random one
         assert move == simple_game.cell_matrix[2][0]
@@ -344,7 +348,7 @@ class TestAC93_NormalTurnPassing:
 
         # Act - Make a move that doesn't score
         move = simple_game.cell_matrix[0][0]
-        simple_game.cell_update(move)
+        simple_game.play_move(move)
 
         # Assert
         assert simple_game.turn.get() == "Current Turn: Blue"
@@ -364,7 +368,7 @@ class TestAC93_NormalTurnPassing:
 
         # Act - Make a move that doesn't score
         move = general_game.cell_matrix[0][0]
-        general_game.cell_update(move)
+        general_game.play_move(move)
 
         # Assert
         assert general_game.turn.get() == "Current Turn: Red"
@@ -383,7 +387,7 @@ class TestAC93_NormalTurnPassing:
 
         # Act - Manually update cell without triggering computer move
         move = simple_game.cell_matrix[1][1]
-        move.config(text=blue_player.symbol, state=DISABLED)
+        simple_game.state.place(move.row, move.column, blue_player.symbol)
         simple_game.turn.set("Current Turn: Red")
 
         # Assert
@@ -404,7 +408,7 @@ class TestAC93_NormalTurnPassing:
         first_turn = simple_game.turn.get()
 
         # Act - Make a non-scoring move
-        simple_game.cell_matrix[0][0].config(text='S', state=DISABLED)
+        simple_game.state.place(0, 0, 'S')
         simple_game.turn.set("Current Turn: Red")
 
         # Assert
@@ -420,13 +424,13 @@ class TestAC93_NormalTurnPassing:
         board = simple_game.new_board()
 
         # Set up a winning SOS for blue
-        simple_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        simple_game.cell_matrix[1][0].config(text='O', state=DISABLED)
+        simple_game.state.place(0, 0, 'S')
+        simple_game.state.place(1, 0, 'O')
         simple_game.turn.set("Current Turn: Blue")
 
         # Act - Complete the SOS (game should end)
         with patch('tkinter.messagebox.showinfo'):
-            simple_game.cell_update(simple_game.cell_matrix[2][0])
+            simple_game.play_move(simple_game.cell_matrix[2][0])
 
         # Assert - Game should be over
         assert simple_game.game_over == True
@@ -455,13 +459,13 @@ class TestAC94_GeneralGameSOSTurnPassing:
         general_game.blue_player = ComputerPlayer(blue_player)
 
         # Set up almost-complete SOS
-        general_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        general_game.cell_matrix[1][0].config(text='O', state=DISABLED)
+        general_game.state.place(0, 0, 'S')
+        general_game.state.place(1, 0, 'O')
         general_game.turn.set("Current Turn: Blue")
 
         # Act - Manually complete SOS without triggering recursive moves
         move = general_game.cell_matrix[2][0]
-        move.config(text='S', state=DISABLED)
+        general_game.state.place(move.row, move.column, 'S')
         points_scored = general_game.check_sos()
 
         # In general game, if points are scored, turn doesn't change
@@ -487,15 +491,15 @@ class TestAC94_GeneralGameSOSTurnPassing:
         general_game.red_player = ComputerPlayer(red_player)
 
         # Set up almost-complete SOS
-        general_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        general_game.cell_matrix[1][0].config(text='O', state=DISABLED)
+        general_game.state.place(0, 0, 'S')
+        general_game.state.place(1, 0, 'O')
         general_game.turn.set("Current Turn: Red")
 
         initial_score = general_game.red_player.score.get()
 
         # Act - Manually complete and score
         move = general_game.cell_matrix[2][0]
-        move.config(text='S', state=DISABLED)
+        general_game.state.place(move.row, move.column, 'S')
         points_scored = general_game.check_sos()
         general_game.red_player.score.set(general_game.red_player.score.get() + points_scored)
 
@@ -514,18 +518,18 @@ class TestAC94_GeneralGameSOSTurnPassing:
 
         # Set up pattern where one move completes two SOS sequences
         # Horizontal: S-O-?
-        general_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        general_game.cell_matrix[1][0].config(text='O', state=DISABLED)
+        general_game.state.place(0, 0, 'S')
+        general_game.state.place(1, 0, 'O')
 
         # Vertical: S-O-? (same ending cell)
-        general_game.cell_matrix[2][0].config(text='S', state=DISABLED)
-        general_game.cell_matrix[2][1].config(text='O', state=DISABLED)
+        general_game.state.place(2, 0, 'S')
+        general_game.state.place(2, 1, 'O')
 
         general_game.turn.set("Current Turn: Blue")
         initial_score = blue_computer.score.get()
 
         # Act - Complete both at cell [2][2]
-        general_game.cell_matrix[2][2].config(text='S')
+        general_game.state.place(2, 2, 'S')
         points = general_game.check_sos()
 
         # Assert - Should score points for the patterns present
@@ -541,13 +545,13 @@ class TestAC94_GeneralGameSOSTurnPassing:
         board = general_game.new_board()
 
         # Set up almost-complete SOS
-        general_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        general_game.cell_matrix[1][0].config(text='O', state=DISABLED)
+        general_game.state.place(0, 0, 'S')
+        general_game.state.place(1, 0, 'O')
         general_game.turn.set("Current Turn: Red")
 
         # Act - Manually complete and check scoring logic
         move = general_game.cell_matrix[2][0]
-        move.config(text='S', state=DISABLED)
+        general_game.state.place(move.row, move.column, 'S')
         points_scored = general_game.check_sos()
 
         # In general game, turn doesn't change if points scored
@@ -570,13 +574,13 @@ class TestAC94_GeneralGameSOSTurnPassing:
         board = simple_game.new_board()
 
         # Set up almost-complete SOS
-        simple_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        simple_game.cell_matrix[1][0].config(text='O', state=DISABLED)
+        simple_game.state.place(0, 0, 'S')
+        simple_game.state.place(1, 0, 'O')
         simple_game.turn.set("Current Turn: Blue")
 
         # Act
         with patch('tkinter.messagebox.showinfo'):
-            simple_game.cell_update(simple_game.cell_matrix[2][0])
+            simple_game.play_move(simple_game.cell_matrix[2][0])
 
         # Assert - Game should be over (turn doesn't matter)
         assert simple_game.game_over == True
@@ -592,13 +596,13 @@ class TestAC94_GeneralGameSOSTurnPassing:
         board = general_game.new_board()
 
         # Set up SOS completion scenario
-        general_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        general_game.cell_matrix[1][0].config(text='O', state=DISABLED)
+        general_game.state.place(0, 0, 'S')
+        general_game.state.place(1, 0, 'O')
         general_game.turn.set("Current Turn: Blue")
 
         # Act - Manually complete SOS and check turn logic
         move = general_game.cell_matrix[2][0]
-        move.config(text='S', state=DISABLED)
+        general_game.state.place(move.row, move.column, 'S')
         points_scored = general_game.check_sos()
 
         # In general game, turn stays if points scored
@@ -609,4 +613,248 @@ class TestAC94_GeneralGameSOSTurnPassing:
             general_game.turn.set("Current Turn: Red")
 
         # Assert - Turn should still be blue's (ready for another move)
-        assert general_game.turn.get() == "Current Turn: Blue"
\ No newline at end of file
+        assert general_game.turn.get() == "Current Turn: Blue"
+
+
+class TestComputerTurnDriver:
+    """
+    Computer moves are driven by a turn loop instead of recursive cell_update calls
+    """
+
+    def test_computer_vs_computer_large_board_runs_iteratively(self, blue_player, red_player):
+        """Test a 9x9 computer-vs-computer general game plays to the end without recursion"""
+        # Arrange
+        board_size = 9
+        game = SOSGameBase(blue_player, red_player, board_size)
+        general_game = GeneralSOSGame(game, blue_player, red_player)
+        board = general_game.new_board()
+        general_game.blue_player = ComputerPlayer(blue_player)
+        general_game.red_player = ComputerPlayer(red_player)
+
+        # Act
+        with patch('tkinter.messagebox.showinfo'):
+            general_game.run_computer_turns()
+
+        # Assert
+        assert general_game.game_over == True
+        assert general_game.filled_cells() == True
+        assert general_game.blue_player.score.get() + general_game.red_player.score.get() == \
+               len(general_game.complete_sos_list)
+
+    def test_start_game_schedules_computer_move(self, blue_player, red_player):
+        """Test the first computer move is scheduled on the event loop rather than played immediately"""
+        # Arrange
+        board_size = 3
+        game = SOSGameBase(blue_player, red_player, board_size)
+        simple_game = SimpleSOSGame(game, blue_player, red_player)
+        board = simple_game.new_board()
+        simple_game.blue_player = ComputerPlayer(blue_player)
+
+        # Act
+        with patch.object(simple_game.board, 'after') as mock_after:
+            simple_game.start_game()
+
+        # Assert
+        mock_after.assert_called_once_with(simple_game.computer_delay, simple_game.computer_turn)
+        assert simple_game.state.filled == 0
+
+    def test_computer_turn_schedules_next_computer_move(self, blue_player, red_player):
+        """Test a computer move schedules the opponent's move when it is also a computer"""
+        # Arrange
+        board_size = 4
+        game = SOSGameBase(blue_player, red_player, board_size)
+        simple_game = SimpleSOSGame(game, blue_player, red_player)
+        board = simple_game.new_board()
+        simple_game.blue_player = ComputerPlayer(blue_player)
+        simple_game.red_player = ComputerPlayer(red_player)
+
+        # Act
+        with patch.object(simple_game.board, 'after') as mock_after:
+            simple_game.computer_turn()
+
+        # Assert
+        assert simple_game.state.filled == 1
+        assert simple_game.turn.get() == "Current Turn: Red"
+        mock_after.assert_called_once_with(simple_game.computer_delay, simple_game.computer_turn)
+
+    def test_human_move_does_not_schedule_for_human_opponent(self, blue_player, red_player):
+        """Test no computer move is scheduled when the next player is human"""
+        # Arrange
+        board_size = 3
+        game = SOSGameBase(blue_player, red_player, board_size)
+        simple_game = SimpleSOSGame(game, blue_player, red_player)
+        board = simple_game.new_board()
+
+        # Act
+        with patch.object(simple_game.board, 'after') as mock_after:
+            simple_game.cell_update(simple_game.cell_matrix[0][0])
+
+        # Assert
+        mock_after.assert_not_called()
+        assert simple_game.turn.get() == "Current Turn: Red"
+
+    def test_click_ignored_during_pending_computer_turn(self, blue_player, red_player):
+        """Test a click while the computer's move is scheduled neither plays for the computer nor scores for it"""
+        # Arrange
+        board_size = 3
+        game = SOSGameBase(blue_player, red_player, board_size)
+        general_game = GeneralSOSGame(game, blue_player, red_player)
+        board = general_game.new_board()
+        general_game.red_player = ComputerPlayer(red_player)
+        general_game.state.place(0, 0, 'S')
+        general_game.state.place(1, 0, 'O')
+        with patch.object(general_game.board, 'after', return_value="job") as mock_after:
+            general_game.cell_update(general_game.cell_matrix[2][2])
+
+        # Act - Click the cell that completes an SOS while the computer is to move
+        general_game.cell_update(general_game.cell_matrix[2][0])
+
+        # Assert
+        mock_after.assert_called_once_with(general_game.computer_delay, general_game.computer_turn)
+        assert general_game.computer_job == "job"
+        assert general_game.state.is_empty(2, 0)
+        assert general_game.red_player.score.get() == 0
+        assert general_game.turn.get() == "Current Turn: Red"
+
+    def test_click_ignored_on_computer_turn(self, blue_player, red_player):
+        """Test a click on the computer's turn is ignored even when no move is scheduled"""
+        # Arrange
+        board_size = 3
+        game = SOSGameBase(blue_player, red_player, board_size)
+        simple_game = SimpleSOSGame(game, blue_player, red_player)
+        board = simple_game.new_board()
+        simple_game.blue_player = ComputerPlayer(blue_player)
+
+        # Act
+        simple_game.cell_update(simple_game.cell_matrix[1][1])
+
+        # Assert
+        assert simple_game.state.filled == 0
+        assert simple_game.turn.get() == "Current Turn: Blue"
+
+
+class TestComputerTimeLimits:
+    """
+    Searching difficulties are bounded by a time limit per move set per difficulty
+    """
+
+    def test_default_time_limit_per_difficulty(self, blue_player):
+        """Test each searching difficulty starts with its own default time limit"""
+        # Arrange
+        computer = ComputerPlayer(blue_player)
+
+        # Assert
+        assert computer.time_limits == TIME_LIMITS
+        assert computer.time_limits is not TIME_LIMITS
+
+    def test_move_selector_applies_time_limit(self, blue_player, red_player):
+        """Test the Hard search runs with the time limit of its difficulty"""
+        # Arrange
+        board_size = 6
+        game = SOSGameBase(blue_player, red_player, board_size)
+        general_game = GeneralSOSGame(game, blue_player, red_player)
+        board = general_game.new_board()
+        computer = ComputerPlayer(blue_player)
+        computer.difficulty = "Hard"
+        computer.time_limits["Hard"] = 0.05
+
+        # Act
+        cell = computer.move_selector(board_size, general_game.cell_matrix, general_game.position())
+
+        # Assert
+        assert computer.search.time_limit == 0.05
+        assert computer.search.depth >= 1
+        assert cell in [cell for row in general_game.cell_matrix for cell in row]
+
+    def test_endgame_threshold_per_difficulty(self, blue_player, red_player):
+        """Test the endgame is solved exactly only once the difficulty's threshold of empty cells is reached"""
+        # Arrange
+        board_size = 4
+        game = SOSGameBase(blue_player, red_player, board_size)
+        general_game = GeneralSOSGame(game, blue_player, red_player)
+        board = general_game.new_board()
+        for row, column, letter in [(0, 0, 'S'), (0, 3, 'O'), (1, 1, 'O'), (1, 2, 'S'), (2, 0, 'O'), (2, 3, 'S'),
+                                    (3, 1, 'S'), (3, 2, 'O'), (0, 1, 'O'), (3, 3, 'O')]:
+            general_game.state.place(row, column, letter)
+        computer = ComputerPlayer(blue_player)
+        computer.difficulty = "Hard"
+
+        # Act
+        computer.endgame_thresholds["Hard"] = 5
+        computer.move_selector(board_size, general_game.cell_matrix, general_game.position())
+        unsolved = computer.endgame.value
+        computer.endgame_thresholds["Hard"] = 6
+        computer.move_selector(board_size, general_game.cell_matrix, general_game.position())
+
+        # Assert
+        assert computer.endgame_thresholds is not ENDGAME_THRESHOLDS
+        assert unsolved is None
+        assert computer.endgame.value is not None
+
+    def test_endgame_deadline_falls_back_to_search(self, blue_player, red_player):
+        """Test an endgame that can't be solved within the time limit is searched instead, still within the limit"""
+        # Arrange
+        board_size = 5
+        game = SOSGameBase(blue_player, red_player, board_size)
+        general_game = GeneralSOSGame(game, blue_player, red_player)
+        board = general_game.new_board()
+        computer = ComputerPlayer(blue_player)
+        computer.difficulty = "Hard"
+        computer.endgame_thresholds["Hard"] = 25
+        computer.time_limits["Hard"] = 0.1
+
+        # Act
+        start = time.perf_counter()
+        cell = computer.move_selector(board_size, general_game.cell_matrix, general_game.position())
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        assert computer.endgame.value is None
+        assert computer.search.depth >= 1
+        assert general_game.state.is_empty(cell.row, cell.column)
+        assert elapsed < 0.5
+
+    def test_simple_difficulty_skips_book_and_endgame(self, blue_player, red_player):
+        """Test the "Simple" difficulty neither looks moves up in the book nor solves the endgame"""
+        # Arrange
+        board_size = 3
+        game = SOSGameBase(blue_player, red_player, board_size)
+        general_game = GeneralSOSGame(game, blue_player, red_player)
+        board = general_game.new_board()
+        computer = ComputerPlayer(blue_player)
+
+        # Act
+        with patch('Computer_Strategy.opening_book') as mock_book:
+            cell = computer.move_selector(board_size, general_game.cell_matrix, general_game.position())
+
+        # Assert
+        mock_book.assert_not_called()
+        assert computer.endgame.value is None
+        assert "Simple" not in ENDGAME_THRESHOLDS
+        assert general_game.state.is_empty(cell.row, cell.column)
+
+    def test_gui_entry_sets_time_limit(self, blue_player):
+        """Test a time limit typed in milliseconds is stored for the computer's difficulty"""
+        # Arrange
+        computer = ComputerPlayer(blue_player)
+        computer.difficulty = "Expert"
+
+        # Act
+        SOS.set_time_limit(None, computer, "500")
+
+        # Assert
+        assert computer.time_limits["Expert"] == 0.5
+        assert computer.time_limits["Hard"] == TIME_LIMITS["Hard"]
+
+    def test_gui_entry_blank_keeps_default(self, blue_player):
+        """Test a blank or invalid entry leaves the default time limit"""
+        # Arrange
+        computer = ComputerPlayer(blue_player)
+        computer.difficulty = "Hard"
+
+        # Act
+        SOS.set_time_limit(None, computer, "")
+        SOS.set_time_limit(None, computer, "fast")
+
+        # Assert
+        assert computer.time_limits["Hard"] == TIME_LIMITS["Hard"]
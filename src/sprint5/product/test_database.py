@@ -0,0 +1,148 @@
+import psycopg2
+import pytest
+import Database as database_module
+from Database import Database, DatabaseUnavailable
+from test_support import FakeConnection
+
+
+class FakePool:
+    """Pool handing out one connection at a time, recording how many it opened"""
+    opened = []
+
+    def __init__(self, minconn, maxconn, **settings):
+        if settings.get("host") == "unreachable":
+            raise psycopg2.OperationalError("could not connect to server")
+        self.idle = []
+        self.closed_all = False
+        FakePool.opened = []
+
+    def getconn(self):
+        if self.idle:
+            return self.idle.pop()
+        connection = FakeConnection()
+        FakePool.opened.append(connection)
+        return connection
+
+    def putconn(self, connection, close=False):
+        if close:
+            connection.closed = 1
+        else:
+            self.idle.append(connection)
+
+    def closeall(self):
+        self.closed_all = True
+
+
+def make_database(host="localhost", enabled=True):
+    """A database using the fake pool"""
+    return Database({"host": host}, enabled=enabled, connection_pool=FakePool)
+
+
+class TestDatabase:
+    """Tests for the lazily opened database connection pool"""
+
+    def test_nothing_opened_until_first_use(self):
+        """Test creating the database connects to nothing"""
+        # Act
+        database = make_database()
+
+        # Assert
+        assert database.pool is None
+
+    def test_connection_reused_between_uses(self):
+        """Test the pool is opened on first use and its connection lent out again"""
+        # Arrange
+        database = make_database()
+
+        # Act
+        with database.connection() as first:
+            pass
+        with database.connection() as second:
+            pass
+
+        # Assert
+        assert database.pool is not None
+        assert first is second
+        assert len(FakePool.opened) == 1
+
+    def test_no_database_mode(self):
+        """Test a disabled database is never connected to and reports recording unavailable"""
+        # Arrange
+        database = make_database(enabled=False)
+
+        # Act and Assert
+        assert not database.available()
+        with pytest.raises(DatabaseUnavailable):
+            with database.connection():
+                pass
+        assert database.pool is None
+
+    def test_unreachable_server_unavailable(self):
+        """Test a server that can't be reached makes the database unavailable instead of crashing"""
+        # Arrange
+        database = make_database("unreachable")
+
+        # Act and Assert
+        assert not database.available()
+        assert isinstance(database.last_error, psycopg2.OperationalError)
+
+    def test_dropped_connection_replaced(self):
+        """Test a connection that dropped while idle is health checked and replaced"""
+        # Arrange
+        database = make_database()
+        with database.connection() as first:
+            pass
+        first.dropped = True
+        database.last_used[id(first)] -= database_module.HEALTH_CHECK_INTERVAL + 1
+
+        # Act
+        with database.connection() as second:
+            pass
+
+        # Assert
+        assert second is not first
+        assert first.closed
+
+    def test_recently_used_connection_not_checked(self):
+        """Test a connection used moments ago is lent out without a health check query"""
+        # Arrange
+        database = make_database()
+        with database.connection():
+            pass
+
+        # Act
+        with database.connection() as connection:
+            pass
+
+        # Assert
+        assert "SELECT 1" not in connection.statements
+
+    def test_connection_lost_during_use_discarded(self):
+        """Test a connection that fails mid-use is closed instead of going back to the pool"""
+        # Arrange
+        database = make_database()
+
+        # Act
+        with pytest.raises(psycopg2.OperationalError):
+            with database.connection() as connection:
+                connection.dropped = True
+                connection.cursor().execute("SELECT 1")
+
+        # Assert
+        assert connection.closed
+        with database.connection() as replacement:
+            assert replacement is not connection
+
+    def test_close_releases_pool(self):
+        """Test closing closes every pooled connection and opens a new pool on the next use"""
+        # Arrange
+        database = make_database()
+        assert database.available()
+        pool = database.pool
+
+        # Act
+        database.close()
+
+        # Assert
+        assert pool.closed_all
+        assert database.pool is None
@@ -0,0 +1,134 @@
+import random
+import time
+from Board_State import S
+from Position import SIMPLE_GAME, GENERAL_GAME
+from Endgame_Solver import EndgameSolver
+from test_support import make_position
+
+
+def random_endgame(board_size, empty, game_type, seed):
+    """Plays random moves until only a number of cells are empty (in a game that is not over)"""
+    rng = random.Random(seed)
+    while True:
+        position = make_position(board_size, {}, game_type)
+        while len(position.state.empty_cells) > empty and not position.is_over():
+            position.play(*rng.choice(position.legal_moves()))
+        if not position.is_over():
+            return position
+
+
+def final_difference(position, player):
+    """Plain minimax reference: final score difference for a player with both sides playing perfectly"""
+    if position.is_over():
+        return position.scores[player] - position.scores[1 - player]
+    results = []
+    for move in position.legal_moves():
+        position.play(*move)
+        results.append(final_difference(position, player))
+        position.undo()
+    return max(results) if position.to_move == player else min(results)
+
+
+def outcome(difference):
+    """Win (1), draw (0) or loss (-1) from a score difference"""
+    return (difference > 0) - (difference < 0)
+
+
+class TestEndgameSolver:
+    """Tests for the exact endgame solver"""
+
+    def test_applies_below_threshold(self):
+        """Test the solver only takes positions with few enough empty cells"""
+        # Arrange
+        solver = EndgameSolver(empty_threshold=3)
+        crowded = random_endgame(3, 4, GENERAL_GAME, 1)
+        sparse = random_endgame(3, 3, GENERAL_GAME, 1)
+
+        # Assert
+        assert solver.applies(crowded) == False
+        assert solver.applies(sparse) == True
+
+    def test_takes_simple_game_win(self):
+        """Test the solver completes the SOS that wins a simple game"""
+        # Arrange
+        position = make_position(3, {(0, 0): 'S', (0, 1): 'O', (1, 0): 'O', (1, 1): 'O', (2, 1): 'S',
+                                     (2, 2): 'O'})
+
+        # Act
+        move = EndgameSolver().best_move(position)
+
+        # Assert
+        assert move == (2, S)
+
+    def test_general_game_matches_minimax(self):
+        """Test the chosen move reaches the best final score difference plain minimax finds"""
+        for seed in range(8):
+            # Arrange
+            position = random_endgame(4, 5, GENERAL_GAME, seed)
+            player = position.to_move
+            best = final_difference(position, player)
+            solver = EndgameSolver()
+
+            # Act
+            position.play(*solver.best_move(position))
+
+            # Assert
+            assert final_difference(position, player) == best
+
+    def test_simple_game_matches_minimax(self):
+        """Test the chosen move keeps the best simple game outcome plain minimax finds"""
+        for seed in range(8):
+            # Arrange
+            position = random_endgame(4, 6, SIMPLE_GAME, seed)
+            player = position.to_move
+            best = outcome(final_difference(position, player))
+            solver = EndgameSolver()
+
+            # Act
+            position.play(*solver.best_move(position))
+
+            # Assert
+            assert outcome(final_difference(position, player)) == best
+            assert solver.value == best
+
+    def test_memo_kept_between_moves_of_a_game(self):
+        """Test boards solved for one move are reused for the next"""
+        # Arrange
+        position = random_endgame(4, 7, GENERAL_GAME, 3)
+        solver = EndgameSolver()
+        position.play(*solver.best_move(position))
+        solved = len(solver.memo)
+
+        # Act
+        position.play(*solver.best_move(position))
+
+        # Assert
+        assert len(solver.memo) == solved
+
+    def test_memo_cleared_for_other_rules(self):
+        """Test switching game type starts a new memo"""
+        # Arrange
+        solver = EndgameSolver()
+        solver.best_move(random_endgame(4, 5, GENERAL_GAME, 4))
+
+        # Act
+        solver.best_move(random_endgame(3, 4, SIMPLE_GAME, 4))
+
+        # Assert
+        assert solver.memo_rules == (3, False)
+
+    def test_gives_up_at_time_limit(self):
+        """Test a board that can't be solved in time gives no move instead of running over"""
+        # Arrange
+        solver = EndgameSolver(empty_threshold=16, time_limit=0.01)
+        position = make_position(4, {}, GENERAL_GAME)
+
+        # Act
+        start = time.perf_counter()
+        move = solver.best_move(position)
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        assert move is None
+        assert solver.value is None
+        assert elapsed < 0.2
@@ -54,13 +54,13 @@ class TestAC71_WinByBlueOrRed:
         for i in range(board_size):
             for j in range(board_size):
                 if not (i == 2 and j == 2):  # Leave last cell empty
-                    general_game.cell_matrix[i][j].config(text='S', state=DISABLED)
+                    general_game.state.place(i, j, 'S')
 
         general_game.turn.set("Current Turn: Blue")
 
         # Act - Blue fills the last cell
         with patch('tkinter.messagebox.showinfo') as mock_info:
-            general_game.cell_matrix[2][2].config(text='O', state=DISABLED)
+            general_game.state.place(2, 2, 'O')
             result = general_game.win_condition()
 
         # Assert
@@ -84,13 +84,13 @@ class TestAC71_WinByBlueOrRed:
         for i in range(board_size):
             for j in range(board_size):
                 if not (i == 1 and j == 1):  # Leave middle cell empty
-                    general_game.cell_matrix[i][j].config(text='O', state=DISABLED)
+                    general_game.state.place(i, j, 'O')
 
         general_game.turn.set("Current Turn: Red")
 
         # Act - Red fills the last cell
         with patch('tkinter.messagebox.showinfo') as mock_info:
-            general_game.cell_matrix[1][1].config(text='S', state=DISABLED)
+            general_game.state.place(1, 1, 'S')
             result = general_game.win_condition()
 
         # Assert
@@ -112,7 +112,7 @@ class TestAC71_WinByBlueOrRed:
         # Fill all cells
         for i in range(board_size):
             for j in range(board_size):
-                general_game.cell_matrix[i][j].config(text='S', state=DISABLED)
+                general_game.state.place(i, j, 'S')
 
         # Act
         with patch('tkinter.messagebox.showinfo'):
@@ -136,7 +136,7 @@ class TestAC71_WinByBlueOrRed:
         # Fill all cells
         for i in range(board_size):
             for j in range(board_size):
-                general_game.cell_matrix[i][j].config(text='O', state=DISABLED)
+                general_game.state.place(i, j, 'O')
 
         general_game.turn.set("Current Turn: Blue")
 
@@ -164,7 +164,7 @@ class TestAC71_WinByBlueOrRed:
         # Fill all cells
         for i in range(board_size):
             for j in range(board_size):
-                general_game.cell_matrix[i][j].config(text='S', state=DISABLED)
+                general_game.state.place(i, j, 'S')
 
         general_game.turn.set("Current Turn: Blue")
 
@@ -205,13 +205,13 @@ class TestAC72_DrawGame:
         for i in range(board_size):
             for j in range(board_size):
                 if not (i == 0 and j == 0):  # Leave one cell empty
-                    general_game.cell_matrix[i][j].config(text='S', state=DISABLED)
+                    general_game.state.place(i, j, 'S')
 
         general_game.turn.set("Current Turn: Blue")
 
         # Act - Fill last cell
         with patch('tkinter.messagebox.showinfo') as mock_info:
-            general_game.cell_matrix[0][0].config(text='O', state=DISABLED)
+            general_game.state.place(0, 0, 'O')
             result = general_game.win_condition()
 
         # Assert
@@ -234,7 +234,7 @@ class TestAC72_DrawGame:
         # Fill all cells
         for i in range(board_size):
             for j in range(board_size):
-                general_game.cell_matrix[i][j].config(text='O', state=DISABLED)
+                general_game.state.place(i, j, 'O')
 
         general_game.turn.set("Current Turn: Red")
 
@@ -262,7 +262,7 @@ class TestAC72_DrawGame:
         # Fill all cells
         for i in range(board_size):
             for j in range(board_size):
-                general_game.cell_matrix[i][j].config(text='S', state=DISABLED)
+                general_game.state.place(i, j, 'S')
 
         # Act
         with patch('tkinter.messagebox.showinfo') as mock_info:
@@ -288,7 +288,7 @@ class TestAC72_DrawGame:
         # Fill all cells
         for i in range(board_size):
             for j in range(board_size):
-                general_game.cell_matrix[i][j].config(text='O', state=DISABLED)
+                general_game.state.place(i, j, 'O')
 
         # Red's turn but equal scores
         general_game.turn.set("Current Turn: Red")
@@ -315,7 +315,7 @@ class TestAC72_DrawGame:
         # Fill all cells
         for i in range(board_size):
             for j in range(board_size):
-                general_game.cell_matrix[i][j].config(text='S', state=DISABLED)
+                general_game.state.place(i, j, 'S')
 
         # Act
         with patch('tkinter.messagebox.showinfo'):
@@ -345,7 +345,7 @@ class TestAC73_ContinuingGame:
         board = general_game.new_board()
 
         # Place one letter
-        general_game.cell_matrix[0][0].config(text='S', state=DISABLED)
+        general_game.state.place(0, 0, 'S')
         general_game.turn.set("Current Turn: Blue")
 
         # Act
@@ -364,9 +364,9 @@ class TestAC73_ContinuingGame:
         board = general_game.new_board()
 
         # Place several letters but not all
-        general_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        general_game.cell_matrix[1][1].config(text='O', state=DISABLED)
-        general_game.cell_matrix[2][2].config(text='S', state=DISABLED)
+        general_game.state.place(0, 0, 'S')
+        general_game.state.place(1, 1, 'O')
+        general_game.state.place(2, 2, 'S')
         general_game.turn.set("Current Turn: Red")
 
         # Act
@@ -388,7 +388,7 @@ class TestAC73_ContinuingGame:
         for i in range(board_size):
             for j in range(board_size):
                 if not (i == 2 and j == 2):  # Leave last cell empty
-                    general_game.cell_matrix[i][j].config(text='S', state=DISABLED)
+                    general_game.state.place(i, j, 'S')
 
         general_game.turn.set("Current Turn: Blue")
 
@@ -410,7 +410,7 @@ class TestAC73_ContinuingGame:
         # Fill half the board
         for i in range(board_size):
             for j in range(board_size // 2):
-                general_game.cell_matrix[i][j].config(text='O', state=DISABLED)
+                general_game.state.place(i, j, 'O')
 
         general_game.turn.set("Current Turn: Red")
 
@@ -430,9 +430,9 @@ class TestAC73_ContinuingGame:
         board = general_game.new_board()
 
         # Create an SOS sequence
-        general_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        general_game.cell_matrix[1][0].config(text='O', state=DISABLED)
-        general_game.cell_matrix[2][0].config(text='S', state=DISABLED)
+        general_game.state.place(0, 0, 'S')
+        general_game.state.place(1, 0, 'O')
+        general_game.state.place(2, 0, 'S')
 
         # Check for SOS
         general_game.check_sos()
@@ -476,8 +476,8 @@ class TestAC73_ContinuingGame:
         general_game.red_player.score.set(15)
 
         # Fill some cells
-        general_game.cell_matrix[0][0].config(text='S', state=DISABLED)
-        general_game.cell_matrix[1][1].config(text='O', state=DISABLED)
+        general_game.state.place(0, 0, 'S')
+        general_game.state.place(1, 1, 'O')
 
         general_game.turn.set("Current Turn: Blue")
 
@@ -499,7 +499,7 @@ class TestAC73_ContinuingGame:
         general_game.turn.set("Current Turn: Blue")
 
         # Act - Make a non-scoring move
-        general_game.cell_matrix[0][0].config(text='S', state=DISABLED)
+        general_game.state.place(0, 0, 'S')
         points = general_game.check_sos()
 
         # If no points scored, turn should change
@@ -532,7 +532,7 @@ class TestAC73_ContinuingGame:
         ]
 
         for i, j, letter in moves:
-            general_game.cell_matrix[i][j].config(text=letter, state=DISABLED)
+            general_game.state.place(i, j, letter)
             # Game should continue
             assert general_game.win_condition() == False
 
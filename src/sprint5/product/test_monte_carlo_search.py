@@ -0,0 +1,159 @@
+import random
+from Board_State import S, O, triple_table
+from Threat_Index import completes_sos
+from Position import BLUE, GENERAL_GAME
+from Monte_Carlo_Search import MonteCarloSearch, RANDOM_ROLLOUT, NO_GIVEAWAY_ROLLOUT
+from Simulator import GreedyStrategy
+from test_support import make_position
+
+
+class TestMonteCarloSearch:
+    """Tests for the Monte Carlo tree search used by the "Expert" difficulty"""
+
+    def test_takes_winning_sos(self):
+        """Test the search completes an SOS that wins a simple game"""
+        # Arrange
+        position = make_position(3, {(0, 0): 'S', (0, 1): 'O'})
+        search = MonteCarloSearch(max_playouts=200, seed=1)
+
+        # Act
+        move = search.best_move(position)
+
+        # Assert
+        assert move == (2, S)
+
+    def test_avoids_giving_opponent_a_win(self):
+        """Test the search does not leave an SOS for the opponent in a simple game"""
+        # Arrange
+        position = make_position(4, {(0, 0): 'S', (3, 3): 'S'})
+        search = MonteCarloSearch(max_playouts=3000, seed=2)
+
+        # Act
+        position.play(*search.best_move(position))
+
+        # Assert - the opponent has no immediate SOS
+        table = triple_table(4)
+        assert not any(completes_sos(position.state, i, c, table) for i, c in position.legal_moves())
+
+    def test_random_rollouts_return_legal_move(self):
+        """Test the plain random rollout policy also gives a legal move"""
+        # Arrange
+        position = make_position(5, {(2, 2): 'O'}, GENERAL_GAME)
+        search = MonteCarloSearch(rollout=RANDOM_ROLLOUT, max_playouts=300, seed=3)
+
+        # Act
+        index, code = search.best_move(position)
+
+        # Assert
+        assert index in position.state.empty_cells
+        assert code in (S, O)
+
+    def test_search_does_not_change_position(self):
+        """Test the caller's position is left untouched by the search"""
+        # Arrange
+        position = make_position(4, {(0, 0): 'S', (1, 1): 'O'}, GENERAL_GAME)
+        cells = list(position.state.cells)
+        hash_before = position.hash
+
+        # Act
+        MonteCarloSearch(max_playouts=500, seed=4).best_move(position)
+
+        # Assert
+        assert position.state.cells == cells
+        assert position.history == []
+        assert position.hash == hash_before
+
+    def test_tree_reused_after_both_players_move(self):
+        """Test the subtree under the moves actually played is kept for the next search"""
+        # Arrange
+        position = make_position(4, {}, GENERAL_GAME)
+        search = MonteCarloSearch(max_playouts=2000, seed=5)
+        move = search.best_move(position)
+        position.play(*move)
+        reply = max(search.root.children[move].children.values(), key=lambda child: child.visits).move
+
+        # Act
+        position.play(*reply)
+        search.best_move(position)
+
+        # Assert
+        assert search.reused_visits > 0
+
+    def test_tree_discarded_for_another_game(self):
+        """Test a position that is not in the kept tree starts a new one"""
+        # Arrange
+        search = MonteCarloSearch(max_playouts=300, seed=6)
+        search.best_move(make_position(4, {(0, 0): 'S'}, GENERAL_GAME))
+
+        # Act
+        search.best_move(make_position(4, {(3, 3): 'O'}, GENERAL_GAME))
+
+        # Assert
+        assert search.reused_visits == 0
+        assert search.root.visits == 300
+
+    def test_time_budget_and_playout_rate(self):
+        """Test the search stops at its time budget and reports playouts per second"""
+        # Arrange
+        position = make_position(9, {}, GENERAL_GAME)
+        search = MonteCarloSearch(time_limit=0.1, rollout=NO_GIVEAWAY_ROLLOUT)
+
+        # Act
+        search.best_move(position)
+
+        # Assert
+        assert search.elapsed < 0.5
+        assert search.playouts >= 1
+        assert search.playouts_per_second() > 0
+
+    def test_beats_random_player(self):
+        """Test the search wins most general games on a small board against random moves"""
+        rng = random.Random(7)
+        wins = 0
+        for game in range(6):
+            # Arrange
+            position = make_position(4, {}, GENERAL_GAME)
+            search = MonteCarloSearch(max_playouts=300, seed=game)
+
+            # Act
+            while not position.is_over():
+                if position.to_move == BLUE:
+                    position.play(*search.best_move(position))
+                else:
+                    position.play(*rng.choice(position.legal_moves()))
+            wins += position.winner() == BLUE
+
+        # Assert
+        assert wins >= 4
+
+    def test_takes_sos_in_general_game(self):
+        """Test the search scores when it can in a general game instead of leaving the SOS to the opponent"""
+        # Arrange
+        position = make_position(5, {(0, 0): 'S', (0, 1): 'O', (3, 3): 'S'}, GENERAL_GAME)
+        search = MonteCarloSearch(max_playouts=500, seed=8)
+
+        # Act
+        move = search.best_move(position)
+
+        # Assert
+        assert move == (2, S)
+
+    def test_beats_greedy_player(self):
+        """Test the search wins more general games than the "Simple" computer's greedy play, with either color"""
+        wins = losses = 0
+        for game in range(6):
+            # Arrange
+            position = make_position(5, {}, GENERAL_GAME)
+            search = MonteCarloSearch(max_playouts=300, seed=game)
+            greedy = GreedyStrategy(random.Random(game))
+            searcher = game % 2
+
+            # Act
+            while not position.is_over():
+                player = search if position.to_move == searcher else greedy
+                position.play(*player.best_move(position))
+            wins += position.winner() == searcher
+            losses += position.winner() == 1 - searcher
+
+        # Assert
+        assert wins > losses
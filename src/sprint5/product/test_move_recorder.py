@@ -0,0 +1,360 @@
+import threading
+import time
+import pytest
+import Move_Recorder as move_recorder_module
+from Move_Recorder import MoveRecorder, UPSERT_GAMES, WRITE_ATTEMPTS
+from test_support import FakeConnection, FakeDatabase
+
+
+def record_moves(recorder, count, board_size=9):
+    """Records count moves of a general game, starting the game if none is being recorded"""
+    if recorder.game_id is None:
+        recorder.start_game(board_size, "General Game", "Human", "Computer (Hard)")
+    for move in range(count):
+        recorder.record("Blue" if move % 2 == 0 else "Red", *divmod(move, board_size), "S")
+
+
+class TestMoveRecorder:
+    """Tests for buffered move recording"""
+
+    def test_whole_game_is_one_commit(self):
+        """Test a full 9x9 game is written with one statement for its row, one for its moves and one commit"""
+        # Arrange
+        connection = FakeConnection()
+        recorder = MoveRecorder(FakeDatabase(connection))
+
+        # Act
+        record_moves(recorder, 81)
+        assert connection.statements == []
+        recorder.finish_game("Blue", 40, 30)
+        recorder.wait()
+
+        # Assert - the game row and its 81 moves
+        assert len(connection.statements) == 2
+        assert connection.commits == 1
+        assert len(connection.parameters) == 82
+        assert connection.parameters[0][6:] == ("Blue", 40, 30)
+
+    def test_values_are_parameters(self):
+        """Test games and moves are passed as parameters rather than formatted into the SQL"""
+        # Arrange
+        connection = FakeConnection()
+        recorder = MoveRecorder(FakeDatabase(connection))
+
+        # Act
+        game_id = recorder.start_game(3, "Simple Game'); DROP TABLE \"Move\"; --", "Human", "Human")
+        recorder.record("Blue", 0, 0, "S")
+        recorder.wait()
+
+        # Assert
+        assert connection.parameters[0][2:4] == (3, "Simple Game'); DROP TABLE \"Move\"; --")
+        assert connection.parameters[1][:2] == (game_id, 0)
+        assert connection.parameters[1][3:] == ("Blue", 0, 0, "S")
+        assert UPSERT_GAMES.split("%s")[0].encode() in connection.statements[0]
+
+    def test_flushes_at_size_threshold(self):
+        """Test a batch is written as soon as it reaches the flush size"""
+        # Arrange
+        connection = FakeConnection()
+        recorder = MoveRecorder(FakeDatabase(connection), flush_size=10)
+
+        # Act
+        record_moves(recorder, 25)
+        recorder.jobs.join()
+
+        # Assert
+        assert connection.commits == 2
+        assert len(recorder.pending) == 5
+
+    def test_flushes_old_moves(self):
+        """Test moves waiting longer than the flush interval are written with the next move"""
+        # Arrange
+        connection = FakeConnection()
+        recorder = MoveRecorder(FakeDatabase(connection), flush_interval=0)
+
+        # Act
+        record_moves(recorder, 3)
+        recorder.jobs.join()
+
+        # Assert
+        assert connection.commits == 3
+        assert recorder.pending == []
+
+    def test_idle_game_flushed_on_time(self):
+        """Test moves of a game that stopped recording are written once they are older than the flush interval"""
+        # Arrange
+        connection = FakeConnection()
+        recorder = MoveRecorder(FakeDatabase(connection), flush_interval=0.2)
+
+        # Act
+        record_moves(recorder, 3)
+        written_at_once = connection.commits
+        deadline = time.monotonic() + 5
+        while recorder.metrics()["moves_written"] < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # Assert
+        assert written_at_once == 0
+        assert connection.commits == 1
+        assert recorder.pending == []
+        assert recorder.metrics()["moves_written"] == 3
+
+    def test_failed_write_keeps_moves(self):
+        """Test moves of a failed write are kept and written when the writer is next waited on"""
+        # Arrange
+        connection = FakeConnection()
+        recorder = MoveRecorder(FakeDatabase(connection))
+        record_moves(recorder, 5)
+        connection.dropped = True
+
+        # Act
+        recorder.wait()
+        connection.dropped = False
+        recorder.wait()
+
+        # Assert
+        assert connection.rollbacks == 1
+        assert connection.commits == 1
+        # The game row of the failed statement, then the game row and its 5 moves again
+        assert len(connection.parameters) == 1 + 6
+        assert recorder.metrics()["errors"] == 1
+        assert recorder.metrics()["moves_written"] == 5
+
+    def test_failed_batch_retried_on_its_own_after_delay(self, monkeypatch):
+        """Test a failed batch is not merged into newer batches and is retried once its delay has passed"""
+        # Arrange
+        monkeypatch.setattr(move_recorder_module, "RETRY_DELAY", 0.2)
+        connection = FakeConnection()
+        recorder = MoveRecorder(FakeDatabase(connection))
+        record_moves(recorder, 5)
+        connection.dropped = True
+        recorder.flush()
+        recorder.jobs.join()
+        connection.dropped = False
+
+        # Act
+        record_moves(recorder, 1)
+        recorder.flush()
+        recorder.jobs.join()
+        written_before_retry = recorder.metrics()["moves_written"]
+        deadline = time.monotonic() + 5
+        while recorder.metrics()["moves_written"] < 6 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # Assert
+        assert written_before_retry == 1
+        assert recorder.metrics()["moves_written"] == 6
+        assert recorder.metrics()["retrying_batches"] == 0
+
+    def test_bad_batch_dropped_after_last_attempt(self, caplog):
+        """Test a batch that keeps failing is dropped and logged, and later batches are written"""
+        # Arrange
+        connection = FakeConnection()
+        recorder = MoveRecorder(FakeDatabase(connection))
+        record_moves(recorder, 5)
+        connection.dropped = True
+
+        # Act
+        for _ in range(WRITE_ATTEMPTS):
+            recorder.wait()
+        connection.dropped = False
+        record_moves(recorder, 2)
+        recorder.wait()
+
+        # Assert
+        metrics = recorder.metrics()
+        assert metrics["errors"] == WRITE_ATTEMPTS
+        assert metrics["dropped_batches"] == 1
+        assert metrics["dropped_moves"] == 5
+        assert metrics["retrying_batches"] == 0
+        assert metrics["moves_written"] == 2
+        assert "Dropped a batch" in caplog.text
+
+    def test_empty_flush_sends_nothing(self):
+        """Test flushing with nothing buffered makes no round trip"""
+        # Arrange
+        connection = FakeConnection()
+
+        recorder = MoveRecorder(FakeDatabase(connection))
+
+        # Act
+        recorder.flush()
+
+        # Assert
+        assert connection.statements == []
+        assert recorder.thread is None
+
+    def test_writes_on_background_thread(self):
+        """Test handing over a batch returns at once while a slow server is still writing it"""
+        # Arrange
+        connection = FakeConnection()
+        connection.released.clear()
+        recorder = MoveRecorder(FakeDatabase(connection))
+        record_moves(recorder, 10)
+
+        # Act
+        start = time.perf_counter()
+        recorder.flush()
+        handed_over = time.perf_counter() - start
+        connection.released.set()
+        recorder.wait()
+
+        # Assert
+        assert handed_over < 0.5
+        assert connection.commits == 1
+        assert connection.threads == {recorder.thread}
+        assert threading.current_thread() not in connection.threads
+
+    def test_full_queue_holds_moves_back(self):
+        """Test batches stay buffered instead of blocking when the writer is behind, then go out together"""
+        # Arrange - the writer is stuck on the first batch and the queue holds one more
+        connection = FakeConnection()
+        connection.released.clear()
+        recorder = MoveRecorder(FakeDatabase(connection), flush_size=5, queue_size=1)
+        record_moves(recorder, 5)
+        while recorder.jobs.qsize():
+            time.sleep(0.01)
+
+        # Act
+        record_moves(recorder, 15)
+        metrics = recorder.metrics()
+        connection.released.set()
+        recorder.wait()
+
+        # Assert
+        # Every move from the 15th tried to hand the growing batch over
+        assert metrics["deferred_flushes"] == 6
+        assert metrics["pending_moves"] == 10
+        assert metrics["max_queue_depth"] == 1
+        assert connection.commits == 3
+        assert recorder.metrics()["moves_written"] == 20
+
+    def test_jobs_run_in_order_with_batches(self):
+        """Test a job submitted after a batch runs after the batch is written"""
+        # Arrange
+        connection = FakeConnection()
+        recorder = MoveRecorder(FakeDatabase(connection))
+        record_moves(recorder, 3)
+        seen = []
+
+        # Act
+        recorder.flush()
+        recorder.submit(lambda: seen.append(connection.commits))
+        recorder.wait()
+
+        # Assert
+        assert seen == [1]
+
+    def test_close_writes_everything_and_stops_thread(self):
+        """Test closing writes the buffered moves and stops the writer thread"""
+        # Arrange
+        connection = FakeConnection()
+        recorder = MoveRecorder(FakeDatabase(connection))
+        record_moves(recorder, 3)
+        recorder.flush()
+        thread = recorder.thread
+        record_moves(recorder, 4)
+
+        # Act
+        recorder.close()
+
+        # Assert
+        assert not thread.is_alive()
+        assert recorder.metrics()["moves_written"] == 7
+        assert recorder.metrics()["max_write_seconds"] >= recorder.metrics()["mean_write_seconds"] > 0
+
+    def test_close_gives_up_on_stuck_writer(self, caplog):
+        """Test closing returns after its timeout when the writer is stuck on an unreachable database"""
+        # Arrange - the writer is stuck on the first batch, the queue holds the second and 3 moves are buffered
+        connection = FakeConnection()
+        connection.released.clear()
+        recorder = MoveRecorder(FakeDatabase(connection), flush_size=5, queue_size=1)
+        record_moves(recorder, 5)
+        while recorder.jobs.qsize():
+            time.sleep(0.01)
+        record_moves(recorder, 8)
+
+        # Act
+        start = time.perf_counter()
+        recorder.close(timeout=0.2)
+        closed = time.perf_counter() - start
+        connection.released.set()
+
+        # Assert
+        assert closed < 1.0
+        assert recorder.metrics()["pending_moves"] == 3
+        assert "3 moves" in caplog.text
+
+    def test_new_game_hands_over_previous_game(self):
+        """Test starting a game hands the moves left of the previous one to the writer"""
+        # Arrange
+        connection = FakeConnection()
+        recorder = MoveRecorder(FakeDatabase(connection))
+        record_moves(recorder, 3)
+
+        # Act
+        recorder.start_game(9, "General Game", "Human", "Human")
+        recorder.jobs.join()
+
+        # Assert
+        assert recorder.metrics()["moves_written"] == 3
+        assert recorder.metrics()["pending_moves"] == 0
+
+    def test_games_kept_apart(self):
+        """Test recorders sharing a database give every game its own id and numbers each game's moves from 0"""
+        # Arrange
+        connection = FakeConnection()
+        first, second = MoveRecorder(FakeDatabase(connection)), MoveRecorder(FakeDatabase(connection))
+
+        # Act
+        record_moves(first, 3)
+        record_moves(second, 2)
+        first.finish_game("Tie", 0, 0)
+        record_moves(first, 2)
+        for recorder in (first, second):
+            recorder.wait()
+
+        # Assert
+        moves = [parameters for parameters in connection.parameters if len(parameters) == 7]
+        games = {game_id for game_id, *rest in moves}
+        assert len(games) == 3
+        for game_id in games:
+            assert [ply for move_game, ply, *rest in moves if move_game == game_id] == \
+                list(range(len([move for move in moves if move[0] == game_id])))
+
+    def test_result_written_after_moves(self):
+        """Test a game whose moves were already written gets its result written when it ends"""
+        # Arrange
+        connection = FakeConnection()
+        recorder = MoveRecorder(FakeDatabase(connection), flush_size=5)
+        record_moves(recorder, 5)
+        recorder.wait()
+
+        # Act
+        recorder.finish_game("Red", 1, 2)
+        recorder.wait()
+
+        # Assert - the same game row, first without and then with its result
+        games = [parameters for parameters in connection.parameters if len(parameters) == 9]
+        assert [game[0] for game in games] == [games[0][0]] * 2
+        assert games[0][6:] == (None, None, None)
+        assert games[1][6:] == ("Red", 1, 2)
+
+    def test_tables_created_by_first_batch(self):
+        """Test the first batch makes sure the tables exist and later batches skip it"""
+        # Arrange
+        connection = FakeConnection()
+        recorder = MoveRecorder(FakeDatabase(connection), flush_size=5)
+
+        # Act
+        record_moves(recorder, 10)
+        recorder.wait()
+
+        # Assert
+        assert b'CREATE TABLE IF NOT EXISTS public."Move"' in connection.statements[0]
+        assert b"CREATE TABLE" not in connection.statements[1]
+
+    def test_moves_need_a_game(self):
+        """Test recording a move before starting a game is an error"""
+        with pytest.raises(ValueError):
+            MoveRecorder(FakeDatabase(FakeConnection())).record("Blue", 0, 0, "S")
@@ -0,0 +1,81 @@
+import os
+import pytest
+from Position import SIMPLE_GAME, GENERAL_GAME, position_from_bytes
+from Endgame_Solver import EndgameSolver
+from Opening_Book import OpeningBook, build_book, write_book, opening_book, book_path, DEFAULT_BOOKS, HEADER
+from Symmetry import symmetries
+from test_support import make_position
+
+
+def move_value(position, move):
+    """Exact value of a move for the player to move"""
+    solver = EndgameSolver(empty_threshold=position.state.board_size ** 2)
+    state = position_from_bytes(position.to_bytes(), "bitboard").state
+    return solver.move_value(state, move[0], move[1], position.general)
+
+
+@pytest.fixture(scope="module")
+def general_book(tmp_path_factory):
+    """A 3x3 general game book written to a temporary file"""
+    path = tmp_path_factory.mktemp("books") / "general.book"
+    write_book(path, 3, GENERAL_GAME, build_book(3, GENERAL_GAME, 3))
+    book = OpeningBook(path)
+    yield book
+    book.close()
+
+
+class TestOpeningBook:
+    """Tests for building and looking up opening books"""
+
+    def test_symmetric_positions_stored_once(self):
+        """Test the book holds one entry per symmetry class (three first moves per letter on 3x3)"""
+        # Act
+        book = build_book(3, SIMPLE_GAME, 1)
+
+        # Assert - the empty board plus corner, edge and centre for each letter
+        assert len(book) == 7
+
+    def test_lookup_in_every_orientation(self, general_book):
+        """Test a position and its rotations and reflections all get an optimal book move"""
+        # Arrange
+        letters = {(0, 0): 'S', (0, 1): 'O', (2, 1): 'S'}
+        for permutation in symmetries(3):
+            position = make_position(3, {divmod(permutation.index(row * 3 + column), 3): letter
+                                         for (row, column), letter in letters.items()}, GENERAL_GAME)
+
+            # Act
+            move = general_book.best_move(position)
+
+            # Assert
+            best = max(move_value(position, other) for other in position.legal_moves())
+            assert move is not None
+            assert move_value(position, move) == best
+
+    def test_positions_beyond_book_depth_missing(self, general_book):
+        """Test positions with more filled cells than the book covers are not found"""
+        # Arrange
+        position = make_position(3, {(0, 0): 'S', (0, 2): 'S', (2, 0): 'O', (2, 2): 'O'}, GENERAL_GAME)
+
+        # Assert
+        assert general_book.best_move(position) is None
+
+    def test_other_rules_not_answered(self, general_book):
+        """Test a book only answers for its own board size and game type"""
+        assert general_book.best_move(make_position(3, {}, SIMPLE_GAME)) is None
+        assert general_book.best_move(make_position(4, {}, GENERAL_GAME)) is None
+
+    def test_file_is_compact(self, general_book):
+        """Test each position takes a 4-byte key and a 1-byte move"""
+        assert len(general_book.data) == HEADER.size + general_book.count * 5
+
+    @pytest.mark.parametrize("board_size, game_type, max_filled", DEFAULT_BOOKS)
+    def test_shipped_books_open(self, board_size, game_type, max_filled):
+        """Test the books shipped with the game are found and answer the opening move"""
+        # Arrange
+        assert os.path.exists(book_path(board_size, game_type))
+
+        # Act
+        book = opening_book(board_size, game_type)
+
+        # Assert
+        assert book.best_move(make_position(board_size, {}, game_type)) is not None
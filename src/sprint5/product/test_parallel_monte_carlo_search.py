@@ -0,0 +1,102 @@
+import pytest
+from Board_State import S
+from Bit_Board_State import BitBoardState
+from Position import RED, GENERAL_GAME, position_from_bytes
+from Monte_Carlo_Search import MonteCarloSearch
+from Parallel_Monte_Carlo_Search import ParallelMonteCarloSearch, make_monte_carlo_search, search_root, worker_pool, \
+    shutdown_pools
+from test_support import make_position
+
+
+class TestPositionBytes:
+    """Tests for packing positions into byte strings for worker processes"""
+
+    def test_round_trip(self):
+        """Test a packed position unpacks to the same board, player, scores and hash"""
+        # Arrange
+        position = make_position(5, {(0, 0): 'S', (0, 1): 'O', (0, 2): 'S', (4, 4): 'O'}, GENERAL_GAME, RED, (1, 0))
+
+        # Act
+        copy = position_from_bytes(position.to_bytes())
+
+        # Assert
+        assert copy.state.cells == position.state.cells
+        assert copy.state.completed == position.state.completed
+        assert copy.to_move == RED
+        assert copy.scores == [1, 0]
+        assert copy.general == True
+        assert copy.hash == position.hash
+
+    def test_one_byte_per_cell(self):
+        """Test the packed size is a small header plus one byte per cell"""
+        # Arrange
+        small = make_position(3, {}).to_bytes()
+        large = make_position(9, {}).to_bytes()
+
+        # Assert
+        assert len(large) - len(small) == 81 - 9
+
+    def test_unpack_to_bitboard(self):
+        """Test a packed position can be rebuilt on the bitboard backend"""
+        # Arrange
+        position = make_position(4, {(1, 1): 'S', (2, 2): 'O'})
+
+        # Act
+        copy = position_from_bytes(position.to_bytes(), "bitboard")
+
+        # Assert
+        assert isinstance(copy.state, BitBoardState)
+        assert copy.state.letter(1, 1) == 'S'
+        assert copy.state.letter(2, 2) == 'O'
+
+
+class TestParallelMonteCarloSearch:
+    """Tests for the root-parallel tree search"""
+
+    def test_worker_task_returns_root_statistics(self):
+        """Test the worker task reports every root move it searched with its visits"""
+        # Arrange
+        data = make_position(3, {(0, 0): 'S', (0, 1): 'O'}).to_bytes()
+
+        # Act
+        children, playouts = search_root(data, 10, 100, 1.4, "no giveaway", 1)
+
+        # Assert
+        assert playouts == 100
+        assert sum(visits for visits, reward in children.values()) == 100
+        assert max(children, key=lambda move: children[move][0]) == (2, S)
+
+    def test_workers_merge_at_root(self):
+        """Test the workers' root visits are added together and the winning SOS is chosen"""
+        # Arrange
+        position = make_position(3, {(0, 0): 'S', (0, 1): 'O'})
+        search = ParallelMonteCarloSearch(workers=2, time_limit=10, max_playouts=100, seed=1)
+
+        # Act
+        move = search.best_move(position)
+
+        # Assert
+        assert move == (2, S)
+        assert search.playouts == 200
+        assert sum(visits for visits, reward in search.root_stats.values()) == 200
+        assert search.playouts_per_second() > 0
+
+    def test_single_worker_searches_in_process(self):
+        """Test one worker gives the plain in-process search"""
+        assert isinstance(make_monte_carlo_search(1), MonteCarloSearch)
+        assert isinstance(make_monte_carlo_search(4), ParallelMonteCarloSearch)
+
+    def test_pools_shut_down(self):
+        """Test shutting down stops every pool started, and the next search starts a new one"""
+        # Arrange
+        pool = worker_pool(2)
+
+        # Act
+        shutdown_pools()
+        new_pool = worker_pool(2)
+        shutdown_pools()
+
+        # Assert
+        assert new_pool is not pool
+        with pytest.raises(RuntimeError):
+            pool.submit(print)
@@ -0,0 +1,371 @@
+import psycopg2
+import pytest
+from tkinter import Tk, DISABLED, NORMAL
+from Game_Logic import Player, SOSGameBase, GeneralSOSGame
+from Replay import MoveStream, ReplayPlayer, GAME_MOVES_FROM
+from test_support import FakeConnection, FakeDatabase
+
+
+@pytest.fixture(scope="function")
+def tk_root():
+    """Create a Tkinter root window for tests that need it"""
+    root = Tk()
+    yield root
+    try:
+        root.destroy()
+    except:
+        pass
+
+
+class FakeBoard:
+    """Board whose scheduled callbacks are kept to be run by the test"""
+
+    def __init__(self):
+        self.scheduled = {}
+        self.delays = []
+        self.next_job = 0
+
+    def after(self, delay, callback):
+        self.next_job += 1
+        self.scheduled[self.next_job] = callback
+        self.delays.append(delay)
+        return self.next_job
+
+    def after_cancel(self, job):
+        del self.scheduled[job]
+
+    def run_next(self):
+        job = min(self.scheduled)
+        self.scheduled.pop(job)()
+
+
+class FakePlayer:
+    def __init__(self):
+        self.symbol = 'S'
+
+
+class FakeGame:
+    """Game recording the moves played on it and taken back"""
+
+    def __init__(self, board_size=3):
+        self.board = FakeBoard()
+        self.blue_player = FakePlayer()
+        self.red_player = FakePlayer()
+        self.cell_matrix = [[(row, column) for column in range(board_size)] for row in range(board_size)]
+        self.played = []
+        self.undone = 0
+        self.replaying = False
+
+    def play_move(self, cell):
+        player = self.blue_player if len(self.played) % 2 == 0 else self.red_player
+        self.played.append(cell + (player.symbol,))
+
+    def undo_move(self):
+        self.played.pop()
+        self.undone += 1
+
+
+def recorded_moves(count):
+    """Moves of a recorded game as (ply, player, row, column, symbol) rows"""
+    return [(ply, "Blue" if ply % 2 == 0 else "Red", ply // 3, ply % 3, "SO"[ply % 2]) for ply in range(count)]
+
+
+def make_replay(moves=9, chunk_size=4, speed=4.0):
+    """A replay of a recorded game on a fake board"""
+    database = FakeDatabase(FakeConnection(recorded_moves(moves)))
+    game = FakeGame()
+    replay = ReplayPlayer(game, database, "game-id", speed, chunk_size)
+    return replay, database, game
+
+
+class TestMoveStream:
+    """Tests for streaming moves from a server-side cursor"""
+
+    def test_moves_fetched_in_chunks(self):
+        """Test moves are read a chunk at a time from a named cursor, in ply order"""
+        # Arrange
+        database = FakeDatabase(FakeConnection(recorded_moves(9)))
+        stream = MoveStream(database, "game-id", chunk_size=4)
+        cursor = database.fake.cursors[0]
+
+        # Act
+        chunks = [stream.next_chunk() for _ in range(3)]
+
+        # Assert
+        assert cursor.name is not None
+        assert database.fake.statements == [GAME_MOVES_FROM]
+        assert database.fake.parameters == [("game-id", 0)]
+        assert cursor.fetches == [4, 4, 4]
+        assert [len(chunk) for chunk in chunks] == [4, 4, 1]
+        assert [move[0] for chunk in chunks for move in chunk] == list(range(9))
+
+    def test_close_returns_connection(self):
+        """Test closing the stream closes the cursor, rolls back and gives the connection back"""
+        # Arrange
+        database = FakeDatabase(FakeConnection(recorded_moves(9)))
+        stream = MoveStream(database, "game-id")
+
+        # Act
+        stream.close()
+        stream.close()
+
+        # Assert
+        assert database.fake.cursors[0].closed
+        assert database.fake.rollbacks == 1
+        assert database.lent == database.returned == 1
+
+    def test_failed_query_returns_connection(self):
+        """Test the cursor and connection are released when the query can't be run"""
+        # Arrange
+        database = FakeDatabase(FakeConnection(recorded_moves(9)))
+        database.fake.dropped = True
+
+        # Act
+        with pytest.raises(psycopg2.OperationalError):
+            MoveStream(database, "game-id")
+
+        # Assert
+        assert database.fake.cursors[0].closed
+        assert database.lent == database.returned == 1
+
+
+class TestReplayPlayer:
+    """Tests for paced, steppable replays"""
+
+    def test_moves_paced_by_speed(self):
+        """Test one move is played per scheduled callback, at the speed set"""
+        # Arrange
+        replay, database, game = make_replay(speed=4.0)
+
+        # Act
+        replay.start()
+        before = len(game.played)
+        game.board.run_next()
+
+        # Assert
+        assert before == 0
+        assert game.played == [(0, 0, 'S')]
+        assert game.board.delays == [250, 250]
+
+    def test_whole_game_replayed_then_stream_closed(self):
+        """Test every move is played with its recorded symbol and the connection is returned at the end"""
+        # Arrange
+        replay, database, game = make_replay()
+        replay.start()
+
+        # Act
+        while game.board.scheduled:
+            game.board.run_next()
+
+        # Assert
+        assert game.played == [(row, column, symbol) for _, _, row, column, symbol in recorded_moves(9)]
+        assert replay.finished
+        assert database.fake.cursors[0].fetches == [4, 4, 4]
+        assert database.lent == database.returned == 1
+
+    def test_clicks_ignored_until_stopped(self):
+        """Test the game is marked as replaying from the start of the replay until it is stopped"""
+        # Arrange
+        replay, database, game = make_replay()
+
+        # Act
+        replay.start()
+        replaying = game.replaying
+        replay.stop()
+
+        # Assert
+        assert replaying
+        assert not game.replaying
+
+    def test_pause_returns_connection_and_resume_reads_on(self):
+        """Test pausing gives the connection back and resuming reads on from the moves already read"""
+        # Arrange
+        replay, database, game = make_replay()
+        replay.start()
+        for _ in range(5):
+            game.board.run_next()
+
+        # Act
+        replay.pause()
+        paused = dict(game.board.scheduled)
+        lent, returned = database.lent, database.returned
+        replay.resume()
+        for _ in range(4):
+            game.board.run_next()
+
+        # Assert
+        assert paused == {}
+        assert lent == returned == 1
+        assert database.fake.parameters == [("game-id", 0), ("game-id", 8)]
+        assert game.played == [(row, column, symbol) for _, _, row, column, symbol in recorded_moves(9)]
+        assert database.lent == database.returned == 2
+
+    def test_set_speed_reschedules(self):
+        """Test changing the speed reschedules the next move with the new delay"""
+        # Arrange
+        replay, database, game = make_replay()
+        replay.start()
+
+        # Act
+        replay.set_speed(10)
+
+        # Assert
+        assert len(game.board.scheduled) == 1
+        assert game.board.delays[-1] == 100
+
+    def test_step_forward(self):
+        """Test stepping forward pauses, shows exactly one more move and holds no connection"""
+        # Arrange
+        replay, database, game = make_replay()
+        replay.start()
+
+        # Act
+        replay.step_forward()
+        replay.step_forward()
+
+        # Assert
+        assert replay.paused
+        assert replay.ply == 2
+        assert game.board.scheduled == {}
+        assert len(game.played) == 2
+        assert database.lent == database.returned == 1
+
+    def test_step_back_undoes_without_reading(self):
+        """Test stepping back takes the last move off the board without going to the database"""
+        # Arrange
+        replay, database, game = make_replay()
+        replay.start()
+        for _ in range(5):
+            replay.step_forward()
+        lent = database.lent
+
+        # Act
+        replay.step_back()
+        replay.step_forward()
+
+        # Assert
+        assert game.undone == 1
+        assert replay.ply == 5
+        assert game.played == [(row, column, symbol) for _, _, row, column, symbol in recorded_moves(5)]
+        assert database.lent == lent
+
+    def test_step_back_at_start(self):
+        """Test stepping back before any move is shown does nothing"""
+        # Arrange
+        replay, database, game = make_replay()
+        replay.start()
+
+        # Act
+        replay.step_back()
+
+        # Assert
+        assert game.undone == 0
+        assert replay.ply == 0
+
+    @pytest.mark.parametrize("ply", [1, 6, 9, 20])
+    def test_seek_forward(self, ply):
+        """Test seeking ahead plays the moves up to the one asked for"""
+        # Arrange
+        replay, database, game = make_replay()
+        replay.start()
+        replay.step_forward()
+
+        # Act
+        replay.seek(ply)
+
+        # Assert
+        assert game.undone == 0
+        assert len(game.played) == min(ply, 9)
+        assert database.lent == database.returned
+
+    def test_seek_back_then_carries_on(self):
+        """Test seeking back undoes moves, and playing carries on from the moves already read unless paused"""
+        # Arrange
+        replay, database, game = make_replay()
+        replay.start()
+        for _ in range(6):
+            game.board.run_next()
+
+        # Act
+        replay.seek(2)
+        game.board.run_next()
+
+        # Assert
+        assert game.undone == 4
+        assert len(game.played) == 3
+        assert database.fake.parameters == [("game-id", 0)]
+
+    def test_stop(self):
+        """Test stopping drops the scheduled move and gives the connection back"""
+        # Arrange
+        replay, database, game = make_replay()
+        replay.start()
+        game.board.run_next()
+
+        # Act
+        replay.stop()
+
+        # Assert
+        assert game.board.scheduled == {}
+        assert database.lent == database.returned == 1
+
+
+class TestUndoMove:
+    """Tests for taking moves back on a game board"""
+
+    def test_undo_takes_back_sos(self, tk_root):
+        """Test undoing a scoring move clears its cell, its sequence and its colors, points and turn"""
+        # Arrange
+        blue_player, red_player = Player(), Player()
+        game = GeneralSOSGame(SOSGameBase(blue_player, red_player, 3), blue_player, red_player)
+        game.new_board()
+        game.play_move(game.cell_matrix[0][0])
+        game.play_move(game.cell_matrix[0][2])
+        blue_player.symbol = 'O'
+        game.play_move(game.cell_matrix[0][1])
+
+        # Act
+        game.undo_move()
+
+        # Assert
+        assert game.state.is_empty(0, 1)
+        assert game.cell_matrix[0][1].cget("text") == ''
+        assert game.cell_matrix[0][1].cget("state") == NORMAL
+        assert game.complete_sos_list == []
+        assert game.cell_matrix[0][0].cget("disabledforeground") == "SystemDisabledText"
+        assert blue_player.score.get() == 0
+        assert game.turn.get() == "Current Turn: Blue"
+
+    def test_undo_after_game_over(self, tk_root):
+        """Test undoing the last move of a finished game lets its cell be played again"""
+        # Arrange
+        blue_player, red_player = Player(), Player()
+        game = GeneralSOSGame(SOSGameBase(blue_player, red_player, 3), blue_player, red_player)
+        game.new_board()
+        blue_player.symbol = red_player.symbol = 'O'
+        for row in range(3):
+            for column in range(3):
+                game.play_move(game.cell_matrix[row][column])
+
+        # Act
+        game.undo_move()
+
+        # Assert
+        assert not game.game_over
+        assert game.cell_matrix[2][2].cget("state") == NORMAL
+        assert game.cell_matrix[0][0].cget("state") == DISABLED
+        assert game.turn.get() == "Current Turn: Blue"
+
+    def test_click_ignored_while_replaying(self, tk_root):
+        """Test a click on the board does nothing while a recorded game is being replayed"""
+        # Arrange
+        blue_player, red_player = Player(), Player()
+        game = GeneralSOSGame(SOSGameBase(blue_player, red_player, 3), blue_player, red_player)
+        game.new_board()
+        game.replaying = True
+
+        # Act
+        game.cell_update(game.cell_matrix[1][1])
+
+        # Assert
+        assert game.state.filled == 0
@@ -0,0 +1,53 @@
+import pytest
+from Position import SIMPLE_GAME, GENERAL_GAME
+from Simulator import simulate, STRATEGIES
+
+
+class TestSimulator:
+    """Tests for headless self-play"""
+
+    def test_totals_add_up(self):
+        """Test every game is counted once as a win, loss or tie"""
+        # Act
+        result = simulate(500, 5, GENERAL_GAME, seed=1)
+
+        # Assert
+        assert result.blue_wins + result.red_wins + result.ties == 500
+        assert result.blue_win_rate + result.red_win_rate + result.tie_rate == pytest.approx(1)
+        assert result.moves == 500 * 25
+        assert result.moves_per_second > 0
+
+    def test_same_seed_same_results(self):
+        """Test a seed makes a batch repeatable"""
+        # Act
+        first = simulate(200, 4, SIMPLE_GAME, "greedy", "safe", seed=7)
+        second = simulate(200, 4, SIMPLE_GAME, "greedy", "safe", seed=7)
+
+        # Assert
+        assert first[:10] == second[:10]
+
+    def test_backends_play_the_same_games(self):
+        """Test the board state backend chosen is the one played on, and both play the same seeded games"""
+        # Act
+        bitboard = simulate(50, 5, GENERAL_GAME, "greedy", "random", seed=2, backend="bitboard")
+        listed = simulate(50, 5, GENERAL_GAME, "greedy", "random", seed=2, backend="list")
+
+        # Assert
+        assert bitboard[:10] == listed[:10]
+
+    def test_greedy_beats_random(self):
+        """Test the "Simple" computer strategy wins most games against random moves"""
+        # Act
+        result = simulate(200, 5, GENERAL_GAME, "greedy", "random", seed=5)
+
+        # Assert
+        assert result.blue_wins > result.red_wins
+
+    @pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+    def test_every_strategy_finishes_games(self, strategy):
+        """Test each named strategy plays legal moves to the end of a game"""
+        # Act
+        result = simulate(2, 3, GENERAL_GAME, strategy, "random", seed=0)
+
+        # Assert
+        assert result.moves == 2 * 9
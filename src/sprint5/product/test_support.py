@@ -0,0 +1,100 @@
+import threading
+from contextlib import contextmanager
+import psycopg2
+from Board_State import BoardState
+from Position import Position, BLUE, SIMPLE_GAME
+
+
+def make_position(board_size, letters, game_type=SIMPLE_GAME, to_move=BLUE, scores=(0, 0)):
+    """Builds a position from {(row, column): letter}"""
+    state = BoardState(board_size)
+    for (row, column), letter in letters.items():
+        state.place(row, column, letter)
+    return Position(state, game_type, to_move, scores)
+
+
+class FakeCursor:
+    """Cursor that keeps the statements it is given instead of sending them, reading its rows from the recorded moves
+    of its connection"""
+
+    def __init__(self, connection, name=None):
+        self.connection = connection
+        self.name = name
+        self.rows = []
+        self.fetches = []
+        self.closed = False
+
+    def mogrify(self, template, args):
+        self.connection.parameters.append(tuple(args))
+        return repr(tuple(args)).encode()
+
+    def execute(self, query, args=None):
+        # A slow server holds every statement until it is released
+        self.connection.released.wait()
+        self.connection.threads.add(threading.current_thread())
+        if self.connection.dropped:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.connection.statements.append(query)
+        if args is not None:
+            # Only moves from the ply asked for on are read
+            self.connection.parameters.append(tuple(args))
+            self.rows = [move for move in self.connection.moves if move[0] >= args[-1]]
+
+    def fetchmany(self, size):
+        self.fetches.append(size)
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    """Connection counting statements and commits, as round trips to the server, that can drop without noticing until
+    it is used"""
+    encoding = "UTF8"
+
+    def __init__(self, moves=()):
+        self.moves = list(moves)
+        self.statements = []
+        self.parameters = []
+        self.cursors = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = 0
+        self.dropped = False
+        self.released = threading.Event()
+        self.released.set()
+        self.threads = set()
+
+    def cursor(self, name=None):
+        cursor = FakeCursor(self, name)
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeDatabase:
+    """Database lending out one fake connection, rolling back on errors and counting the times it is lent and given
+    back"""
+
+    def __init__(self, connection):
+        self.fake = connection
+        self.lent = 0
+        self.returned = 0
+
+    @contextmanager
+    def connection(self):
+        self.lent += 1
+        try:
+            yield self.fake
+        except Exception:
+            self.fake.rollback()
+            raise
+        finally:
+            self.returned += 1
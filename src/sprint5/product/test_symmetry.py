@@ -0,0 +1,156 @@
+import random
+import pytest
+from Board_State import S, O, triple_table
+from Bit_Board_State import BitBoardState
+from Position import Position, GENERAL_GAME, SIMPLE_GAME
+from Alpha_Beta_Search import AlphaBetaSearch
+from Endgame_Solver import EndgameSolver
+from Symmetry import symmetries, inverse_symmetries, canonical_masks, canonical_cells, to_canonical, \
+    from_canonical
+from test_support import make_position
+
+
+def random_cells(board_size, rng):
+    """A random list of cell codes"""
+    return [rng.choice((0, 0, S, O)) for _ in range(board_size * board_size)]
+
+
+def masks(cells):
+    """(S mask, O mask) of a list of cell codes"""
+    return (sum(1 << index for index, code in enumerate(cells) if code == S),
+            sum(1 << index for index, code in enumerate(cells) if code == O))
+
+
+class TestSymmetries:
+    """Tests for the permutation tables of the board symmetries"""
+
+    @pytest.mark.parametrize("board_size", [3, 4, 5])
+    def test_eight_distinct_permutations(self, board_size):
+        """Test every symmetry is a permutation of the cells and all eight differ"""
+        # Act
+        permutations = symmetries(board_size)
+
+        # Assert
+        assert len(set(permutations)) == 8
+        for permutation in permutations:
+            assert sorted(permutation) == list(range(board_size * board_size))
+
+    @pytest.mark.parametrize("board_size", [3, 4, 9])
+    def test_triples_map_to_triples(self, board_size):
+        """Test the SOS rules are unchanged by every symmetry"""
+        # Arrange
+        triples = {frozenset(triple) for triple in triple_table(board_size).triples.values()}
+
+        # Assert
+        for permutation in symmetries(board_size):
+            assert {frozenset(permutation[cell] for cell in triple) for triple in triples} == triples
+
+    def test_inverse_undoes_permutation(self):
+        """Test a cell moved to the transformed board comes back to where it started"""
+        for symmetry in range(8):
+            for index in range(25):
+                assert from_canonical(to_canonical(index, symmetry, 5), symmetry, 5) == index
+            assert [symmetries(5)[symmetry][cell] for cell in inverse_symmetries(5)[symmetry]] == list(range(25))
+
+
+class TestCanonicalForms:
+    """Tests for the canonical orientation of boards"""
+
+    @pytest.mark.parametrize("board_size", [3, 4, 9])
+    def test_mask_tables_match_permutations(self, board_size):
+        """Test the byte lookup tables transform bitmasks the same way as permuting the cells"""
+        rng = random.Random(board_size)
+        for _ in range(20):
+            # Arrange
+            cells = random_cells(board_size, rng)
+
+            # Act
+            s_mask, o_mask, symmetry = canonical_masks(*masks(cells), board_size)
+
+            # Assert
+            assert (s_mask, o_mask) == masks([cells[source] for source in symmetries(board_size)[symmetry]])
+            assert (s_mask, o_mask) == min(masks([cells[source] for source in permutation])
+                                           for permutation in symmetries(board_size))
+
+    def test_every_orientation_has_same_canonical_form(self):
+        """Test all rotations and reflections of a board share their canonical masks and key"""
+        # Arrange
+        cells = random_cells(5, random.Random(1))
+        orientations = [[cells[source] for source in permutation] for permutation in symmetries(5)]
+
+        # Assert
+        assert len({canonical_masks(*masks(board), 5)[:2] for board in orientations}) == 1
+        assert len({canonical_cells(board, 5)[0] for board in orientations}) == 1
+
+
+class TestSymmetricHashing:
+    """Tests for hashing positions by their canonical orientation"""
+
+    def test_rotated_positions_share_canonical_hash(self):
+        """Test a position and its rotation have the same canonical hash but different plain hashes"""
+        # Arrange
+        first = make_position(4, {(0, 0): 'S', (0, 1): 'O'}, GENERAL_GAME)
+        second = make_position(4, {(0, 3): 'S', (1, 3): 'O'}, GENERAL_GAME)
+        first.track_symmetries()
+        second.track_symmetries()
+
+        # Assert
+        assert first.hash != second.hash
+        assert first.canonical_hash()[0] == second.canonical_hash()[0]
+
+    def test_symmetric_hashes_follow_play_and_undo(self):
+        """Test the hashes kept move by move match hashes tracked from scratch"""
+        # Arrange
+        rng = random.Random(2)
+        position = make_position(4, {}, GENERAL_GAME)
+        position.track_symmetries()
+
+        # Act / Assert
+        while not position.is_over():
+            position.play(*rng.choice(position.legal_moves()))
+            assert position.symmetric_hashes[0] == position.hash
+            fresh = position.copy()
+            fresh.track_symmetries()
+            assert fresh.symmetric_hashes == position.symmetric_hashes
+            if rng.random() < 0.3:
+                position.undo()
+                assert position.symmetric_hashes[0] == position.hash
+
+    def test_symmetric_table_finds_same_value(self):
+        """Test sharing table entries between orientations changes the work done, not the result"""
+        rng = random.Random(3)
+        for _ in range(4):
+            # Arrange
+            position = make_position(4, {}, GENERAL_GAME)
+            for _ in range(3):
+                position.play(*rng.choice(position.legal_moves()))
+            plain = AlphaBetaSearch(max_depth=3, time_limit=60)
+            symmetric = AlphaBetaSearch(max_depth=3, time_limit=60, symmetric=True)
+
+            # Act
+            plain.best_move(position)
+            symmetric.best_move(position)
+
+            # Assert
+            assert symmetric.value == plain.value
+            assert symmetric.nodes <= plain.nodes
+
+
+class TestSymmetricEndgame:
+    """Tests for the endgame memo keyed on canonical boards"""
+
+    def test_same_values_with_smaller_memo(self):
+        """Test the symmetric memo solves the empty 3x3 board the same way with fewer entries"""
+        for game_type in (SIMPLE_GAME, GENERAL_GAME):
+            # Arrange
+            position = Position(BitBoardState(3), game_type)
+            plain = EndgameSolver(empty_threshold=9)
+            symmetric = EndgameSolver(empty_threshold=9, symmetric=True)
+
+            # Act
+            plain.best_move(position)
+            symmetric.best_move(position)
+
+            # Assert
+            assert symmetric.value == plain.value
+            assert len(symmetric.memo) < len(plain.memo)
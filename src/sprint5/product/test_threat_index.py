@@ -0,0 +1,164 @@
+import random
+from Board_State import BoardState, S, O
+from Bit_Board_State import BitBoardState
+from Threat_Index import ThreatIndex, random_safe_move, is_giveaway
+
+
+def brute_force_threats(state):
+    """Every (cell, letter code) that completes an SOS, found by trying each empty cell"""
+    found = set()
+    for index in list(state.empty_cells):
+        for letter in 'SO':
+            if state.place(*state.position(index), letter):
+                found.add((index, S if letter == 'S' else O))
+            state.undo()
+    return found
+
+
+class TestThreatIndex:
+    """Tests for the incremental index of completable SOS sequences"""
+
+    def test_finds_s_o_blank(self):
+        """Test an S followed by an O makes the next cell a scoring S"""
+        # Arrange
+        state = BoardState(3)
+        threats = ThreatIndex(state)
+        state.place(0, 0, 'S')
+        state.place(1, 0, 'O')
+
+        # Act
+        move = threats.scoring_move()
+
+        # Assert
+        assert move == (state.index(2, 0), S)
+
+    def test_finds_s_blank_s(self):
+        """Test two S's with a gap make the gap a scoring O"""
+        # Arrange
+        state = BoardState(3)
+        threats = ThreatIndex(state)
+        state.place(0, 0, 'S')
+        state.place(2, 2, 'S')
+
+        # Act
+        move = threats.scoring_move()
+
+        # Assert
+        assert move == (state.index(1, 1), O)
+
+    def test_no_threat_returns_none(self):
+        """Test no scoring move is reported on a quiet board"""
+        # Arrange
+        state = BoardState(4)
+        threats = ThreatIndex(state)
+        state.place(0, 0, 'O')
+
+        # Assert
+        assert threats.scoring_move() is None
+
+    def test_completed_triple_is_removed(self):
+        """Test a triple stops being a threat once it is completed"""
+        # Arrange
+        state = BoardState(3)
+        threats = ThreatIndex(state)
+        state.place(0, 0, 'S')
+        state.place(1, 0, 'O')
+        threats.sync()
+
+        # Act
+        state.place(2, 0, 'S')
+
+        # Assert
+        assert threats.scoring_move() is None
+
+    def test_tracks_random_games_and_undos(self):
+        """Test the index always matches a brute-force search, including after undos"""
+        for backend in (BoardState, BitBoardState):
+            rng = random.Random(11)
+            state = backend(5)
+            threats = ThreatIndex(state)
+            while not state.is_full():
+                index = rng.choice(sorted(state.empty_cells))
+                state.place(*state.position(index), rng.choice('SO'))
+                if rng.random() < 0.2:
+                    state.undo()
+                threats.sync()
+                assert {move for move in threats.threats.values()} == brute_force_threats(state)
+
+    def test_follows_copies_of_the_same_game(self):
+        """Test following a copy of the state applies only its new placements, and another board starts over"""
+        # Arrange
+        state = BoardState(5)
+        state.place(0, 0, 'S')
+        threats = ThreatIndex(state)
+        copy = state.copy()
+        copy.place(0, 1, 'O')
+        other = BoardState(5)
+        other.place(4, 4, 'S')
+        other.place(4, 3, 'O')
+        rebuilds = []
+        rebuild = threats.rebuild
+        threats.rebuild = lambda: rebuilds.append(1) or rebuild()
+
+        # Act
+        threats.follow(copy)
+        continued = set(threats.threats.values())
+        continued_rebuilds = len(rebuilds)
+        threats.follow(other)
+
+        # Assert
+        assert continued_rebuilds == 0
+        assert len(rebuilds) == 1
+        assert continued == brute_force_threats(copy)
+        assert set(threats.threats.values()) == brute_force_threats(other)
+
+
+class TestRandomSafeMove:
+    """Tests for random moves that leave the opponent nothing to complete"""
+
+    def test_avoids_giveaways(self):
+        """Test the move never sets up an SOS while a safe move exists"""
+        # Arrange - only an O at (0, 1) or at (2, 2) is safe
+        state = BoardState(3)
+        for (row, column), letter in {(0, 0): 'O', (0, 2): 'O', (1, 0): 'O', (1, 1): 'O', (1, 2): 'O',
+                                      (2, 0): 'S'}.items():
+            state.place(row, column, letter)
+        rng = random.Random(2)
+
+        for _ in range(50):
+            # Act
+            move = random_safe_move(state, rng)
+
+            # Assert
+            assert move in {(state.index(0, 1), O), (state.index(2, 2), O)}
+
+    def test_plays_anyway_when_every_move_gives_away(self):
+        """Test a legal move is still returned when every move sets up an SOS"""
+        # Arrange - an S in either empty cell leaves S_S and an O leaves SO_
+        state = BoardState(4)
+        for row, letters in enumerate(('SSSS', '.SSO', '.SSO', 'SSSS')):
+            for column, letter in enumerate(letters):
+                if letter != '.':
+                    state.place(row, column, letter)
+
+        # Act
+        index, code = random_safe_move(state, random.Random(0))
+
+        # Assert
+        assert all(is_giveaway(state, cell, letter, state.table) for cell in state.empty_cells for letter in (S, O))
+        assert index in state.empty_cells
+        assert code in (S, O)
+
+    def test_picks_cells_uniformly(self):
+        """Test every cell of an empty board is picked about equally often"""
+        # Arrange
+        state = BitBoardState(3)
+        rng = random.Random(9)
+        counts = [0] * 9
+
+        # Act
+        for _ in range(9000):
+            counts[random_safe_move(state, rng)[0]] += 1
+
+        # Assert
+        assert min(counts) > 850 and max(counts) < 1150
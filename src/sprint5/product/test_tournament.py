@@ -0,0 +1,121 @@
+import random
+import pytest
+from Position import SIMPLE_GAME, GENERAL_GAME
+from Computer_Strategy import ComputerStrategy, TIME_LIMITS
+from Tournament import schedule, play_tournament, read_results, elo_ratings, ratings_by_board_size, BASE_RATING, \
+    PLAYERS
+
+
+def make_rows(results):
+    """Builds result rows from (Blue, Red, Blue score, Red score) tuples"""
+    return [{"board_size": 3, "blue": blue, "red": red, "blue_score": blue_score, "red_score": red_score}
+            for blue, red, blue_score, red_score in results]
+
+
+class TestTournament:
+    """Tests for round-robin tournaments and Elo ratings"""
+
+    def test_schedule_alternates_colours(self):
+        """Test each pair plays the same number of games as Blue and as Red on every board size"""
+        # Act
+        games = schedule(["random", "safe", "greedy"], [3, 4], GENERAL_GAME, 4, seed=2)
+
+        # Assert
+        assert len(games) == 3 * 2 * 4
+        assert [game[0] for game in games] == list(range(len(games)))
+        for first, second in [("random", "safe"), ("random", "greedy"), ("safe", "greedy")]:
+            assert sum(game[3:5] == (first, second) for game in games) == 4
+            assert sum(game[3:5] == (second, first) for game in games) == 4
+
+    def test_schedule_is_deterministic(self):
+        """Test the same seed gives the same games and a different seed different game seeds"""
+        assert schedule(["random", "safe"], [3], SIMPLE_GAME, 6, 1) == schedule(["random", "safe"], [3], SIMPLE_GAME,
+                                                                                6, 1)
+        assert schedule(["random", "safe"], [3], SIMPLE_GAME, 6, 1) != schedule(["random", "safe"], [3], SIMPLE_GAME,
+                                                                                6, 2)
+
+    def test_results_streamed_to_file(self, tmp_path):
+        """Test every game is written to the results file and read back unchanged"""
+        # Arrange
+        path = tmp_path / "results.csv"
+        games = schedule(["random", "greedy"], [3], GENERAL_GAME, 6)
+
+        # Act
+        rows = play_tournament(games, path)
+
+        # Assert
+        assert len(rows) == 6
+        assert [(row["blue"], row["blue_score"], row["red_score"]) for row in read_results(path)] == \
+            [(row["blue"], row["blue_score"], row["red_score"]) for row in rows]
+
+    def test_worker_processes_play_the_same_games(self, tmp_path):
+        """Test games give the same results in worker processes as in this process"""
+        # Arrange
+        games = schedule(["safe", "greedy"], [4], GENERAL_GAME, 4, seed=3)
+
+        # Act
+        local = play_tournament(games, tmp_path / "local.csv")
+        pooled = play_tournament(games, tmp_path / "pooled.csv", workers=2)
+
+        # Assert
+        assert [(row["blue_score"], row["red_score"]) for row in pooled] == \
+            [(row["blue_score"], row["red_score"]) for row in local]
+
+    @pytest.mark.parametrize("name, difficulty", [("simple", "Simple"), ("hard", "Hard"), ("expert", "Expert")])
+    def test_difficulties_are_the_computer_player(self, name, difficulty):
+        """Test the difficulties are rated with the computer player's own move choice and time limits"""
+        # Act
+        player = PLAYERS[name](random.Random(0))
+
+        # Assert
+        assert isinstance(player, ComputerStrategy)
+        assert player.difficulty == difficulty
+        assert player.time_limits == TIME_LIMITS
+
+    def test_difficulties_finish_games(self, tmp_path):
+        """Test a searching difficulty plays legal moves to the end of its games"""
+        # Arrange
+        games = schedule(["hard", "greedy"], [3], GENERAL_GAME, 2)
+
+        # Act
+        rows = play_tournament(games, tmp_path / "results.csv")
+
+        # Assert
+        assert [row["moves"] for row in rows] == [9, 9]
+
+    def test_stronger_player_rated_higher(self):
+        """Test a player winning most games gets the higher rating, with the interval around it"""
+        # Arrange
+        rows = make_rows([("a", "b", 2, 0), ("b", "a", 0, 1)] * 8 + [("a", "b", 0, 1), ("b", "a", 1, 1)])
+
+        # Act
+        ratings = elo_ratings(rows, samples=100)
+
+        # Assert
+        assert ratings["a"][0] > BASE_RATING > ratings["b"][0]
+        for rating, low, high in ratings.values():
+            assert low <= rating <= high
+
+    def test_even_results_rate_players_equally(self):
+        """Test players who win the same number of games against each other share the average rating"""
+        # Arrange
+        rows = make_rows([("a", "b", 1, 0), ("b", "a", 1, 0), ("a", "b", 1, 1)])
+
+        # Act
+        ratings = elo_ratings(rows, samples=20)
+
+        # Assert
+        assert ratings["a"][0] == pytest.approx(BASE_RATING)
+        assert ratings["b"][0] == pytest.approx(BASE_RATING)
+
+    def test_ratings_kept_per_board_size(self):
+        """Test each board size is rated on its own games"""
+        # Arrange
+        rows = make_rows([("a", "b", 1, 0)] * 4) + [dict(row, board_size=5) for row in make_rows([("b", "a", 1, 0)] * 4)]
+
+        # Act
+        ratings = ratings_by_board_size(rows, samples=20)
+
+        # Assert
+        assert ratings[3]["a"][0] > ratings[3]["b"][0]
+        assert ratings[5]["b"][0] > ratings[5]["a"][0]